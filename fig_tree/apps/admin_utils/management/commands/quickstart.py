@@ -7,14 +7,15 @@ A simple management command for quickly migrating/deploying a development server
 |------------|------------------------------------------------------------------|
 | --static   | Collect static files                                             |
 | --migrate  | Run database migrations                                          |
-| --celery   | Launch a Celery worker with a Redis backend                      |
-| --gunicorn | Run a web server using Gunicorn                                  |
+| --jobs     | Run a background job worker alongside the web server             |
+| --uvicorn  | Run a web server using Uvicorn                                   |
 | --host     | The web server port [default: 0.0.0.0]                           |
 | --port     | The web server port [default: 8000]                              |
 | --no-input | Do not prompt for user input of any kind                         |
 """
 
 import subprocess
+import threading
 from argparse import ArgumentParser
 
 from django.core.management import call_command
@@ -35,6 +36,7 @@ class Command(BaseCommand):
 
         parser.add_argument('--static', action='store_true', help='Collect static files.')
         parser.add_argument('--migrate', action='store_true', help='Run database migrations.')
+        parser.add_argument('--jobs', action='store_true', help='Run a background job worker alongside the web server.')
         parser.add_argument('--uvicorn', action='store_true', help='Run a web server using Uvicorn.')
         parser.add_argument('--host', default='0.0.0.0', help='The web server host [default: 0.0.0.0].')
         parser.add_argument('--port', default=8000, type=int, help='The web server port [default: 8000].')
@@ -56,6 +58,10 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS('Running database migrations...'))
             call_command('migrate', no_input=not options['no_input'])
 
+        if options['jobs']:
+            self.stdout.write(self.style.SUCCESS('Starting background job worker...'))
+            self.run_job_worker()
+
         if options['uvicorn']:
             self.stdout.write(self.style.SUCCESS('Starting Uvicorn server...'))
             self.run_uvicorn(host=options['host'], port=options['port'])
@@ -75,3 +81,15 @@ class Command(BaseCommand):
 
         command = ['uvicorn', 'fig_tree.main.asgi:application', '--host', host, '--port', str(port)]
         subprocess.run(command, check=True)
+
+    @staticmethod
+    def run_job_worker() -> threading.Thread:
+        """Start a background job worker in a daemon thread
+
+        Returns:
+          The thread running the job worker
+        """
+
+        thread = threading.Thread(target=call_command, args=('run_jobs',), daemon=True)
+        thread.start()
+        return thread
@@ -16,3 +16,11 @@ class Quickstart(TestCase):
             call_command('quickstart', '--uvicorn', '--no-input')
             mock_run.assert_called_with(
                 ['uvicorn', 'fig_tree.main.asgi:application', '--host', '0.0.0.0', '--port', '8000'], check=True)
+
+    def test_jobs_command(self):
+        """Test the `--jobs` option starts a background job worker"""
+
+        with patch('subprocess.run'), patch('threading.Thread') as mock_thread:
+            call_command('quickstart', '--jobs', '--uvicorn', '--no-input')
+            mock_thread.assert_called_with(target=call_command, args=('run_jobs',), daemon=True)
+            mock_thread.return_value.start.assert_called_once()
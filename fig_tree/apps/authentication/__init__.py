@@ -7,6 +7,7 @@ Application features include:
 
 - Extended authentication functionality with useful features like "remember me" session cookies.
 - A secure, token-based mechanism for users to reset forgotten or outdated passwords.
+- Signed API tokens for authenticating REST API clients without a browser session.
 
 ## Installation
 
@@ -46,4 +47,15 @@ from datetime import timedelta
 
 REMEMBER_ME_DURATION = timedelta(days=4)
 ```
+
+Login and password reset submissions are rate limited per client IP address
+and per submitted username/email. Rates are configured for each view using the
+`RATE_LIMITS` setting (see the `ratelimit` module for details):
+
+```python
+RATE_LIMITS = {
+    'login': '10/m',
+    'password_reset': '5/m',
+}
+```
 """
@@ -0,0 +1,40 @@
+"""
+The `admin` module defines custom administrative interfaces used by the
+website admin portal. Admin classes are used to extend and enhance the
+management of application settings by customizing the appearance, functionality,
+and permissions of admin portal interfaces.
+"""
+
+from django.conf import settings
+from django.contrib import admin
+
+from .models import *
+from .tokens import clear_token_cache
+
+settings.JAZZMIN_SETTINGS['icons'].update({
+    'authentication.APIToken': 'fa fa-key',
+})
+
+
+@admin.register(APIToken)
+class APITokenAdmin(admin.ModelAdmin):
+    """Admin interface for `APIToken` objects"""
+
+    list_display = ['name', 'user', 'created', 'expires', 'revoked']
+    list_filter = ['revoked']
+    readonly_fields = ['user', 'trees', 'created', 'expires']
+    search_fields = ['name', 'user__username']
+    ordering = ['-created']
+    actions = ['revoke_selected_tokens']
+
+    def has_add_permission(self, request) -> bool:
+        """Tokens are issued through the API and cannot be created from the admin"""
+
+        return False
+
+    @admin.action
+    def revoke_selected_tokens(self, request, queryset) -> None:
+        """Revoke the selected tokens"""
+
+        queryset.update(revoked=True)
+        clear_token_cache()
@@ -0,0 +1,30 @@
+"""
+The ``apps`` module defines application level settings and post-initialization
+setup tasks. This includes configuring the application name, database
+initialization, and signal handling.
+"""
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+
+class Config(AppConfig):
+    """Application settings and configuration"""
+
+    name = 'apps.authentication'
+    verbose_name = 'Authentication'
+
+    def ready(self) -> None:
+        """Rebuild the set of live API tokens whenever tokens or user accounts change
+
+        API tokens are revoked when their user changes their password.
+        """
+
+        from .models import APIToken
+        from .tokens import clear_token_cache, revoke_user_tokens
+
+        post_save.connect(clear_token_cache, sender=APIToken, dispatch_uid='revoke_token_save')
+        post_delete.connect(clear_token_cache, sender=APIToken, dispatch_uid='revoke_token_delete')
+        post_save.connect(clear_token_cache, sender=settings.AUTH_USER_MODEL, dispatch_uid='revoke_token_user')
+        post_save.connect(revoke_user_tokens, sender=settings.AUTH_USER_MODEL, dispatch_uid='revoke_token_password')
@@ -0,0 +1,75 @@
+"""
+The `hashers` module extends the built-in Django password hashers so their
+work factors can be configured using application settings.
+
+Each hasher retains the algorithm name of its parent class, so hashes created
+under different settings remain valid. When a user logs in with a password
+hashed using a different algorithm or work factor, the stored hash is
+automatically replaced with one matching the current settings.
+
+| Setting                       | Description                             |
+|-------------------------------|-----------------------------------------|
+| `PASSWORD_HASHER`             | Algorithm used to hash new passwords    |
+| `PASSWORD_PBKDF2_ITERATIONS`  | Number of PBKDF2 iterations             |
+| `PASSWORD_ARGON2_TIME_COST`   | Number of Argon2 iterations             |
+| `PASSWORD_ARGON2_MEMORY_COST` | Argon2 memory usage in KiB              |
+| `PASSWORD_ARGON2_PARALLELISM` | Number of Argon2 threads                |
+| `PASSWORD_SCRYPT_WORK_FACTOR` | Scrypt CPU/memory cost (a power of two) |
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+__all__ = [
+    'Argon2PasswordHasher',
+    'PBKDF2PasswordHasher',
+    'ScryptPasswordHasher',
+]
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 password hasher using the `PASSWORD_PBKDF2_ITERATIONS` setting"""
+
+    @property
+    def iterations(self) -> int:
+        """The number of iterations used when hashing new passwords"""
+
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2 password hasher using the `PASSWORD_ARGON2_*` settings"""
+
+    @property
+    def time_cost(self) -> int:
+        """The number of iterations used when hashing new passwords"""
+
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        """The memory usage in KiB used when hashing new passwords"""
+
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        """The number of threads used when hashing new passwords"""
+
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Scrypt password hasher using the `PASSWORD_SCRYPT_WORK_FACTOR` setting"""
+
+    @property
+    def work_factor(self) -> int:
+        """The CPU/memory cost used when hashing new passwords"""
+
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def maxmem(self) -> int:
+        """The memory limit in bytes required by the configured work factor"""
+
+        return 128 * self.block_size * (self.work_factor + self.parallelism + 2)
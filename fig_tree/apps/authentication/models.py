@@ -0,0 +1,61 @@
+"""
+The `models` module uses data classes to define and interact with the
+application database schema. Each model class reflects the schema for a
+distinct database table and provides a high-level API to query and interact
+with table data.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models
+
+__all__ = ['APIToken', 'TokenUser']
+
+
+class APIToken(models.Model):
+    """A signed API token issued to a user
+
+    Tokens are verified using their signature and are not read from the
+    database when authenticating requests. Records are kept so users can
+    list and revoke their tokens.
+    """
+
+    class Meta:
+        verbose_name = 'API Token'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='api_tokens')
+    name = models.CharField(max_length=100)
+    trees = models.JSONField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(db_index=True)
+    revoked = models.BooleanField(default=False, db_index=True)
+
+    def __str__(self) -> str:
+        """Return the token name"""
+
+        return self.name
+
+
+class TokenUser(get_user_model()):
+    """The user associated with a token authenticated request
+
+    Instances are built from token claims without querying the database and
+    only populate the primary key and username. Instances cannot be saved or
+    deleted so incomplete values are never written to the user table.
+    """
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs) -> None:
+        """Raise an error instead of saving the user"""
+
+        raise NotImplementedError('Users authenticated by API token cannot be saved.')
+
+    def delete(self, *args, **kwargs) -> None:
+        """Raise an error instead of deleting the user"""
+
+        raise NotImplementedError('Users authenticated by API token cannot be deleted.')
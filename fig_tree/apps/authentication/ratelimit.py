@@ -0,0 +1,176 @@
+"""
+The `ratelimit` module limits how frequently clients can submit requests to
+expensive endpoints, such as those that hash user passwords.
+
+Limits are enforced using a sliding window counter stored in the Django cache.
+Request counts are tracked over fixed windows, and the count from the previous
+window is weighted by its overlap with a window ending at the current time.
+This approximates a true sliding window using two cache entries per client.
+
+Rates are given as `<number of requests>/<period>`, where the period is one of
+`s`, `m`, `h`, or `d` (e.g., `10/m`). An empty rate disables rate limiting.
+
+| Setting                                    | Description                                      |
+|--------------------------------------------|--------------------------------------------------|
+| `RATE_LIMITS`                              | Rates for HTML form views keyed by scope name    |
+| `REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']` | Rates for API viewsets keyed by `throttle_scope` |
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from apps.error_pages.handlers import error_render
+
+__all__ = [
+    'RateLimitMixin',
+    'SlidingWindowLimiter',
+    'SlidingWindowThrottle',
+    'client_ident',
+]
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def client_ident(request: HttpRequest) -> str:
+    """Return the IP address of the client that issued a request
+
+    Proxy headers are handled using the `NUM_PROXIES` REST framework setting.
+
+    Args:
+        request: The incoming HTTP request
+
+    Returns:
+        The client IP address
+    """
+
+    return BaseThrottle().get_ident(request)
+
+
+class SlidingWindowLimiter:
+    """Count requests against a rate limit using a sliding window counter"""
+
+    def __init__(self, scope: str, rate: str) -> None:
+        """Create a new rate limiter
+
+        Args:
+            scope: Name used to namespace cache keys
+            rate: The allowed rate in the format `<number of requests>/<period>`
+        """
+
+        num_requests, period = rate.split('/')
+        self.scope = scope
+        self.limit = int(num_requests)
+        self.window = PERIODS[period.strip()[0].lower()]
+
+    def _cache_key(self, ident: str, window: int) -> str:
+        """Return the cache key for a client's request count in the given window"""
+
+        digest = hashlib.sha256(ident.encode()).hexdigest()
+        return f'ratelimit:{self.scope}:{digest}:{window}'
+
+    def hit(self, ident: str) -> Optional[int]:
+        """Record a request from the given client if it is within the rate limit
+
+        Args:
+            ident: A string identifying the client (e.g., an IP address or username)
+
+        Returns:
+            `None` if the request is allowed, otherwise the seconds until a request will be allowed
+        """
+
+        window, offset = divmod(time.time(), self.window)
+        current_key = self._cache_key(ident, int(window))
+        previous_key = self._cache_key(ident, int(window) - 1)
+
+        counts = cache.get_many([current_key, previous_key])
+        overlap = 1 - offset / self.window
+        if counts.get(previous_key, 0) * overlap + counts.get(current_key, 0) >= self.limit:
+            return max(1, math.ceil(self.window - offset))
+
+        # Entries must outlive the following window, where they are used as the previous count
+        cache.add(current_key, 0, timeout=2 * self.window)
+        try:
+            cache.incr(current_key)
+
+        except ValueError:  # The entry was evicted after being added
+            cache.set(current_key, 1, timeout=2 * self.window)
+
+        return None
+
+
+class RateLimitMixin:
+    """Reject form submissions exceeding the rate configured for the view
+
+    Submissions are counted separately for each client IP address and, when
+    `ratelimit_field` is set, for each value submitted in the named form field.
+    Rejected requests are answered before any form processing occurs.
+    """
+
+    ratelimit_scope: str = None
+    """The key of the `RATE_LIMITS` setting defining the allowed rate"""
+
+    ratelimit_field: Optional[str] = None
+    """Optional form field used to count submissions (e.g., a username)"""
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Return a 429 error if the request exceeds the rate limit, otherwise process the request"""
+
+        rate = settings.RATE_LIMITS.get(self.ratelimit_scope)
+        if request.method == 'POST' and rate:
+            idents = [f'ip:{client_ident(request)}']
+            if self.ratelimit_field and (value := request.POST.get(self.ratelimit_field, '').strip().lower()):
+                idents.append(f'{self.ratelimit_field}:{value}')
+
+            limiter = SlidingWindowLimiter(self.ratelimit_scope, rate)
+            for ident in idents:
+                if wait := limiter.hit(ident):
+                    response = error_render(429, request)
+                    response['Retry-After'] = str(wait)
+                    return response
+
+        return super().dispatch(request, *args, **kwargs)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """REST framework throttle applying the rate configured for the view's `throttle_scope`
+
+    Authenticated requests are counted per user. Anonymous requests are
+    counted per client IP address.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the throttle state"""
+
+        self.wait_time = None
+
+    def allow_request(self, request, view) -> bool:
+        """Return whether the request is within the allowed rate"""
+
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if not rate:
+            return True
+
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+
+        self.wait_time = SlidingWindowLimiter(f'api:{scope}', rate).hit(ident)
+        return self.wait_time is None
+
+    def wait(self) -> Optional[int]:
+        """Return the number of seconds until the next request is allowed"""
+
+        return self.wait_time
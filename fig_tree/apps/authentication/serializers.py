@@ -0,0 +1,81 @@
+"""
+The `serializers` module handles serializing/deserializing database models
+and query sets. Each serializer class defines which fields are included in the
+serialized output and handles the conversion of data types to and from their
+serialized representations. Serializers also ensure data integrate by handling
+data validation tasks as required by the relevant business domain.
+"""
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.serializers import ModelSerializer
+
+from apps.family_trees.models import TreePermission
+from .models import *
+
+__all__ = ['APITokenSerializer']
+
+
+class APITokenSerializer(ModelSerializer):
+    """Data serializer for the `APIToken` database model
+
+    The `trees` field maps family tree ids to the maximum role granted by the
+    token. Omitting the field grants the same access as the token owner.
+    """
+
+    class Meta:
+        model = APIToken
+        fields = ['id', 'name', 'trees', 'created', 'expires', 'revoked']
+        read_only_fields = ['id', 'created', 'revoked']
+        extra_kwargs = {'expires': {'required': False}}
+
+    def validate_trees(self, value: dict) -> dict:
+        """Validate family tree ids and role values
+
+        Args:
+            value: Mapping of family tree ids to roles
+
+        Returns:
+            The validated mapping with string keys
+        """
+
+        if value is None:
+            return value
+
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Expected a mapping of family tree ids to roles.')
+
+        try:
+            trees = {int(tree_id): role for tree_id, role in value.items()}
+
+        except ValueError:
+            raise serializers.ValidationError('Family tree ids must be integers.')
+
+        if invalid_roles := [role for role in trees.values() if role not in TreePermission.Role.values]:
+            raise serializers.ValidationError(f'Invalid roles: {invalid_roles}.')
+
+        user = self.context['request'].user
+        member_trees = set(TreePermission.objects.filter(user=user.pk, tree__in=trees).values_list('tree', flat=True))
+        if missing := sorted(set(trees) - member_trees):
+            raise serializers.ValidationError(f'You are not a member of family trees: {missing}.')
+
+        return {str(tree_id): role for tree_id, role in trees.items()}
+
+    def validate_expires(self, value):
+        """Validate the expiration time is in the future and within the maximum token lifetime"""
+
+        now = timezone.now()
+        if value <= now:
+            raise serializers.ValidationError('The expiration time must be in the future.')
+
+        if value > now + settings.API_TOKEN_LIFETIME:
+            raise serializers.ValidationError(f'Tokens cannot be valid for more than {settings.API_TOKEN_LIFETIME.days} days.')
+
+        return value
+
+    def create(self, validated_data: dict) -> APIToken:
+        """Create a new token, expiring after the maximum token lifetime by default"""
+
+        validated_data.setdefault('expires', timezone.now() + settings.API_TOKEN_LIFETIME)
+        return super().create(validated_data)
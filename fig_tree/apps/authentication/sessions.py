@@ -0,0 +1,25 @@
+"""
+The `sessions` module provides maintenance tasks for user sessions.
+
+Database backed session engines do not delete expired sessions automatically.
+The `clear_expired_sessions` task is run periodically by the background job
+workers (see the `JOB_SCHEDULE` setting) to stop expired sessions from
+accumulating, including long-lived "remember me" sessions.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+
+__all__ = ['clear_expired_sessions']
+
+
+def clear_expired_sessions() -> None:
+    """Delete expired sessions from the configured session engine
+
+    Engines that expire sessions automatically (e.g., cache or signed cookie
+    based engines) are left unchanged.
+    """
+
+    engine = import_module(settings.SESSION_ENGINE)
+    engine.SessionStore.clear_expired()
@@ -0,0 +1,28 @@
+"""Tests for the `PBKDF2PasswordHasher` class"""
+
+from django.test import TestCase, override_settings
+
+from apps.authentication.hashers import PBKDF2PasswordHasher
+
+
+class Iterations(TestCase):
+    """Test the hasher work factor is loaded from application settings"""
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_iterations_from_settings(self) -> None:
+        """Test new hashes use the configured number of iterations"""
+
+        encoded = PBKDF2PasswordHasher().encode('password', 'salt')
+        self.assertEqual(1000, PBKDF2PasswordHasher().decode(encoded)['iterations'])
+
+    def test_must_update_on_change(self) -> None:
+        """Test hashes require updating when the configured iterations increase or decrease"""
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            hasher = PBKDF2PasswordHasher()
+            encoded = hasher.encode('password', hasher.salt())
+            self.assertFalse(PBKDF2PasswordHasher().must_update(encoded))
+
+        for iterations in (500, 2000):
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+                self.assertTrue(PBKDF2PasswordHasher().must_update(encoded))
@@ -0,0 +1,50 @@
+"""Tests for the `SlidingWindowLimiter` class"""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.authentication.ratelimit import SlidingWindowLimiter
+
+
+class Hit(TestCase):
+    """Test the counting of requests against the rate limit"""
+
+    def setUp(self) -> None:
+        """Clear request counts left by other tests"""
+
+        cache.clear()
+        self.limiter = SlidingWindowLimiter('test', '2/m')
+
+    @patch('apps.authentication.ratelimit.time.time', return_value=600)
+    def test_requests_over_limit_rejected(self, *args) -> None:
+        """Test requests are rejected once the limit is reached"""
+
+        self.assertIsNone(self.limiter.hit('client'))
+        self.assertIsNone(self.limiter.hit('client'))
+        self.assertEqual(60, self.limiter.hit('client'))
+
+    @patch('apps.authentication.ratelimit.time.time', return_value=600)
+    def test_clients_counted_separately(self, *args) -> None:
+        """Test requests from one client do not count against another"""
+
+        self.limiter.hit('client1')
+        self.limiter.hit('client1')
+        self.assertIsNone(self.limiter.hit('client2'))
+
+    def test_previous_window_weighted(self) -> None:
+        """Test requests from the previous window count in proportion to their overlap"""
+
+        with patch('apps.authentication.ratelimit.time.time', return_value=600):
+            self.limiter.hit('client')
+            self.limiter.hit('client')
+
+        # Halfway through the next window, the previous requests count as one
+        with patch('apps.authentication.ratelimit.time.time', return_value=690):
+            self.assertIsNone(self.limiter.hit('client'))
+            self.assertEqual(30, self.limiter.hit('client'))
+
+        # Requests are allowed once the previous window no longer overlaps
+        with patch('apps.authentication.ratelimit.time.time', return_value=720):
+            self.assertIsNone(self.limiter.hit('client'))
@@ -0,0 +1,72 @@
+"""Tests for the `SlidingWindowThrottle` class"""
+
+import base64
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+throttled_settings = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'family_trees': '2/m'},
+}
+
+
+@override_settings(REST_FRAMEWORK=throttled_settings)
+class AllowRequest(TestCase):
+    """Test API requests are throttled using the rate for the view's scope"""
+
+    def setUp(self) -> None:
+        """Create an authenticated API client"""
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('family_trees:familytree-list')
+
+    def test_requests_over_limit_rejected(self) -> None:
+        """Test requests over the configured rate are rejected with a retry delay"""
+
+        self.assertEqual(200, self.client.get(self.url).status_code)
+        self.assertEqual(200, self.client.get(self.url).status_code)
+
+        response = self.client.get(self.url)
+        self.assertEqual(429, response.status_code)
+        self.assertIn('Retry-After', response)
+
+    def test_users_counted_separately(self) -> None:
+        """Test requests from one user do not count against another"""
+
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        other_user = get_user_model().objects.create_user(
+            username='other_user', email='other@user.com', password='foo', is_active=True)
+
+        self.client.force_authenticate(other_user)
+        self.assertEqual(200, self.client.get(self.url).status_code)
+
+    def test_basic_auth_not_hashed(self) -> None:
+        """Test Basic authentication credentials are rejected without hashing passwords"""
+
+        credentials = base64.b64encode(b'test_user:wrong').decode()
+        client = APIClient(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        with patch('django.contrib.auth.hashers.check_password') as check_password:
+            statuses = [client.get(self.url).status_code for _ in range(3)]
+
+        self.assertEqual([401] * 3, statuses)
+        check_password.assert_not_called()
+
+    @override_settings(REST_FRAMEWORK={**throttled_settings, 'DEFAULT_THROTTLE_RATES': {}})
+    def test_unconfigured_scope(self) -> None:
+        """Test requests are not throttled when no rate is configured"""
+
+        for _ in range(3):
+            self.assertEqual(200, self.client.get(self.url).status_code)
@@ -0,0 +1,29 @@
+"""Tests for the `clear_expired_sessions` function"""
+
+from datetime import timedelta
+
+from django.contrib.sessions.models import Session
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.authentication.sessions import clear_expired_sessions
+
+
+class ClearExpiredSessions(TestCase):
+    """Test the deletion of expired sessions"""
+
+    def test_expired_sessions_deleted(self) -> None:
+        """Test expired sessions are deleted and active sessions are kept"""
+
+        now = timezone.now()
+        Session.objects.create(session_key='expired', session_data='', expire_date=now - timedelta(seconds=1))
+        Session.objects.create(session_key='active', session_data='', expire_date=now + timedelta(days=1))
+
+        clear_expired_sessions()
+        self.assertEqual(['active'], list(Session.objects.values_list('session_key', flat=True)))
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_cookie_sessions(self) -> None:
+        """Test engines without server side storage are supported"""
+
+        clear_expired_sessions()
@@ -0,0 +1,134 @@
+"""Tests for the `TokenAuthentication` class"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.models import APIToken
+from apps.authentication.tokens import AccessToken, TokenAuthentication, encode_token, live_token_ids
+
+
+class Authenticate(TestCase):
+    """Test the authentication of requests using signed tokens"""
+
+    def setUp(self) -> None:
+        """Create a user with an API token"""
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.token = APIToken.objects.create(
+            user=self.user, name='importer', trees={'1': 20}, expires=timezone.now() + timedelta(days=1))
+
+    def authenticate(self, header: str):
+        """Authenticate a request with the given `Authorization` header"""
+
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=header)
+        return TokenAuthentication().authenticate(request)
+
+    def test_valid_token(self) -> None:
+        """Test a valid token authenticates its user without querying the database"""
+
+        header = f'Bearer {encode_token(self.token)}'
+        live_token_ids()  # Populate the cached set of live tokens
+
+        with self.assertNumQueries(0):
+            user, token = self.authenticate(header)
+
+        self.assertEqual(self.user.pk, user.pk)
+        self.assertEqual('test_user', user.username)
+        self.assertIsInstance(token, AccessToken)
+        self.assertEqual({1: 20}, token.trees)
+
+    def test_no_token(self) -> None:
+        """Test requests without a bearer token are left to other authentication classes"""
+
+        self.assertIsNone(self.authenticate(''))
+        self.assertIsNone(self.authenticate('Basic dXNlcjpwYXNz'))
+
+    def test_invalid_signature(self) -> None:
+        """Test tampered tokens are rejected"""
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(f'Bearer {encode_token(self.token)}x')
+
+    def test_expired_token(self) -> None:
+        """Test expired tokens are rejected"""
+
+        self.token.expires = timezone.now() - timedelta(seconds=1)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(f'Bearer {encode_token(self.token)}')
+
+    def test_revoked_token(self) -> None:
+        """Test tokens are rejected once revoked"""
+
+        header = f'Bearer {encode_token(self.token)}'
+        self.authenticate(header)
+
+        self.token.revoked = True
+        self.token.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(header)
+
+    def test_inactive_user(self) -> None:
+        """Test tokens are rejected once their user is deactivated"""
+
+        header = f'Bearer {encode_token(self.token)}'
+        self.authenticate(header)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(header)
+
+    def test_password_change(self) -> None:
+        """Test tokens are revoked when their user changes their password"""
+
+        header = f'Bearer {encode_token(self.token)}'
+        self.authenticate(header)
+
+        self.user.email = 'changed@user.com'
+        self.user.save()
+        self.authenticate(header)
+
+        self.user.set_password('bar')
+        self.user.save()
+        self.token.refresh_from_db()
+        self.assertTrue(self.token.revoked)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(header)
+
+    def test_deleted_token(self) -> None:
+        """Test tokens are rejected once their record is deleted"""
+
+        header = f'Bearer {encode_token(self.token)}'
+        self.authenticate(header)
+
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(header)
+
+    def test_deleted_user(self) -> None:
+        """Test tokens are rejected once their user is deleted"""
+
+        header = f'Bearer {encode_token(self.token)}'
+        self.authenticate(header)
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(header)
+
+    def test_token_issued_after_caching(self) -> None:
+        """Test tokens missing from a stale cached set of live tokens are looked up in the database"""
+
+        token = APIToken.objects.create(user=self.user, name='new', expires=timezone.now() + timedelta(days=1))
+        cache.set('api-tokens:live', set())
+
+        user, _ = self.authenticate(f'Bearer {encode_token(token)}')
+        self.assertEqual(self.user.pk, user.pk)
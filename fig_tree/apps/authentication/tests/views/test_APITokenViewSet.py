@@ -0,0 +1,103 @@
+"""Tests for the `APITokenViewSet` class"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.authentication.models import APIToken
+from apps.family_trees.models import FamilyTree, TreePermission
+
+
+class TokenLifecycle(TestCase):
+    """Test the issuing, use, and revocation of API tokens"""
+
+    def setUp(self) -> None:
+        """Create a user with admin permissions on two family trees"""
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.tree = FamilyTree.objects.create(tree_name='scoped')
+        self.other_tree = FamilyTree.objects.create(tree_name='other')
+        for tree in (self.tree, self.other_tree):
+            TreePermission.objects.create(tree=tree, user=self.user, role=TreePermission.Role.ADMIN)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def issue_token(self, **data) -> str:
+        """Issue a token from the authenticated session and return the signed token string"""
+
+        response = self.client.post(reverse('auth:apitoken-list'), {'name': 'importer', **data}, format='json')
+        self.assertEqual(201, response.status_code, response.data)
+        return response.data['token']
+
+    def token_client(self, token: str) -> APIClient:
+        """Return an API client authenticated using the given token"""
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_tree_scope(self) -> None:
+        """Test token requests are limited to the trees and roles granted by the token"""
+
+        token = self.issue_token(trees={str(self.tree.pk): TreePermission.Role.READ})
+        client = self.token_client(token)
+
+        response = client.get(reverse('family_trees:familytree-list'))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([self.tree.pk], [tree['id'] for tree in response.data])
+
+        other_url = reverse('family_trees:familytree-detail', args=[self.other_tree.pk])
+        self.assertEqual(404, client.get(other_url).status_code)
+
+        # The token role is lower than the user's admin role
+        url = reverse('family_trees:familytree-detail', args=[self.tree.pk])
+        self.assertEqual(403, client.patch(url, {'tree_name': 'renamed'}).status_code)
+
+    def test_unscoped_token(self) -> None:
+        """Test tokens without tree scopes have the same access as their user"""
+
+        client = self.token_client(self.issue_token())
+        response = client.get(reverse('family_trees:familytree-list'))
+        self.assertEqual(2, len(response.data))
+
+    def test_empty_tree_scope(self) -> None:
+        """Test tokens scoped to an empty set of trees do not have access to any tree"""
+
+        client = self.token_client(self.issue_token(trees={}))
+        response = client.get(reverse('family_trees:familytree-list'))
+        self.assertEqual([], response.data)
+
+    def test_revoked_token(self) -> None:
+        """Test deleting a token revokes it"""
+
+        token = self.issue_token()
+        token_id = APIToken.objects.get().pk
+        self.assertEqual(204, self.client.delete(reverse('auth:apitoken-detail', args=[token_id])).status_code)
+
+        self.assertTrue(APIToken.objects.get().revoked)
+        response = self.token_client(token).get(reverse('family_trees:familytree-list'))
+        self.assertEqual(401, response.status_code)
+
+    def test_tokens_cannot_issue_tokens(self) -> None:
+        """Test tokens cannot be used to manage tokens"""
+
+        client = self.token_client(self.issue_token(trees={str(self.tree.pk): TreePermission.Role.READ}))
+        response = client.post(reverse('auth:apitoken-list'), {'name': 'escalated'}, format='json')
+        self.assertEqual(403, response.status_code)
+
+    def test_non_member_tree(self) -> None:
+        """Test tokens cannot be scoped to trees the user is not a member of"""
+
+        tree = FamilyTree.objects.create(tree_name='private')
+        response = self.client.post(
+            reverse('auth:apitoken-list'),
+            {'name': 'importer', 'trees': {str(tree.pk): TreePermission.Role.READ}},
+            format='json')
+
+        self.assertEqual(400, response.status_code)
@@ -1,11 +1,16 @@
 """Tests for the `LoginView` class"""
 
+from unittest.mock import patch
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
+from django.urls import reverse
 
 from apps.authentication.forms import AuthenticationForm
+from apps.authentication.hashers import PBKDF2PasswordHasher
 from apps.authentication.views import LoginView
 
 
@@ -59,3 +64,94 @@ class FormValid(TestCase):
 
         self.assertEqual(view.get_success_url(), response.url)
         self.assertTrue(session.get_expire_at_browser_close())
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class PasswordRehash(TestCase):
+    """Test stored password hashes are updated to match the current settings on login"""
+
+    password = 'fooBAR123!'
+
+    def setUp(self) -> None:
+        """Create an active user with a password hashed using the current settings"""
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@user.com',
+            password=self.password,
+            is_active=True)
+
+    def login(self) -> str:
+        """Log in the test user and return the updated password hash"""
+
+        self.client.logout()
+        response = self.client.post(reverse('auth:login'), dict(username='test_user', password=self.password))
+        self.assertEqual(302, response.status_code)
+
+        self.user.refresh_from_db()
+        return self.user.password
+
+    def test_iterations_changed(self) -> None:
+        """Test hashes are upgraded and downgraded when the work factor changes"""
+
+        for iterations in (2000, 500):
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+                self.assertEqual(iterations, PBKDF2PasswordHasher().decode(self.login())['iterations'])
+
+    def test_hasher_changed(self) -> None:
+        """Test hashes are replaced when the preferred hasher changes"""
+
+        hashers = [
+            'apps.authentication.hashers.ScryptPasswordHasher',
+            'apps.authentication.hashers.PBKDF2PasswordHasher',
+        ]
+
+        with override_settings(PASSWORD_HASHERS=hashers, PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10):
+            self.assertTrue(self.login().startswith('scrypt$'))
+            self.assertTrue(self.user.check_password(self.password))
+
+    def test_hash_unchanged(self) -> None:
+        """Test hashes matching the current settings are not rewritten"""
+
+        original = self.user.password
+        self.assertEqual(original, self.login())
+
+
+@override_settings(RATE_LIMITS={'login': '2/m'})
+class RateLimit(TestCase):
+    """Test login attempts are rate limited"""
+
+    def setUp(self) -> None:
+        """Clear request counts left by other tests"""
+
+        cache.clear()
+        self.url = reverse('auth:login')
+
+    def test_limit_per_username(self) -> None:
+        """Test repeated attempts for one username are rejected without checking credentials"""
+
+        for address in ('10.0.0.1', '10.0.0.2'):
+            self.client.post(self.url, dict(username='test_user', password='wrong'), REMOTE_ADDR=address)
+
+        with patch('apps.authentication.views.views.LoginView.post') as post:
+            response = self.client.post(self.url, dict(username='Test_User', password='wrong'), REMOTE_ADDR='10.0.0.3')
+
+        self.assertEqual(429, response.status_code)
+        self.assertIn('Retry-After', response)
+        post.assert_not_called()
+
+    def test_limit_per_address(self) -> None:
+        """Test repeated attempts from one IP address are rejected"""
+
+        for username in ('user1', 'user2'):
+            self.client.post(self.url, dict(username=username, password='wrong'))
+
+        response = self.client.post(self.url, dict(username='user3', password='wrong'))
+        self.assertEqual(429, response.status_code)
+
+    def test_get_not_limited(self) -> None:
+        """Test rendering the login form is not rate limited"""
+
+        for _ in range(3):
+            self.assertEqual(200, self.client.get(self.url).status_code)
@@ -0,0 +1,216 @@
+"""
+The `tokens` module implements signed API tokens for authenticating REST API
+requests without a browser session.
+
+Tokens are signed using the application `SECRET_KEY` and embed the user's
+primary key and username, the token expiration time, and an optional mapping
+of family tree ids to the maximum role granted by the token. Requests are
+authenticated by verifying the token signature, so no session or user records
+are loaded from the database. Tokens are only accepted if their id is in the
+set of live (unexpired and unrevoked) tokens held in the Django cache, so a
+token is also unusable once its record is deleted. The set is rebuilt from
+the database when missing. Like browser sessions, a user's tokens are revoked
+when the user changes their password.
+
+Clients authenticate by sending the token in the `Authorization` header:
+
+```
+Authorization: Bearer <token>
+```
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import *
+
+__all__ = [
+    'AccessToken',
+    'IsSessionAuthenticated',
+    'TokenAuthentication',
+    'clear_token_cache',
+    'encode_token',
+    'is_live_token',
+    'live_token_ids',
+    'revoke_user_tokens',
+]
+
+TOKEN_SALT = 'apps.authentication.tokens'
+LIVE_TOKEN_CACHE_KEY = 'api-tokens:live'
+
+# Revocations made in other processes are picked up within this many seconds when using a per-process cache
+LIVE_TOKEN_CACHE_TIMEOUT = 60
+
+
+def encode_token(token: APIToken) -> str:
+    """Return the signed token string for an API token record
+
+    Args:
+        token: The token record to encode
+
+    Returns:
+        A signed token string
+    """
+
+    return signing.dumps({
+        'jti': str(token.id),
+        'sub': token.user.pk,
+        'usr': token.user.get_username(),
+        'exp': int(token.expires.timestamp()),
+        'trees': token.trees,
+    }, salt=TOKEN_SALT, compress=True)
+
+
+def _live_tokens() -> QuerySet:
+    """Return unexpired and unrevoked tokens belonging to active users"""
+
+    return APIToken.objects.filter(revoked=False, user__is_active=True, expires__gt=timezone.now())
+
+
+def live_token_ids() -> set[str]:
+    """Return the ids of tokens that can be used to authenticate requests
+
+    Returns:
+        A set of token ids
+    """
+
+    live = cache.get(LIVE_TOKEN_CACHE_KEY)
+    if live is None:
+        live = set(map(str, _live_tokens().values_list('id', flat=True)))
+        cache.set(LIVE_TOKEN_CACHE_KEY, live, LIVE_TOKEN_CACHE_TIMEOUT)
+
+    return live
+
+
+def is_live_token(token_id: str) -> bool:
+    """Return whether a token can be used to authenticate requests
+
+    Tokens missing from the cached set of live tokens are looked up in the
+    database, since they may have been issued by another process after the
+    set was cached.
+
+    Args:
+        token_id: The token id
+
+    Returns:
+        Whether the token is live
+    """
+
+    if token_id in live_token_ids():
+        return True
+
+    if _live_tokens().filter(pk=token_id).exists():
+        clear_token_cache()
+        return True
+
+    return False
+
+
+def clear_token_cache(*args, **kwargs) -> None:
+    """Discard the cached set of live tokens so it is rebuilt on the next request
+
+    The function signature is compatible with Django signal handlers.
+    """
+
+    cache.delete(LIVE_TOKEN_CACHE_KEY)
+
+
+def revoke_user_tokens(sender, instance, created: bool = False, **kwargs) -> None:
+    """Revoke the API tokens of a user whose password was changed
+
+    The function signature is compatible with the Django `post_save` signal.
+    Password changes are detected using the raw password retained by
+    `set_password` until the user record is saved.
+    """
+
+    if created or getattr(instance, '_password', None) is None:
+        return
+
+    APIToken.objects.filter(user=instance, revoked=False).update(revoked=True)
+    clear_token_cache()
+
+
+class AccessToken:
+    """The verified claims of a signed API token"""
+
+    def __init__(self, claims: dict) -> None:
+        """Load token values from verified token claims
+
+        Args:
+            claims: The decoded token payload
+        """
+
+        self.id = claims['jti']
+        self.expires = claims['exp']
+        self.trees = None if claims['trees'] is None else {
+            int(tree_id): role for tree_id, role in claims['trees'].items()
+        }
+
+        self.user = TokenUser(pk=claims['sub'], username=claims['usr'], is_active=True)
+        self.user._state.adding = False
+        self.user._state.db = DEFAULT_DB_ALIAS
+
+
+class TokenAuthentication(BaseAuthentication):
+    """REST framework authentication using signed `Bearer` tokens"""
+
+    keyword = b'bearer'
+
+    def authenticate(self, request) -> Optional[tuple[TokenUser, AccessToken]]:
+        """Authenticate a request using the token in the `Authorization` header
+
+        Args:
+            request: The incoming HTTP request
+
+        Returns:
+            The authenticated user and token, or `None` if no token was provided
+        """
+
+        header = get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword:
+            return None
+
+        if len(header) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+
+        try:
+            claims = signing.loads(header[1].decode(), salt=TOKEN_SALT)
+
+        except (signing.BadSignature, UnicodeError):
+            raise AuthenticationFailed('Invalid token.')
+
+        if claims['exp'] <= time.time():
+            raise AuthenticationFailed('Token has expired.')
+
+        if not is_live_token(claims['jti']):
+            raise AuthenticationFailed('Token has been revoked.')
+
+        token = AccessToken(claims)
+        return token.user, token
+
+    def authenticate_header(self, request) -> str:
+        """Return the `WWW-Authenticate` header value for unauthenticated responses"""
+
+        return 'Bearer'
+
+
+class IsSessionAuthenticated(permissions.BasePermission):
+    """Deny access to requests authenticated using an API token"""
+
+    message = 'This endpoint cannot be accessed using an API token.'
+
+    def has_permission(self, request, view) -> bool:
+        """Return whether the request was authenticated without an API token"""
+
+        return not isinstance(request.auth, AccessToken)
@@ -13,14 +13,20 @@ View objects can be found in the `views` module.
 | `password_reset/done/`     | `PasswordResetDoneView`     | `password-reset-done`     |
 | `'reset/<uidb64>/<token>/` | `PasswordResetConfirmView`  | `password-reset-confirm`  |
 | `reset/done/`              | `PasswordResetCompleteView` | `password-reset-complete` |
+| `tokens/`                  | `APITokenViewSet`           | `apitoken-list`           |
+| `tokens/<str:pk>/`         | `APITokenViewSet`           | `apitoken-detail`         |
 """
 
 from django.urls import path
+from rest_framework import routers
 
 from .views import *
 
 app_name = 'authentication'
 
+router = routers.SimpleRouter()
+router.register(r'tokens', APITokenViewSet)
+
 urlpatterns = [
     path('login/', LoginView.as_view(), name='login'),
     path('logout/', LogoutView.as_view(), name='logout'),
@@ -28,4 +34,4 @@ urlpatterns = [
     path('password_reset/done/', PasswordResetDoneView.as_view(), name='password-reset-done'),
     path('reset/<uidb64>/<token>/', PasswordResetConfirmView.as_view(), name='password-reset-confirm'),
     path('reset/done/', PasswordResetCompleteView.as_view(), name='password-reset-complete'),
-]
+] + router.urls
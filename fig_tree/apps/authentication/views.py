@@ -12,14 +12,23 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.contrib.auth import login, views
+from django.db.models import QuerySet
 from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
+from rest_framework import mixins, status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from .forms import *
+from .models import *
+from .ratelimit import RateLimitMixin
+from .serializers import *
+from .tokens import IsSessionAuthenticated, encode_token
 
 DEFAULT_REMEMBER_ME_DURATION = timedelta(days=7)
 
 __all__ = [
+    'APITokenViewSet',
     'LoginView',
     'LogoutView',
     'PasswordResetView',
@@ -29,9 +38,11 @@ __all__ = [
 ]
 
 
-class LoginView(views.LoginView):
+class LoginView(RateLimitMixin, views.LoginView):
     """View for handling existing user authentication"""
 
+    ratelimit_scope = 'login'
+    ratelimit_field = 'username'
     template_name = 'authentication/login.html'
     authentication_form = AuthenticationForm
     redirect_authenticated_user = True
@@ -56,9 +67,11 @@ class LogoutView(views.LogoutView):
     template_name = 'authentication/logged_out.html'
 
 
-class PasswordResetView(views.PasswordResetView):
+class PasswordResetView(RateLimitMixin, views.PasswordResetView):
     """View for requesting a reset password link via email"""
 
+    ratelimit_scope = 'password_reset'
+    ratelimit_field = 'email'
     template_name = 'authentication/password_reset_form.html'
     email_template_name = 'authentication/password_reset_email.html'
     success_url = reverse_lazy('auth:password-reset-done')
@@ -81,3 +94,44 @@ class PasswordResetCompleteView(views.PasswordResetCompleteView):
     """View for confirming a user's password has been reset"""
 
     template_name = 'authentication/password_reset_complete.html'
+
+
+class APITokenViewSet(
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet
+):
+    """ViewSet for issuing and revoking `APIToken` records
+
+    Tokens can only be managed from an authenticated session (i.e., not
+    using another API token). The signed token string is only returned when
+    the token is created. Deleting a token revokes it.
+    """
+
+    serializer_class = APITokenSerializer
+    queryset = APIToken.objects
+    permission_classes = (IsAuthenticated, IsSessionAuthenticated)
+
+    def get_queryset(self) -> QuerySet:
+        """Return the filtered queryset used by the API endpoint to execute DB queries
+
+        Records are only returned for tokens issued to the requesting user.
+        """
+
+        return self.queryset.filter(user=self.request.user.pk).order_by('-created')
+
+    def create(self, request, *args, **kwargs) -> Response:
+        """Issue a new token and return the signed token string"""
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = serializer.save(user=request.user)
+        return Response({**serializer.data, 'token': encode_token(token)}, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance: APIToken) -> None:
+        """Revoke the token instead of deleting it"""
+
+        instance.revoked = True
+        instance.save(update_fields=['revoked'])
@@ -2,6 +2,7 @@
 The `error_pages` application extends the error handling functionality built
 into django. It provides automatic request routing to customizable error pages
 for 400, 403, 404, and 500 errors (the same as those supported by Django).
+Error pages are also rendered for 429 errors returned by rate limited views.
 
 ## Installation
 
@@ -59,6 +60,14 @@ the corresponding error code. A summary of these values is provided below.
 | `description`          | Page Not Found                                              |
 | `description_long`     | The server could not find the resource you requested.       |
 
+### Context Values for 429 Errors
+
+| Template Variable Name | Value                                                       |
+|------------------------|-------------------------------------------------------------|
+| `error_code`           | 429                                                         |
+| `description`          | Too Many Requests                                           |
+| `description_long`     | You have made too many requests. Please wait and try again. |
+
 ### Context Values for 500 Errors
 
 | Template Variable Name | Value                                                       |
@@ -87,6 +96,7 @@ except AttributeError:
         400: 'Bad Request',
         403: 'Forbidden',
         404: 'Page Not Found',
+        429: 'Too Many Requests',
         500: 'Internal Server Error'
     })
 
@@ -98,5 +108,6 @@ except AttributeError:
         400: 'The server could not process your request.',
         403: 'You are not authorized for access to the requested content.',
         404: 'The server could not find the resource you requested.',
+        429: 'You have made too many requests. Please wait and try again.',
         500: 'The server has encountered an internal error.',
     })
@@ -0,0 +1,30 @@
+"""
+The ``apps`` module defines application level settings and post-initialization
+setup tasks. This includes configuring the application name, database
+initialization, and signal handling.
+"""
+
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
+
+
+class Config(AppConfig):
+    """Application settings and configuration"""
+
+    name = 'apps.family_trees'
+    verbose_name = 'Family Trees'
+
+    def ready(self) -> None:
+        """Connect signal handlers for all models with family tree permissions"""
+
+        from .models import FamilyTreeModelMixin, TreePermission
+        from .signals import touch_parent_tree
+
+        # Membership changes alter the cached member counts of family trees
+        post_save.connect(touch_parent_tree, sender=TreePermission, dispatch_uid='touch_tree_save_TreePermission')
+        post_delete.connect(touch_parent_tree, sender=TreePermission, dispatch_uid='touch_tree_delete_TreePermission')
+
+        for model in apps.get_models():
+            if issubclass(model, FamilyTreeModelMixin):
+                post_save.connect(touch_parent_tree, sender=model, dispatch_uid=f'touch_tree_save_{model.__name__}')
+                post_delete.connect(touch_parent_tree, sender=model, dispatch_uid=f'touch_tree_delete_{model.__name__}')
@@ -0,0 +1,87 @@
+"""
+The `caching` module provides utilities for caching API responses on a per-user
+basis. Cached responses are keyed using the requesting user's role on, and the
+modification time of, each family tree the user has access to. Any change to
+a tree (or to the records it contains) updates the tree's `last_modified`
+timestamp, implicitly invalidating all cached responses involving that tree.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import *
+
+__all__ = [
+    'CachedListMixin',
+    'tree_cache_key',
+    'touch_trees',
+]
+
+
+def touch_trees(tree_ids: Iterable[int]) -> None:
+    """Update the `last_modified` timestamp of the given family trees
+
+    Args:
+        tree_ids: Primary keys of the family trees to update
+    """
+
+    FamilyTree.objects.filter(pk__in=set(tree_ids)).update(last_modified=timezone.now())
+
+
+def tree_cache_key(request, prefix: str) -> str:
+    """Return a cache key unique to the requesting user, their tree roles, and tree versions
+
+    Args:
+        request: The incoming HTTP request
+        prefix: A string prefix used to namespace the returned key
+
+    Returns:
+        A cache key string
+    """
+
+    tree_versions = TreePermission.objects \
+        .filter(user=request.user.pk) \
+        .order_by('tree_id') \
+        .values_list('tree_id', 'role', 'tree__last_modified')
+
+    digest = hashlib.md5(usedforsecurity=False)
+    digest.update(request.get_full_path().encode())
+    digest.update(repr(list(tree_versions)).encode())
+
+    # Responses to token authenticated requests depend on the trees granted by the token
+    digest.update(repr(getattr(request.auth, 'trees', None)).encode())
+    return f'{prefix}:{request.user.pk}:{digest.hexdigest()}'
+
+
+class CachedListMixin:
+    """ViewSet mixin for caching the output of `list` actions
+
+    Cached responses are automatically invalidated when the role of the
+    requesting user changes or when any family tree visible to the user is
+    modified. The lifetime of cached responses is determined by the
+    `CACHE_TIMEOUT` application setting. Setting a timeout of zero disables
+    caching.
+    """
+
+    def list(self, request, *args, **kwargs) -> Response:
+        """Return a cached response for the list action, if available"""
+
+        timeout = getattr(settings, 'CACHE_TIMEOUT', 0)
+        if not timeout:
+            return super().list(request, *args, **kwargs)
+
+        key = tree_cache_key(request, prefix=f'list:{self.basename}')
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, timeout)
+        return response
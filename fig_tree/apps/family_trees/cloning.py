@@ -0,0 +1,239 @@
+"""
+The `cloning` module copies family trees and all of their records.
+
+Records are copied using chunked bulk inserts. Each chunk is committed
+separately, so progress reported to the job queue is visible while the copy
+is running and no long-lived locks are held. Models are copied in dependency
+order so non-nullable foreign keys can be rewritten as records are inserted. Nullable foreign keys referencing records
+that have not been copied yet (e.g., self-references) and generic
+relationships (`content_type`/`object_id`) are rewritten in a second pass
+once all records have been assigned new primary keys. References to records
+outside the copied tree are left unchanged.
+
+Models requiring additional changes to cloned records may define a
+`remap_clone` method. The method is called for each cloned record with a
+mapping of models to their old-to-new primary key mappings and returns the
+names of any modified fields.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+
+from apps.jobs.models import Job
+from apps.jobs.queue import enqueue, report_progress
+from .models import *
+
+__all__ = ['clone_tree', 'schedule_clone']
+
+CHUNK_SIZE = 2000
+
+
+def _tree_models() -> list[type[models.Model]]:
+    """Return all concrete models storing family tree records"""
+
+    return [model for model in apps.get_models() if issubclass(model, FamilyTreeModelMixin)]
+
+
+def _tree_foreign_keys(model: type[models.Model], tree_models: list[type[models.Model]]) -> list[models.ForeignKey]:
+    """Return the foreign keys of a model referencing other family tree records"""
+
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, models.ForeignKey) and field.related_model in tree_models
+    ]
+
+
+def _copy_order(tree_models: list[type[models.Model]]) -> list[type[models.Model]]:
+    """Order models so the targets of non-nullable foreign keys are copied first"""
+
+    order, remaining = [], list(tree_models)
+    while remaining:
+        for model in remaining:
+            dependencies = {
+                field.related_model for field in _tree_foreign_keys(model, tree_models)
+                if not field.null and field.related_model is not model
+            }
+
+            if dependencies.issubset(order):
+                order.append(model)
+                remaining.remove(model)
+                break
+
+        else:
+            raise ValueError('Models cannot be ordered due to circular non-nullable foreign keys.')
+
+    return order
+
+
+def _iter_chunks(queryset: models.QuerySet) -> Iterator[list[models.Model]]:
+    """Yield records in primary key order using keyset pagination"""
+
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(page.order_by('pk')[:CHUNK_SIZE])
+        if not chunk:
+            return
+
+        last_pk = chunk[-1].pk
+        yield chunk
+
+
+def _copy_records(source: FamilyTree, target: FamilyTree) -> None:
+    """Copy the records of one family tree into another, rewriting references between the copied records
+
+    Each chunk of records is committed separately and progress is reported
+    between chunks.
+
+    Args:
+        source: The family tree to copy records from
+        target: The family tree to copy records into
+    """
+
+    tree_models = _tree_models()
+    copy_order = _copy_order(tree_models)
+    id_maps = {model: dict() for model in tree_models}
+    deferred_values = {model: dict() for model in tree_models}
+    total = sum(model.objects.filter(tree=source).count() for model in tree_models)
+
+    # Copy records, rewriting foreign keys to records that have already been copied
+    copied = set()
+    for model in copy_order:
+        foreign_keys = _tree_foreign_keys(model, tree_models)
+        immediate = [field for field in foreign_keys if field.related_model in copied]
+        deferred = [field for field in foreign_keys if field.related_model not in copied]
+
+        for chunk in _iter_chunks(model.objects.filter(tree=source)):
+            old_ids, pending = [record.pk for record in chunk], []
+            for record in chunk:
+                record.pk = None
+                record.tree_id = target.pk
+                for field in immediate:
+                    old_value = getattr(record, field.attname)
+                    if old_value is not None:
+                        setattr(record, field.attname, id_maps[field.related_model].get(old_value, old_value))
+
+                values = {field: getattr(record, field.attname) for field in deferred}
+                pending.append({field: value for field, value in values.items() if value is not None})
+                for field in deferred:
+                    setattr(record, field.attname, None)
+
+            model.objects.bulk_create(chunk)
+            id_maps[model].update(zip(old_ids, (record.pk for record in chunk)))
+            deferred_values[model].update(
+                (record.pk, values) for record, values in zip(chunk, pending) if values)
+            report_progress(sum(map(len, id_maps.values())), total)
+
+        copied.add(model)
+
+    # Rewrite deferred foreign keys, generic relationships, and model specific values
+    for model in copy_order:
+        generic_keys = [field for field in model._meta.private_fields if isinstance(field, GenericForeignKey)]
+        if not (deferred_values[model] or generic_keys or hasattr(model, 'remap_clone')):
+            continue
+
+        for chunk in _iter_chunks(model.objects.filter(tree=target)):
+            update_fields = set()
+            for record in chunk:
+                for field, old_value in deferred_values[model].get(record.pk, dict()).items():
+                    setattr(record, field.attname, id_maps[field.related_model].get(old_value, old_value))
+                    update_fields.add(field.attname)
+
+                for generic_key in generic_keys:
+                    content_type_id = getattr(record, f'{generic_key.ct_field}_id')
+                    object_id = getattr(record, generic_key.fk_field)
+                    if content_type_id is None or object_id is None:
+                        continue
+
+                    related_model = ContentType.objects.get_for_id(content_type_id).model_class()
+                    if related_model in id_maps:
+                        setattr(record, generic_key.fk_field, id_maps[related_model].get(object_id, object_id))
+                        update_fields.add(generic_key.fk_field)
+
+                if hasattr(record, 'remap_clone'):
+                    update_fields.update(record.remap_clone(id_maps))
+
+            if update_fields:
+                model.objects.bulk_update(chunk, sorted(update_fields))
+
+
+def clone_tree(source: FamilyTree, tree_name: str | None = None, owner=None) -> FamilyTree:
+    """Create a copy of a family tree and all of its records
+
+    Tree permissions are not copied. When run as a background job, progress
+    is reported as records are copied.
+
+    The copy is flagged as `purging` until it is complete, so copies that
+    fail are purged and copies interrupted by a lost worker are removed by
+    `resume_purges`.
+
+    Args:
+        source: The family tree to copy
+        tree_name: Name of the new family tree (defaults to a name derived from the source tree)
+        owner: Optional user granted admin permissions on the new family tree
+
+    Returns:
+        The new family tree
+    """
+
+    target = FamilyTree.objects.create(
+        tree_name=tree_name or f'Copy of {source.tree_name}'[:50], private=source.private, purging=True)
+
+    try:
+        _copy_records(source, target)
+        with transaction.atomic():
+            TreeStatistic.objects.bulk_create(
+                TreeStatistic(tree=target, category=stat.category, key=stat.key, private=stat.private, count=stat.count)
+                for stat in source.statistics.all()
+            )
+
+            if owner is not None:
+                TreePermission.objects.create(tree=target, user=owner, role=TreePermission.Role.ADMIN)
+
+            FamilyTree.objects.filter(pk=target.pk).update(purging=False)
+
+    except Exception:
+        from .purging import purge_tree  # The purging module depends on this module
+        purge_tree(target.pk)
+        raise
+
+    target.purging = False
+    return target
+
+
+def _clone_for_user(tree_id: int, user_id: int, tree_name: str | None = None) -> dict:
+    """Clone a family tree and grant a user admin permissions on the copy
+
+    Args:
+        tree_id: Primary key of the family tree to copy
+        user_id: Primary key of the user to grant permissions to
+        tree_name: Name of the new family tree
+
+    Returns:
+        A dictionary with the primary key of the new family tree
+    """
+
+    clone = clone_tree(FamilyTree.objects.get(pk=tree_id), tree_name, owner=get_user_model().objects.get(pk=user_id))
+    return {'tree': clone.pk}
+
+
+def schedule_clone(tree: FamilyTree, user, tree_name: str | None = None) -> Job:
+    """Queue a copy of a family tree for creation by the background job workers
+
+    Args:
+        tree: The family tree to copy
+        user: The user requesting the copy, who is made an admin of the new tree
+        tree_name: Name of the new family tree
+
+    Returns:
+        The queued job
+    """
+
+    return enqueue(_clone_for_user, tree.pk, user.pk, tree_name, user=user)
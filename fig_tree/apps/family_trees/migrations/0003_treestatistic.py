@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_trees', '0002_familytree_private'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TreeStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=255)),
+                ('private', models.BooleanField()),
+                ('count', models.IntegerField(default=0)),
+                ('tree', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='family_trees.familytree')),
+            ],
+            options={
+                'unique_together': {('tree', 'category', 'key', 'private')},
+            },
+        ),
+    ]
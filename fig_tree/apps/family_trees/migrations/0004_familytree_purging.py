@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('family_trees', '0003_treestatistic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='familytree',
+            name='purging',
+            field=models.BooleanField(db_index=True, default=False, editable=False),
+        ),
+    ]
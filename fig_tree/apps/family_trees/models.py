@@ -14,6 +14,7 @@ from django.utils.translation import gettext_lazy as _
 __all__ = [
     'FamilyTree',
     'TreePermission',
+    'TreeStatistic',
     'FamilyTreeModelMixin',
 ]
 
@@ -25,6 +26,9 @@ class FamilyTree(models.Model):
     last_modified = models.DateTimeField(auto_now=True)
     private = models.BooleanField(default=True)
 
+    # Set once the tree is queued for deletion by a purge job (see the `purging` module)
+    purging = models.BooleanField(default=False, editable=False, db_index=True)
+
     def __str__(self) -> str:
         """Return the name of the family tree"""
 
@@ -56,6 +60,30 @@ class TreePermission(models.Model):
         return f'{self.role} permissions for {self.user} on {self.tree}'
 
 
+class TreeStatistic(models.Model):
+    """Precomputed record counts summarizing the contents of a family tree
+
+    Each row stores the number of records in a tree matching a statistic
+    `category` (e.g., `surname`) and `key` (e.g., `Smith`). Counts for
+    private and public records are stored separately so statistics can be
+    limited to the records visible to a given user.
+    """
+
+    class Meta:
+        unique_together = (('tree', 'category', 'key', 'private'),)
+
+    tree = models.ForeignKey(FamilyTree, on_delete=models.CASCADE, related_name='statistics')
+    category = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    private = models.BooleanField()
+    count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        """Return the statistic category, key, and count"""
+
+        return f'{self.category} "{self.key}": {self.count}'
+
+
 class FamilyTreeModelMixin(models.Model):
     """Model mixin class that adds the columns necessary to support family tree permissions"""
 
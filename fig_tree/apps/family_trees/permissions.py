@@ -2,20 +2,121 @@
 The `permissions` module defines permission objects for regulating access
 to API endpoints. Permission classes can implement permissions on the level of
 individual requests and/or objects (database records).
+
+Requests authenticated using an API token are additionally limited to the
+family trees and roles granted by the token. The effective role of a request
+is the lower of the user's role and the role granted by the token.
 """
 
+from __future__ import annotations
+
+from typing import Optional
+
 from django import views
+from django.db.models import Case, Expression, F, Q, Value, When
+from django.db.models.functions import Least
 from rest_framework import permissions
 
+from apps.authentication.tokens import AccessToken
 from .models import *
 
 __all__ = [
     'FamilyTreeObjectPermission',
     'TreePermissionObjectPermission',
     'IsTreeMember',
+    'get_role',
+    'readable_records_filter',
+    'scoped_role',
+    'token_tree_filter',
 ]
 
 
+def get_role(request, tree_id: int) -> Optional[int]:
+    """Return the effective role of a request on a family tree
+
+    Args:
+        request: The incoming HTTP request
+        tree_id: Primary key of the family tree
+
+    Returns:
+        The effective role, or `None` if the request has no access to the tree
+    """
+
+    role = TreePermission.objects.filter(user=request.user.pk, tree=tree_id).values_list('role', flat=True).first()
+    if role is None or not isinstance(request.auth, AccessToken) or request.auth.trees is None:
+        return role
+
+    token_role = request.auth.trees.get(int(tree_id))
+    return None if token_role is None else min(role, token_role)
+
+
+def token_tree_filter(request, role: int, field: str = 'tree') -> Q:
+    """Return a query filter limiting records to trees where an API token grants the given role
+
+    Args:
+        request: The incoming HTTP request
+        role: The minimum role granted by the token
+        field: Name of the field referencing the family tree
+
+    Returns:
+        A query filter (empty for requests without a tree scoped token)
+    """
+
+    if not isinstance(request.auth, AccessToken) or request.auth.trees is None:
+        return Q()
+
+    tree_ids = [tree_id for tree_id, token_role in request.auth.trees.items() if token_role >= role]
+    return Q(**{f'{field}__in': tree_ids})
+
+
+def readable_records_filter(request) -> Q:
+    """Return a query filter limiting genealogical records to those the request may read
+
+    Private records require permission to view private records. Records
+    using the filter are expected to inherit from the `FamilyTreeModelMixin` class.
+
+    Args:
+        request: The incoming HTTP request
+
+    Returns:
+        A query filter
+    """
+
+    user = request.user
+    return Q(
+        token_tree_filter(request, TreePermission.Role.READ_PRIVATE),
+        tree__treepermission__user=user,
+        tree__treepermission__role__gte=TreePermission.Role.READ_PRIVATE,
+    ) | Q(
+        token_tree_filter(request, TreePermission.Role.READ),
+        tree__treepermission__user=user,
+        tree__treepermission__role__gte=TreePermission.Role.READ,
+        private=False
+    )
+
+
+def scoped_role(request, role: Expression, field: str = 'tree') -> Expression:
+    """Return a query expression limiting a role to the role granted by the request's API token
+
+    Args:
+        request: The incoming HTTP request
+        role: Query expression evaluating to the user's role
+        field: Name of the field referencing the family tree
+
+    Returns:
+        A query expression evaluating to the effective role
+    """
+
+    if not isinstance(request.auth, AccessToken) or request.auth.trees is None:
+        return role
+
+    token_role = Case(*(
+        When(**{field: tree_id}, then=Value(token_role)) for tree_id, token_role in request.auth.trees.items()
+    ))
+
+    return Least(role, token_role)
+
+
 class FamilyTreeObjectPermission(permissions.BasePermission):
     """Object-level permissions for regulating access to `FamilyTree` records
 
@@ -38,14 +139,14 @@ class FamilyTreeObjectPermission(permissions.BasePermission):
             A boolean indicating the success/failure of the permissions check
         """
 
-        permission_record = obj.treepermission_set.filter(user=request.user).first()
-        if not permission_record:
+        role = get_role(request, obj.pk)
+        if role is None:
             return False
 
         if request.method in permissions.SAFE_METHODS:
-            return permission_record.role >= TreePermission.Role.READ
+            return role >= TreePermission.Role.READ
 
-        return permission_record.role >= TreePermission.Role.ADMIN
+        return role >= TreePermission.Role.ADMIN
 
 
 class TreePermissionObjectPermission(permissions.BasePermission):
@@ -70,11 +171,11 @@ class TreePermissionObjectPermission(permissions.BasePermission):
             A boolean indicating the success/failure of the permissions check
         """
 
-        permission_record = TreePermission.objects.filter(user=request.user.id, tree=obj.tree).first()
-        if not permission_record:
+        role = get_role(request, obj.tree_id)
+        if role is None:
             return False
 
-        return permission_record.role >= TreePermission.Role.ADMIN
+        return role >= TreePermission.Role.ADMIN
 
 
 class IsTreeMember(permissions.BasePermission):
@@ -98,18 +199,18 @@ class IsTreeMember(permissions.BasePermission):
             Whether the request has permission to access the object
         """
 
-        permission_record = obj.tree.treepermission_set.filter(user=request.user.id, tree=obj.tree).first()
-        if not permission_record:
+        role = get_role(request, obj.tree_id)
+        if role is None:
             return False
 
         # Check the user's permission level
-        can_read_public = permission_record.role >= TreePermission.Role.READ
-        can_read_private = permission_record.role >= TreePermission.Role.READ_PRIVATE
-        can_write = permission_record.role >= TreePermission.Role.WRITE
+        can_read_public = role >= TreePermission.Role.READ
+        can_read_private = role >= TreePermission.Role.READ_PRIVATE
+        can_write = role >= TreePermission.Role.WRITE
 
         # Check permissions for read-only operations
         if request.method in permissions.SAFE_METHODS:
-            return can_read_private or (can_read_public and not permission_record.private)
+            return can_read_private or (can_read_public and not obj.private)
 
         # All other operations require write permissions at minimum
         return can_write
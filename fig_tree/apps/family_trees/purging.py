@@ -0,0 +1,179 @@
+"""
+The `purging` module deletes family trees and all of their records in bulk.
+
+Deleting a tree through the ORM loads every related record into memory so
+cascading deletes and signals can be processed in Python. Purging instead
+deletes records using set-based `DELETE` statements issued in batches of
+primary keys. Models are purged in reverse dependency order after nullable
+foreign keys referencing the purged records have been cleared, so each
+batch can be committed independently without violating database constraints.
+
+Only records belonging to the purged tree are deleted. Nullable and generic
+references from records in other trees are cleared, and purges are refused
+while records in other trees hold non-nullable references to the purged
+tree. Trees awaiting deletion are flagged as `purging`, and every step of a
+purge can safely be repeated, so interrupted purges are resumed by
+`resume_purges`.
+
+Model signals are not sent for purged records. Models requiring additional
+cleanup may define a `pre_purge` class method, which is called with each
+batch of records before it is deleted. Purges are executed as background
+jobs (see the `jobs` application) and report their progress to the job queue.
+"""
+
+from __future__ import annotations
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+
+from apps.jobs.models import Job
+from apps.jobs.queue import enqueue, report_progress
+from .caching import touch_trees
+from .cloning import _clone_for_user, _copy_order, _tree_foreign_keys, _tree_models
+from .models import *
+
+__all__ = [
+    'purge_conflicts',
+    'purge_tree',
+    'resume_purges',
+    'schedule_purge',
+]
+
+CHUNK_SIZE = 1000
+
+
+def _detach(queryset: models.QuerySet, tree_id: int, **values) -> set[int]:
+    """Update references to purged records and return the ids of any other trees that were modified"""
+
+    modified = set(queryset.exclude(tree_id=tree_id).values_list('tree_id', flat=True).distinct())
+    queryset.update(**values)
+    return modified
+
+
+def purge_conflicts(tree_id: int) -> dict[str, int]:
+    """Return the number of records in other trees that prevent a family tree from being purged
+
+    Records in other trees cannot be detached from the purged tree if they
+    reference its records using a non-nullable foreign key.
+
+    Args:
+        tree_id: Primary key of the family tree to delete
+
+    Returns:
+        A dictionary mapping model names to the number of conflicting records
+    """
+
+    tree_models = _tree_models()
+    conflicts = dict()
+    for model in tree_models:
+        condition = models.Q()
+        for field in _tree_foreign_keys(model, tree_models):
+            if not field.null:
+                condition |= models.Q(**{f'{field.name}__tree_id': tree_id})
+
+        if condition and (count := model.objects.exclude(tree_id=tree_id).filter(condition).count()):
+            conflicts[model._meta.verbose_name_plural] = count
+
+    return conflicts
+
+
+def purge_tree(tree_id: int) -> None:
+    """Delete a family tree and all of its records using set-based batch deletes
+
+    When run as a background job, progress is reported after each batch.
+    Interrupted purges can be completed by calling the function again.
+
+    Args:
+        tree_id: Primary key of the family tree to delete
+    """
+
+    if conflicts := purge_conflicts(tree_id):
+        raise RuntimeError(f'Family tree {tree_id} is referenced by records in other trees: {conflicts}')
+
+    tree_models = _tree_models()
+    delete_order = list(reversed(_copy_order(tree_models)))
+
+    # Clear nullable references to purged records so dependent records can be deleted in any order
+    modified_trees = set()
+    for model in tree_models:
+        for field in _tree_foreign_keys(model, tree_models):
+            if field.null:
+                queryset = model.objects.filter(**{f'{field.name}__tree_id': tree_id})
+                modified_trees |= _detach(queryset, tree_id, **{field.name: None})
+
+    # Detach records in other trees from purged records referenced through generic relationships
+    for model in tree_models:
+        for generic_key in (field for field in model._meta.private_fields if isinstance(field, GenericForeignKey)):
+            for related_model in tree_models:
+                queryset = model.objects.exclude(tree_id=tree_id).filter(**{
+                    generic_key.ct_field: ContentType.objects.get_for_model(related_model),
+                    f'{generic_key.fk_field}__in': related_model.objects.filter(tree_id=tree_id).values('pk')
+                })
+
+                modified_trees |= _detach(queryset, tree_id, **{generic_key.ct_field: None, generic_key.fk_field: None})
+
+    # Detached records keep their statistics, but cached responses including them must be refreshed
+    touch_trees(modified_trees)
+
+    total = sum(model.objects.filter(tree_id=tree_id).count() for model in tree_models)
+    deleted = 0
+    for model in delete_order:
+        queryset = model.objects.filter(tree_id=tree_id)
+        while primary_keys := list(queryset.values_list('pk', flat=True)[:CHUNK_SIZE]):
+            batch = model.objects.filter(pk__in=primary_keys)
+            with transaction.atomic():
+                if hasattr(model, 'pre_purge'):
+                    model.pre_purge(batch)
+
+                batch._raw_delete(batch.db)
+
+            deleted += len(primary_keys)
+            report_progress(deleted, total)
+
+    # Remaining rows (permissions, statistics, etc.) do not depend on genealogical records
+    FamilyTree.objects.filter(pk=tree_id).delete()
+
+
+def schedule_purge(tree: FamilyTree, user) -> Job:
+    """Revoke all access to a family tree and queue it for deletion by the background job workers
+
+    Args:
+        tree: The family tree to delete
+        user: The user requesting the deletion
+
+    Returns:
+        The queued job
+    """
+
+    with transaction.atomic():
+        FamilyTree.objects.filter(pk=tree.pk).update(purging=True)
+        TreePermission.objects.filter(tree=tree).delete()
+        return enqueue(purge_tree, tree.pk, user=user)
+
+
+def resume_purges() -> list[Job]:
+    """Queue purges for family trees whose deletion was interrupted
+
+    Trees flagged as `purging` are queued again unless a purge job for the
+    tree is already pending or running. Incomplete copies of family trees
+    are also flagged as `purging`, so no purges are queued while a clone job
+    is running.
+
+    Returns:
+        The queued jobs
+    """
+
+    clone_task = f'{_clone_for_user.__module__}.{_clone_for_user.__qualname__}'
+    if Job.objects.filter(task=clone_task, status=Job.Status.RUNNING).exists():
+        return []
+
+    task = f'{purge_tree.__module__}.{purge_tree.__qualname__}'
+    active = Job.objects.filter(task=task, status__in=[Job.Status.PENDING, Job.Status.RUNNING])
+    active_trees = {args[0] for args in active.values_list('args', flat=True) if args}
+
+    return [
+        enqueue(purge_tree, tree_id)
+        for tree_id in FamilyTree.objects.filter(purging=True).values_list('pk', flat=True)
+        if tree_id not in active_trees
+    ]
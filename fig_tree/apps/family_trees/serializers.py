@@ -6,18 +6,32 @@ serialized representations. Serializers also ensure data integrate by handling
 data validation tasks as required by the relevant business domain.
 """
 
-from rest_framework.serializers import ModelSerializer
+from django.contrib.auth import get_user_model
+from rest_framework.serializers import ChoiceField, IntegerField, ListField, ModelSerializer, Serializer, ValidationError
 
 from .models import *
 
 __all__ = [
     'FamilyTreeSerializer',
+    'TreePermissionBulkSerializer',
     'TreePermissionSerializer'
 ]
 
+# Maximum number of users that can be granted or revoked permissions in a single request
+MAX_BULK_PERMISSIONS = 1000
+
 
 class FamilyTreeSerializer(ModelSerializer):
-    """Data serializer for the `FamilyTree` database model"""
+    """Data serializer for the `FamilyTree` database model
+
+    The `role`, `member_count`, and `record_count` fields are read from
+    queryset annotations (see `FamilyTreeViewSet`) and are omitted when
+    serializing records without annotations.
+    """
+
+    role = IntegerField(read_only=True)
+    member_count = IntegerField(read_only=True)
+    record_count = IntegerField(read_only=True)
 
     class Meta:
         model = FamilyTree
@@ -30,3 +44,35 @@ class TreePermissionSerializer(ModelSerializer):
     class Meta:
         model = TreePermission
         fields = '__all__'
+
+
+class PermissionGrantSerializer(Serializer):
+    """Data serializer for a single user role within a bulk permission request"""
+
+    user = IntegerField()
+    role = ChoiceField(choices=TreePermission.Role.choices)
+
+
+class TreePermissionBulkSerializer(Serializer):
+    """Data serializer for granting and revoking permissions on a family tree in bulk
+
+    User ids are validated using a single query, regardless of the number of
+    users in the request.
+    """
+
+    tree = IntegerField()
+    grant = ListField(child=PermissionGrantSerializer(), default=list, max_length=MAX_BULK_PERMISSIONS)
+    revoke = ListField(child=IntegerField(), default=list, max_length=MAX_BULK_PERMISSIONS)
+
+    def validate(self, attrs: dict) -> dict:
+        """Validate each user is listed once and exists in the database"""
+
+        user_ids = [grant['user'] for grant in attrs['grant']] + attrs['revoke']
+        if len(user_ids) != len(set(user_ids)):
+            raise ValidationError('Each user may only be listed once per request.')
+
+        existing = set(get_user_model().objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        if missing := sorted(set(user_ids) - existing):
+            raise ValidationError(f'Users do not exist: {", ".join(map(str, missing))}.')
+
+        return attrs
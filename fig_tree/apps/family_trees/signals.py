@@ -0,0 +1,21 @@
+"""
+The `signals` module defines handlers for database signals emitted by
+application models. Handlers are connected to their corresponding signals
+when the application is initialized (see the `apps` module).
+"""
+
+from .caching import touch_trees
+from .models import FamilyTreeModelMixin
+
+__all__ = ['touch_parent_tree']
+
+
+def touch_parent_tree(sender, instance: FamilyTreeModelMixin, **kwargs) -> None:
+    """Update the `last_modified` timestamp of the family tree owning a modified record
+
+    Args:
+        sender: The model class sending the signal
+        instance: The record that was saved or deleted
+    """
+
+    touch_trees([instance.tree_id])
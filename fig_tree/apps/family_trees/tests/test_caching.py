@@ -0,0 +1,68 @@
+"""Tests for the `caching` module."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission
+
+
+@override_settings(CACHE_TIMEOUT=300)
+class CachedListMixin(TestCase):
+    """Test the caching of list responses"""
+
+    def setUp(self) -> None:
+        """Create a user with admin permissions on a single family tree"""
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.tree = FamilyTree.objects.create(tree_name='Tree 1')
+        TreePermission.objects.create(tree=self.tree, user=self.user, role=TreePermission.Role.ADMIN)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('family_trees:familytree-list')
+
+    def test_response_is_cached(self) -> None:
+        """Test repeated requests are served from the cache"""
+
+        self.client.get(self.url)
+        FamilyTree.objects.filter(pk=self.tree.pk).update(tree_name='Renamed')
+
+        # Bypassing `save` leaves the tree version unchanged, so the cached data is returned
+        response = self.client.get(self.url)
+        self.assertEqual('Tree 1', response.data[0]['tree_name'])
+
+    def test_cache_invalidated_on_tree_change(self) -> None:
+        """Test modifying a tree invalidates cached responses"""
+
+        self.client.get(self.url)
+        self.tree.tree_name = 'Renamed'
+        self.tree.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual('Renamed', response.data[0]['tree_name'])
+
+    def test_cache_invalidated_on_new_permission(self) -> None:
+        """Test gaining access to a new tree invalidates cached responses"""
+
+        self.client.get(self.url)
+        new_tree = FamilyTree.objects.create(tree_name='Tree 2')
+        TreePermission.objects.create(tree=new_tree, user=self.user, role=TreePermission.Role.READ)
+
+        response = self.client.get(self.url)
+        self.assertEqual(2, len(response.data))
+
+    @override_settings(CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_caching(self) -> None:
+        """Test responses are not cached when the cache timeout is zero"""
+
+        self.client.get(self.url)
+        FamilyTree.objects.filter(pk=self.tree.pk).update(tree_name='Renamed')
+
+        response = self.client.get(self.url)
+        self.assertEqual('Renamed', response.data[0]['tree_name'])
@@ -0,0 +1,171 @@
+"""Tests for the `cloning` module and the family tree `clone` endpoint."""
+
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.cloning import clone_tree, schedule_clone
+from apps.family_trees.models import FamilyTree, TreePermission, TreeStatistic
+from apps.gen_data.models import Citation, Place, Source, Tag
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, report_progress, run_job
+
+
+class CloneTree(TestCase):
+    """Test the copying of family tree records"""
+
+    def setUp(self) -> None:
+        """Create a family tree with related records"""
+
+        self.tree = FamilyTree.objects.create(tree_name='source')
+        self.source = Source.objects.create(tree=self.tree, title='Parish register')
+        self.country = Place.objects.create(tree=self.tree, name='Ireland')
+        self.county = Place.objects.create(tree=self.tree, name='Mayo', enclosed_by=self.country)
+        self.citation = Citation.objects.create(tree=self.tree, source=self.source, content_object=self.county)
+        Tag.objects.create(tree=self.tree, name='verified', content_object=self.source)
+
+        self.clone = clone_tree(self.tree, 'clone')
+
+    def test_records_copied(self) -> None:
+        """Test every record is copied into the new tree"""
+
+        self.assertEqual('clone', self.clone.tree_name)
+        for model in (Citation, Place, Source, Tag):
+            self.assertEqual(
+                model.objects.filter(tree=self.tree).count(),
+                model.objects.filter(tree=self.clone).count())
+
+    def test_foreign_keys_remapped(self) -> None:
+        """Test foreign keys and materialized paths reference the copied records"""
+
+        citation = Citation.objects.get(tree=self.clone)
+        self.assertEqual(self.clone, citation.source.tree)
+
+        county = Place.objects.get(tree=self.clone, name='Mayo')
+        country = Place.objects.get(tree=self.clone, name='Ireland')
+        self.assertEqual(country, county.enclosed_by)
+        self.assertEqual(f'/{country.pk}/{county.pk}/', county.path)
+
+    def test_generic_relationships_remapped(self) -> None:
+        """Test generic relationships reference the copied records"""
+
+        citation = Citation.objects.get(tree=self.clone)
+        self.assertEqual(Place.objects.get(tree=self.clone, name='Mayo'), citation.content_object)
+
+        tag = Tag.objects.get(tree=self.clone)
+        self.assertEqual(Source.objects.get(tree=self.clone), tag.content_object)
+
+    def test_source_tree_unchanged(self) -> None:
+        """Test records in the source tree are not modified"""
+
+        self.citation.refresh_from_db()
+        self.county.refresh_from_db()
+        self.assertEqual(self.source, self.citation.source)
+        self.assertEqual(self.county, self.citation.content_object)
+        self.assertEqual(f'/{self.country.pk}/{self.county.pk}/', self.county.path)
+
+    def test_statistics_copied(self) -> None:
+        """Test precomputed tree statistics are copied"""
+
+        self.assertEqual(
+            set(TreeStatistic.objects.filter(tree=self.tree).values_list('category', 'key', 'private', 'count')),
+            set(TreeStatistic.objects.filter(tree=self.clone).values_list('category', 'key', 'private', 'count')))
+
+    def test_clone_completed(self) -> None:
+        """Test finished copies are no longer flagged for deletion"""
+
+        self.assertFalse(FamilyTree.objects.get(pk=self.clone.pk).purging)
+
+    def test_failed_clone_purged(self) -> None:
+        """Test records copied by a failed clone are deleted"""
+
+        with patch('apps.family_trees.cloning.TreeStatistic.objects.bulk_create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                clone_tree(self.tree, 'failed')
+
+        self.assertFalse(FamilyTree.objects.filter(tree_name='failed').exists())
+        self.assertFalse(Place.objects.exclude(tree__in=[self.tree, self.clone]).exists())
+
+
+class CloneProgress(TransactionTestCase):
+    """Test clone progress is visible while the clone is running"""
+
+    def test_progress_visible_to_other_connections(self) -> None:
+        """Test progress reported between chunks is committed before the clone finishes"""
+
+        user = get_user_model().objects.create_user(username='test_user', email='test@user.com', password='foo')
+        tree = FamilyTree.objects.create(tree_name='source')
+        Source.objects.bulk_create(Source(tree=tree, title=str(i)) for i in range(5))
+        job = schedule_clone(tree, user)
+
+        observed = []
+
+        def read_progress() -> None:
+            observed.append(Job.objects.get(pk=job.pk).progress)
+            connections.close_all()
+
+        def report_and_read(*args) -> None:
+            report_progress(*args)
+            reader = threading.Thread(target=read_progress)
+            reader.start()
+            reader.join()
+
+        with patch('apps.family_trees.cloning.CHUNK_SIZE', 2), \
+                patch('apps.family_trees.cloning.report_progress', report_and_read):
+            run_job(claim_job().pk)
+
+        self.assertEqual([2, 4, 5], observed)
+
+
+class CloneEndpoint(TestCase):
+    """Test the family tree `clone` endpoint"""
+
+    def setUp(self) -> None:
+        """Create a family tree with a single record"""
+
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.tree = FamilyTree.objects.create(tree_name='source')
+        Source.objects.create(tree=self.tree, title='Parish register')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('family_trees:familytree-clone', args=[self.tree.pk])
+
+    def test_clone_created(self) -> None:
+        """Test the clone is created by a background job and administered by the requesting user"""
+
+        TreePermission.objects.create(tree=self.tree, user=self.user, role=TreePermission.Role.READ_PRIVATE)
+        response = self.client.post(self.url, {'tree_name': 'fork'})
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(reverse('jobs:job-detail', args=[response.data['id']]), response['Location'])
+
+        job = Job.objects.get(pk=response.data['id'])
+        run_job(claim_job().pk)
+        job.refresh_from_db()
+
+        clone = FamilyTree.objects.get(pk=job.result['tree'])
+        self.assertEqual('fork', clone.tree_name)
+        self.assertTrue(Source.objects.filter(tree=clone).exists())
+        self.assertTrue(TreePermission.objects.filter(
+            tree=clone, user=self.user, role=TreePermission.Role.ADMIN).exists())
+
+    def test_private_access_required(self) -> None:
+        """Test users without permission to view private records cannot clone a tree"""
+
+        TreePermission.objects.create(tree=self.tree, user=self.user, role=TreePermission.Role.READ)
+        response = self.client.post(self.url)
+        self.assertEqual(403, response.status_code)
+        self.assertFalse(Job.objects.exists())
+
+    def test_non_member(self) -> None:
+        """Test users without tree permissions receive a not found error"""
+
+        response = self.client.post(self.url)
+        self.assertEqual(404, response.status_code)
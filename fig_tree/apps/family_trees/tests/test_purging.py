@@ -0,0 +1,157 @@
+"""Tests for the `purging` module and the deletion of family trees through the API."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission, TreeStatistic
+from apps.family_trees.purging import purge_conflicts, purge_tree, resume_purges, schedule_purge
+from apps.gen_data.models import Citation, Event, Person, Place, Source, Tag
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, enqueue, run_job
+
+
+class PurgeTree(TestCase):
+    """Test the bulk deletion of family trees"""
+
+    def setUp(self) -> None:
+        """Create a family tree with related records and a second unrelated tree"""
+
+        self.tree = FamilyTree.objects.create(tree_name='purged')
+        source = Source.objects.create(tree=self.tree, title='Parish register')
+        country = Place.objects.create(tree=self.tree, name='Ireland')
+        county = Place.objects.create(tree=self.tree, name='Mayo', enclosed_by=country)
+        birth = Event.objects.create(tree=self.tree, event_type='Birth', place=county)
+        Person.objects.create(tree=self.tree, birth=birth)
+        Citation.objects.create(tree=self.tree, source=source, content_object=birth)
+
+        self.other_tree = FamilyTree.objects.create(tree_name='kept')
+        self.other_event = Event.objects.create(tree=self.other_tree, event_type='Death', place=country)
+        self.other_tag = Tag.objects.create(tree=self.other_tree, name='shared', content_object=source)
+
+    def test_records_deleted(self) -> None:
+        """Test the tree, its records, and its statistics are deleted"""
+
+        purge_tree(self.tree.pk)
+        self.assertFalse(FamilyTree.objects.filter(pk=self.tree.pk).exists())
+        self.assertFalse(TreeStatistic.objects.filter(tree_id=self.tree.pk).exists())
+        for model in (Citation, Event, Person, Place, Source):
+            self.assertFalse(model.objects.filter(tree_id=self.tree.pk).exists())
+
+    def test_references_from_other_trees(self) -> None:
+        """Test records in other trees are detached from the purged records instead of deleted"""
+
+        last_modified = self.other_tree.last_modified
+        purge_tree(self.tree.pk)
+
+        self.other_event.refresh_from_db()
+        self.other_tag.refresh_from_db()
+        self.other_tree.refresh_from_db()
+        self.assertIsNone(self.other_event.place)
+        self.assertIsNone(self.other_tag.content_object)
+        self.assertGreater(self.other_tree.last_modified, last_modified)
+
+    def test_non_nullable_references_block_purge(self) -> None:
+        """Test trees are not purged while records in other trees depend on their records"""
+
+        source = Source.objects.get(tree=self.tree)
+        Citation.objects.create(tree=self.other_tree, source=source)
+
+        self.assertEqual({'citations': 1}, purge_conflicts(self.tree.pk))
+        with self.assertRaises(RuntimeError):
+            purge_tree(self.tree.pk)
+
+        self.assertTrue(Source.objects.filter(pk=source.pk).exists())
+
+    def test_progress_reported(self) -> None:
+        """Test progress is reported to the job queue when purging as a background job"""
+
+        job = enqueue(purge_tree, self.tree.pk)
+        run_job(claim_job().pk)
+        job.refresh_from_db()
+
+        self.assertEqual(Job.Status.COMPLETE, job.status)
+        self.assertEqual((6, 6), (job.progress, job.total))
+
+
+class ResumePurges(TestCase):
+    """Test interrupted purges are queued again"""
+
+    def setUp(self) -> None:
+        """Create a family tree queued for deletion"""
+
+        self.tree = FamilyTree.objects.create(tree_name='purged')
+        self.job = schedule_purge(self.tree, user=None)
+
+    def test_pending_purge_not_duplicated(self) -> None:
+        """Test no job is queued while a purge of the tree is pending"""
+
+        self.assertEqual([], resume_purges())
+
+    def test_failed_purge_resumed(self) -> None:
+        """Test a new job is queued when the previous purge did not complete"""
+
+        Job.objects.filter(pk=self.job.pk).update(status=Job.Status.FAILED)
+        jobs = resume_purges()
+
+        self.assertEqual(1, len(jobs))
+        run_job(claim_job().pk)
+        self.assertFalse(FamilyTree.objects.filter(pk=self.tree.pk).exists())
+
+    def test_running_clone_not_purged(self) -> None:
+        """Test incomplete copies are not purged while a clone job is running"""
+
+        Job.objects.filter(pk=self.job.pk).update(status=Job.Status.FAILED)
+        Job.objects.create(task='apps.family_trees.cloning._clone_for_user', status=Job.Status.RUNNING)
+        self.assertEqual([], resume_purges())
+
+
+class PurgeEndpoint(TestCase):
+    """Test family trees are deleted in the background when deleted through the API"""
+
+    def setUp(self) -> None:
+        """Create a family tree administered by a test user"""
+
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.tree = FamilyTree.objects.create(tree_name='purged')
+        TreePermission.objects.create(tree=self.tree, user=self.user, role=TreePermission.Role.ADMIN)
+        Source.objects.create(tree=self.tree, title='Parish register')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_deletion_queued(self) -> None:
+        """Test the tree is hidden immediately and purged by a background job"""
+
+        response = self.client.delete(reverse('family_trees:familytree-detail', args=[self.tree.pk]))
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(Job.Status.PENDING, response.data['status'])
+        self.assertFalse(TreePermission.objects.filter(tree=self.tree).exists())
+        self.assertTrue(FamilyTree.objects.filter(pk=self.tree.pk).exists())
+
+        run_job(claim_job().pk)
+        response = self.client.get(response['Location'])
+        self.assertEqual(Job.Status.COMPLETE, response.data['status'])
+        self.assertFalse(FamilyTree.objects.filter(pk=self.tree.pk).exists())
+
+    def test_conflicting_references(self) -> None:
+        """Test trees referenced by records in other trees are not queued for deletion"""
+
+        other_tree = FamilyTree.objects.create(tree_name='kept')
+        Citation.objects.create(tree=other_tree, source=Source.objects.get(tree=self.tree))
+
+        response = self.client.delete(reverse('family_trees:familytree-detail', args=[self.tree.pk]))
+        self.assertEqual(409, response.status_code)
+        self.assertFalse(Job.objects.exists())
+        self.assertTrue(TreePermission.objects.filter(tree=self.tree).exists())
+
+    def test_admin_required(self) -> None:
+        """Test users without admin permissions cannot delete a tree"""
+
+        TreePermission.objects.filter(tree=self.tree).update(role=TreePermission.Role.WRITE)
+        response = self.client.delete(reverse('family_trees:familytree-detail', args=[self.tree.pk]))
+        self.assertEqual(403, response.status_code)
+        self.assertFalse(Job.objects.exists())
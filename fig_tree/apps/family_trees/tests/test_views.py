@@ -0,0 +1,204 @@
+"""Tests for the `views` module."""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission, TreeStatistic
+
+
+class FamilyTreeViewSetAnnotations(TestCase):
+    """Test the role and count annotations included in family tree list responses"""
+
+    def setUp(self) -> None:
+        """Create a family tree with two members and precomputed record counts"""
+
+        cache.clear()
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_user(username='admin', email='admin@user.com', password='foo', is_active=True)
+        self.reader = user_model.objects.create_user(username='reader', email='reader@user.com', password='foo', is_active=True)
+
+        self.tree = FamilyTree.objects.create(tree_name='Tree 1')
+        TreePermission.objects.create(tree=self.tree, user=self.admin, role=TreePermission.Role.ADMIN)
+        TreePermission.objects.create(tree=self.tree, user=self.reader, role=TreePermission.Role.READ)
+
+        TreeStatistic.objects.bulk_create([
+            TreeStatistic(tree=self.tree, category='records', key='person', private=False, count=3),
+            TreeStatistic(tree=self.tree, category='records', key='person', private=True, count=2),
+            TreeStatistic(tree=self.tree, category='records', key='event', private=False, count=4),
+            TreeStatistic(tree=self.tree, category='surname', key='Smith', private=False, count=7),
+        ])
+
+        self.client = APIClient()
+        self.url = reverse('family_trees:familytree-list')
+
+    def get_tree_data(self, user) -> dict:
+        """Return the list response data for the test tree as seen by the given user"""
+
+        self.client.force_authenticate(user)
+        response = self.client.get(self.url)
+        return next(tree for tree in response.data if tree['id'] == self.tree.pk)
+
+    def test_role_is_annotated(self) -> None:
+        """Test each tree includes the requesting user's role"""
+
+        self.assertEqual(TreePermission.Role.ADMIN, self.get_tree_data(self.admin)['role'])
+        self.assertEqual(TreePermission.Role.READ, self.get_tree_data(self.reader)['role'])
+
+    def test_member_count_is_annotated(self) -> None:
+        """Test each tree includes the number of users with permissions on the tree"""
+
+        self.assertEqual(2, self.get_tree_data(self.reader)['member_count'])
+
+    def test_record_count_respects_privacy(self) -> None:
+        """Test private records are only counted for users allowed to view them"""
+
+        self.assertEqual(9, self.get_tree_data(self.admin)['record_count'])
+        self.assertEqual(7, self.get_tree_data(self.reader)['record_count'])
+
+    def test_tree_without_statistics(self) -> None:
+        """Test counts default to zero for trees without precomputed statistics"""
+
+        TreeStatistic.objects.all().delete()
+        self.assertEqual(0, self.get_tree_data(self.admin)['record_count'])
+
+    def test_single_query(self) -> None:
+        """Test annotations are computed in a single query regardless of the number of trees"""
+
+        for i in range(5):
+            tree = FamilyTree.objects.create(tree_name=f'Tree {i + 2}')
+            TreePermission.objects.create(tree=tree, user=self.admin, role=TreePermission.Role.WRITE)
+
+        self.client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        count_queries = [q for q in queries.captured_queries if 'family_trees_treestatistic' in q['sql']]
+        self.assertEqual(6, len(response.data))
+        self.assertEqual(1, len(count_queries))
+
+
+class TreePermissionViewSetBulk(TestCase):
+    """Test granting and revoking permissions in bulk"""
+
+    def setUp(self) -> None:
+        """Create a family tree with an admin user and several users without permissions"""
+
+        cache.clear()
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_user(username='admin', email='admin@user.com', password='foo')
+        self.users = [
+            user_model.objects.create_user(username=f'user{i}', email=f'user{i}@user.com', password='foo')
+            for i in range(3)
+        ]
+
+        self.tree = FamilyTree.objects.create(tree_name='Tree 1')
+        TreePermission.objects.create(tree=self.tree, user=self.admin, role=TreePermission.Role.ADMIN)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('family_trees:treepermission-bulk')
+
+    def get_roles(self) -> dict[int, int]:
+        """Return a mapping of user ids to their role on the test tree"""
+
+        return dict(TreePermission.objects.filter(tree=self.tree).values_list('user_id', 'role'))
+
+    def test_permissions_are_granted(self) -> None:
+        """Test new permission records are created for each granted user"""
+
+        grants = [{'user': user.pk, 'role': TreePermission.Role.READ} for user in self.users]
+        response = self.client.post(self.url, {'tree': self.tree.pk, 'grant': grants}, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'granted': 3, 'revoked': 0}, response.data)
+        for user in self.users:
+            self.assertEqual(TreePermission.Role.READ, self.get_roles()[user.pk])
+
+    def test_existing_permissions_are_updated(self) -> None:
+        """Test granting a role to an existing member updates their permission record"""
+
+        TreePermission.objects.create(tree=self.tree, user=self.users[0], role=TreePermission.Role.READ)
+        grants = [{'user': self.users[0].pk, 'role': TreePermission.Role.WRITE}]
+        self.client.post(self.url, {'tree': self.tree.pk, 'grant': grants}, format='json')
+
+        self.assertEqual(TreePermission.Role.WRITE, self.get_roles()[self.users[0].pk])
+        self.assertEqual(1, TreePermission.objects.filter(tree=self.tree, user=self.users[0]).count())
+
+    def test_permissions_are_revoked(self) -> None:
+        """Test permission records are deleted for each revoked user"""
+
+        for user in self.users:
+            TreePermission.objects.create(tree=self.tree, user=user, role=TreePermission.Role.READ)
+
+        revoke = [user.pk for user in self.users[:2]]
+        response = self.client.post(self.url, {'tree': self.tree.pk, 'revoke': revoke}, format='json')
+
+        self.assertEqual({'granted': 0, 'revoked': 2}, response.data)
+        self.assertEqual({self.admin.pk, self.users[2].pk}, set(self.get_roles()))
+
+    def test_last_admin_is_retained(self) -> None:
+        """Test requests removing every admin from the tree are rejected without changes"""
+
+        demote = {'tree': self.tree.pk, 'grant': [{'user': self.admin.pk, 'role': TreePermission.Role.WRITE}]}
+        revoke = {'tree': self.tree.pk, 'revoke': [self.admin.pk]}
+        for data in (demote, revoke):
+            response = self.client.post(self.url, data, format='json')
+            self.assertEqual(400, response.status_code)
+            self.assertEqual({self.admin.pk: TreePermission.Role.ADMIN}, self.get_roles())
+
+    def test_admin_handover(self) -> None:
+        """Test admin permissions can be transferred to another user within a single request"""
+
+        grants = [{'user': self.users[0].pk, 'role': TreePermission.Role.ADMIN}]
+        data = {'tree': self.tree.pk, 'grant': grants, 'revoke': [self.admin.pk]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({self.users[0].pk: TreePermission.Role.ADMIN}, self.get_roles())
+
+    def test_non_admin_is_denied(self) -> None:
+        """Test users without admin permissions on the tree cannot manage permissions"""
+
+        TreePermission.objects.create(tree=self.tree, user=self.users[0], role=TreePermission.Role.WRITE)
+        self.client.force_authenticate(self.users[0])
+
+        grants = [{'user': self.users[1].pk, 'role': TreePermission.Role.ADMIN}]
+        response = self.client.post(self.url, {'tree': self.tree.pk, 'grant': grants}, format='json')
+
+        self.assertEqual(403, response.status_code)
+        self.assertNotIn(self.users[1].pk, self.get_roles())
+
+    def test_unknown_users_are_rejected(self) -> None:
+        """Test requests referencing nonexistent users are rejected without changes"""
+
+        grants = [{'user': self.users[0].pk, 'role': TreePermission.Role.READ}, {'user': 0, 'role': 10}]
+        response = self.client.post(self.url, {'tree': self.tree.pk, 'grant': grants}, format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual({self.admin.pk}, set(self.get_roles()))
+
+    def test_duplicate_users_are_rejected(self) -> None:
+        """Test users cannot be listed more than once in a single request"""
+
+        grants = [{'user': self.users[0].pk, 'role': TreePermission.Role.READ}]
+        data = {'tree': self.tree.pk, 'grant': grants, 'revoke': [self.users[0].pk]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(400, response.status_code)
+
+    def test_constant_query_count(self) -> None:
+        """Test the number of queries does not depend on the number of users"""
+
+        grants = [{'user': user.pk, 'role': TreePermission.Role.READ} for user in self.users]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {'tree': self.tree.pk, 'grant': grants[:1]}, format='json')
+
+        with CaptureQueriesContext(connection) as more_queries:
+            self.client.post(self.url, {'tree': self.tree.pk, 'grant': grants}, format='json')
+
+        self.assertEqual(len(queries), len(more_queries))
@@ -5,12 +5,15 @@ View objects can be found in the `views` module.
 
 # URL Routing Configuration
 
-| URL                   | View / View Set         | Name               |
-|-----------------------|------------------------|---------------------|
-| `tree/`               | `FamilyTreeViewSet`    | `tree-list`         |
-| `tree/<str:pk>`       | `FamilyTreeViewSet`    | `tree-detail`       |
-| `permission/`         | `PermissionViewSet`    | `permission-list`   |
-| `permission/<str:pk>` | `PermissionViewSet`    | `permission-detail` |
+| URL                    | View / View Set         | Name                    |
+|------------------------|-------------------------|-------------------------|
+| `tree/`                | `FamilyTreeViewSet`     | `familytree-list`       |
+| `tree/<str:pk>`        | `FamilyTreeViewSet`     | `familytree-detail`     |
+| `tree/<str:pk>/stats/` | `FamilyTreeViewSet`     | `familytree-stats`      |
+| `tree/<str:pk>/clone/` | `FamilyTreeViewSet`     | `familytree-clone`      |
+| `permission/`          | `TreePermissionViewSet` | `treepermission-list`   |
+| `permission/<str:pk>`  | `TreePermissionViewSet` | `treepermission-detail` |
+| `permission/bulk/`     | `TreePermissionViewSet` | `treepermission-bulk`   |
 """
 
 from rest_framework import routers
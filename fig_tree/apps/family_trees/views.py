@@ -8,13 +8,27 @@ Whenever possible, generic base classes are used to implement common behavior
 for HTTP request handling.
 """
 
-from django.db.models import Subquery, Manager
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Manager, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.urls import reverse
 from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.serializers import Serializer
 
+from apps.authentication.ratelimit import SlidingWindowThrottle
+from apps.jobs.models import Job
+from apps.jobs.serializers import JobSerializer
+from .caching import *
+from .cloning import *
 from .models import *
 from .permissions import *
+from .purging import *
 from .serializers import *
 
 __all__ = [
@@ -24,6 +38,7 @@ __all__ = [
 
 
 class FamilyTreeViewSet(
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -36,16 +51,40 @@ class FamilyTreeViewSet(
     serializer_class = FamilyTreeSerializer
     queryset = FamilyTree.objects
     permission_classes = (IsAuthenticated, FamilyTreeObjectPermission)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = 'family_trees'
 
     def get_queryset(self) -> Manager:
         """Return the filtered queryset used by the API endpoint to execute DB queries
 
         Records are only returned where the requesting user has `read` permissions or higher.
+        Each tree is annotated with the requesting user's `role`, the number of
+        tree members (`member_count`), and the number of genealogical records
+        visible to the user (`record_count`).
         """
 
-        return self.queryset.filter(
+        # Annotations following the filter reuse its join on the user's permission record
+        queryset = self.queryset.filter(
+            token_tree_filter(self.request, TreePermission.Role.READ, field='pk'),
             treepermission__user=self.request.user.pk,
-            treepermission__role__gte=TreePermission.Role.READ)
+            treepermission__role__gte=TreePermission.Role.READ
+        ).annotate(role=scoped_role(self.request, F('treepermission__role'), field='pk'))
+
+        members = TreePermission.objects.filter(tree=OuterRef('pk')).order_by() \
+            .values('tree').annotate(total=Count('pk')).values('total')
+
+        def records(private: bool) -> Coalesce:
+            statistics = TreeStatistic.objects.filter(tree=OuterRef('pk'), category='records', private=private)
+            total = statistics.order_by().values('tree').annotate(total=Sum('count')).values('total')
+            return Coalesce(Subquery(total, output_field=IntegerField()), 0)
+
+        return queryset.annotate(
+            member_count=Coalesce(Subquery(members, output_field=IntegerField()), 0),
+            record_count=records(private=False) + Case(
+                When(role__gte=TreePermission.Role.READ_PRIVATE, then=records(private=True)),
+                default=Value(0),
+            ),
+        )
 
     def create(self, request, *args, **kwargs):
         """Create a new Family Tree
@@ -66,6 +105,75 @@ class FamilyTreeViewSet(
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    def destroy(self, request, *args, **kwargs) -> Response:
+        """Queue a family tree and all of its records for deletion
+
+        Access to the tree is revoked immediately and records are deleted by a
+        background job. The returned job can be polled to monitor progress.
+        Trees referenced by records in other trees that cannot be detached
+        from the deleted records are not deleted.
+        """
+
+        tree = self.get_object()
+        if conflicts := purge_conflicts(tree.pk):
+            detail = ', '.join(f'{count} {name}' for name, count in conflicts.items())
+            return Response(
+                {'detail': f'The family tree is referenced by records in other trees: {detail}.'},
+                status=status.HTTP_409_CONFLICT)
+
+        job = schedule_purge(tree, request.user)
+        return self.job_response(job)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk: str = None) -> Response:
+        """Return summary statistics for the contents of a family tree
+
+        Statistics are read from the precomputed `TreeStatistic` table and are
+        grouped by category. Private records are only included for users with
+        permission to view private records.
+        """
+
+        tree = self.get_object()
+        statistics = tree.statistics.filter(count__gt=0)
+
+        role = get_role(request, tree.pk)
+        if role < TreePermission.Role.READ_PRIVATE:
+            statistics = statistics.filter(private=False)
+
+        data = defaultdict(dict)
+        for category, key, count in statistics.values('category', 'key').annotate(total=Sum('count')) \
+                .values_list('category', 'key', 'total'):
+            data[category][key] = count
+
+        return Response(data)
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
+    def clone(self, request, pk: str = None) -> Response:
+        """Queue a copy of a family tree and all of its records
+
+        Cloning requires permission to view private records in the source tree.
+        The requesting user is granted admin permissions on the new tree, whose
+        primary key is returned as the result of the queued job.
+        """
+
+        tree = self.get_object()
+        role = get_role(request, tree.pk)
+        if role < TreePermission.Role.READ_PRIVATE:
+            raise PermissionDenied('Cloning a family tree requires permission to view private records.')
+
+        serializer = FamilyTreeSerializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        job = schedule_clone(tree, request.user, serializer.validated_data.get('tree_name'))
+        return self.job_response(job)
+
+    @staticmethod
+    def job_response(job: Job) -> Response:
+        """Return a `202 Accepted` response describing a queued background job"""
+
+        headers = {'Location': reverse('jobs:job-detail', args=[job.pk])}
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers=headers)
+
 
 class TreePermissionViewSet(
     mixins.ListModelMixin,
@@ -80,6 +188,16 @@ class TreePermissionViewSet(
     serializer_class = TreePermissionSerializer
     queryset = TreePermission.objects
     permission_classes = (IsAuthenticated, TreePermissionObjectPermission)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = 'family_trees'
+
+    def get_serializer_class(self) -> type[Serializer]:
+        """Return the serializer class used to validate and serialize request data"""
+
+        if self.action == 'bulk':
+            return TreePermissionBulkSerializer
+
+        return super().get_serializer_class()
 
     def get_queryset(self) -> Manager:
         """Return the filtered queryset used by the API endpoint to execute DB queries
@@ -89,8 +207,50 @@ class TreePermissionViewSet(
 
         # Return all permission objects related to family trees where the user is an admin
         tree_ids = TreePermission.objects.filter(
+            token_tree_filter(self.request, TreePermission.Role.ADMIN),
             user=self.request.user.pk,
             role__gte=TreePermission.Role.ADMIN
         ).values('tree_id')
 
         return self.queryset.filter(tree_id__in=Subquery(tree_ids))
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request) -> Response:
+        """Grant and revoke permissions for multiple users on a single family tree
+
+        The requesting user's role is checked once for the entire request.
+        Granted roles are inserted, or updated if the user already has
+        permissions on the tree, using a single upsert statement. Requests
+        leaving the tree without an admin user are rejected.
+        """
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tree_id = serializer.validated_data['tree']
+
+        role = get_role(request, tree_id)
+        if role is None or role < TreePermission.Role.ADMIN:
+            raise PermissionDenied('Managing permissions requires admin permissions on the family tree.')
+
+        grants = serializer.validated_data['grant']
+        revoke = serializer.validated_data['revoke']
+        with transaction.atomic():
+            # Serialize concurrent requests that could each remove a different admin
+            admins = TreePermission.objects.filter(tree_id=tree_id, role__gte=TreePermission.Role.ADMIN)
+            list(admins.select_for_update().values_list('pk', flat=True))
+
+            TreePermission.objects.bulk_create(
+                [TreePermission(tree_id=tree_id, user_id=grant['user'], role=grant['role']) for grant in grants],
+                update_conflicts=True,
+                unique_fields=['tree', 'user'],
+                update_fields=['role', 'last_modified'],
+            )
+
+            revoked, _ = TreePermission.objects.filter(tree_id=tree_id, user_id__in=revoke).delete()
+            if not admins.exists():
+                raise ValidationError('Family trees must retain at least one admin user.')
+
+            # Bulk inserts bypass the signal handlers used to invalidate cached responses
+            touch_trees([tree_id])
+
+        return Response({'granted': len(grants), 'revoked': revoked})
@@ -8,7 +8,9 @@ and permissions of admin portal interfaces.
 from django.conf import settings
 from django.contrib import admin
 
+from apps.family_trees.caching import touch_trees
 from .models import *
+from .statistics import rebuild_statistics
 
 settings.JAZZMIN_SETTINGS['icons'].update({
     'gen_data.Address': 'fa fa-address-card',
@@ -42,17 +44,28 @@ class ReadOnlyTreeMixin:
 class BaseRecordAdmin(ReadOnlyTreeMixin, admin.ModelAdmin):
     """Base class used to build admin interfaces for genealogical record tables"""
 
+    @staticmethod
+    def _set_private(queryset, private: bool) -> None:
+        """Set the privacy of the selected records and refresh the statistics of their family trees"""
+
+        tree_ids = set(queryset.values_list('tree_id', flat=True))
+        queryset.update(private=private)
+
+        # Bulk updates bypass the signal handlers that maintain statistics incrementally
+        rebuild_statistics(tree_ids)
+        touch_trees(tree_ids)
+
     @admin.action
     def set_selected_to_private(self, request, queryset) -> None:
         """Mark selected records as private"""
 
-        queryset.update(private=True)
+        self._set_private(queryset, True)
 
     @admin.action
     def set_selected_to_public(self, request, queryset) -> None:
         """Mark selected records as public"""
 
-        queryset.update(private=False)
+        self._set_private(queryset, False)
 
     actions = [set_selected_to_private, set_selected_to_public]
     readonly_fields = ['last_modified']
@@ -131,11 +144,13 @@ class FamilyAdmin(BaseRecordAdmin):
 class MediaAdmin(BaseRecordAdmin):
     """Admin interface for `Media` records"""
 
-    list_display = ['description', 'date']
+    list_display = ['description', 'date', 'width', 'height']
     search_fields = ['description']
+    readonly_fields = ['last_modified', 'width', 'height', 'captured_at', 'latitude', 'longitude', 'metadata']
     fieldsets = [
         ('Family Tree', {'fields': ['tree', 'private']}),
         ('Record Info', {'fields': ['blob', 'date_type', 'date', 'description']}),
+        ('File Metadata', {'fields': ['width', 'height', 'captured_at', 'latitude', 'longitude', 'metadata']}),
     ]
 
 
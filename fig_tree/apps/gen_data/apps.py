@@ -12,3 +12,8 @@ class Config(AppConfig):
 
     name = 'apps.gen_data'
     verbose_name = "Genealogical Data"
+
+    def ready(self) -> None:
+        """Connect application signal handlers"""
+
+        from . import signals  # noqa: F401
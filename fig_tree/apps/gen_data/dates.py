@@ -0,0 +1,132 @@
+"""
+The `dates` module handles the interpretation of genealogical dates.
+
+Genealogical dates are often imprecise (e.g., "about 1850" or "before
+1900") and are stored as a date type alongside one or two calendar dates.
+To support efficient range queries, each date is normalized into the
+earliest and latest calendar dates it may refer to. The width of imprecise
+dates is configured using the following application settings (in years):
+
+| Setting             | Description                                          |
+|---------------------|------------------------------------------------------|
+| `DATE_ABOUT_RANGE`  | Years on either side of an "about" date              |
+| `DATE_BEFORE_RANGE` | Years preceding a "before" date                      |
+| `DATE_AFTER_RANGE`  | Years following an "after" date                      |
+
+Normalized ranges are stored on each event when it is saved. After changing
+any of the above settings, stored ranges are updated using the
+`rebuild_sort_dates` management command.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.jobs.queue import report_progress
+
+__all__ = ['DateType', 'rebuild_sort_dates', 'shift_years', 'sort_date_range']
+
+CHUNK_SIZE = 1000
+
+
+class DateType(models.IntegerChoices):
+    """Date type for the event"""
+
+    REGULAR = 0, _('regular')
+    BEFORE = 1, _('before')
+    AFTER = 2, _('after')
+    ABOUT = 3, _('about')
+    RANGE = 4, _('range')
+    SPAN = 5, _('span')
+
+
+def shift_years(value: date, years: int) -> date:
+    """Shift a date by a number of years, clamping to the supported date range
+
+    Args:
+        value: The date to shift
+        years: The number of years to shift by (may be negative)
+
+    Returns:
+        The shifted date
+    """
+
+    year = min(max(value.year + years, date.min.year), date.max.year)
+    try:
+        return value.replace(year=year)
+
+    except ValueError:  # February 29th in a non-leap year
+        return value.replace(year=year, day=28)
+
+
+def sort_date_range(date_type: int, start: date | None, end: date | None) -> tuple[date | None, date | None]:
+    """Return the earliest and latest calendar dates a genealogical date may refer to
+
+    Args:
+        date_type: The `DateType` value of the date
+        start: The primary date value
+        end: The end date for range and span dates
+
+    Returns:
+        A tuple with the earliest and latest possible dates, or `(None, None)` if the date is unknown
+    """
+
+    if start is None:
+        return None, None
+
+    if date_type == DateType.BEFORE:
+        return shift_years(start, -settings.DATE_BEFORE_RANGE), start
+
+    if date_type == DateType.AFTER:
+        return start, shift_years(start, settings.DATE_AFTER_RANGE)
+
+    if date_type == DateType.ABOUT:
+        return shift_years(start, -settings.DATE_ABOUT_RANGE), shift_years(start, settings.DATE_ABOUT_RANGE)
+
+    if date_type in (DateType.RANGE, DateType.SPAN) and end is not None:
+        return min(start, end), max(start, end)
+
+    return start, start
+
+
+def rebuild_sort_dates(chunk_size: int = CHUNK_SIZE) -> int:
+    """Recompute the stored date ranges of events with imprecise dates
+
+    Only events whose width depends on application settings are recomputed.
+    When run as a background job, progress is reported after each batch.
+
+    Args:
+        chunk_size: The number of events updated per database query
+
+    Returns:
+        The number of events with an updated date range
+    """
+
+    from .models import Event  # Protect against circular import
+
+    events = Event.objects \
+        .filter(date__isnull=False, date_type__in=[DateType.BEFORE, DateType.AFTER, DateType.ABOUT]) \
+        .only('date_type', 'date', 'date_end', 'sort_date_min', 'sort_date_max') \
+        .order_by('pk')
+
+    total = events.count()
+    processed = updated = last_pk = 0
+    while chunk := list(events.filter(pk__gt=last_pk)[:chunk_size]):
+        changed = []
+        for event in chunk:
+            sort_dates = sort_date_range(event.date_type, event.date, event.date_end)
+            if sort_dates != (event.sort_date_min, event.sort_date_max):
+                event.sort_date_min, event.sort_date_max = sort_dates
+                changed.append(event)
+
+        Event.objects.bulk_update(changed, ['sort_date_min', 'sort_date_max'])
+        updated += len(changed)
+        processed += len(chunk)
+        last_pk = chunk[-1].pk
+        report_progress(processed, max(processed, total))
+
+    return updated
@@ -0,0 +1,221 @@
+"""
+The `downloads` module handles serving stored media files to clients.
+Responses support conditional requests (`ETag`/`If-None-Match`) and single
+byte-range requests, allowing clients to seek within large files without
+downloading them in full.
+
+File transfers can optionally be offloaded to a front-end web server using
+the `MEDIA_SENDFILE` application setting:
+
+| Setting Value | Web Server         | Response Header    |
+|---------------|--------------------|--------------------|
+| `nginx`       | Nginx              | `X-Accel-Redirect` |
+| `apache`      | Apache / Lighttpd  | `X-Sendfile`       |
+
+When offloading is disabled, file content is streamed by the application.
+Requests served over ASGI use asynchronous file iteration, while requests
+served over WSGI use a synchronous iterator so the response is not buffered
+in memory by the handler.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import re
+from typing import AsyncIterator, BinaryIO, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models.fields.files import FieldFile
+from django.http import HttpRequest, HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+__all__ = [
+    'RangeNotSatisfiable',
+    'file_etag',
+    'parse_range_header',
+    'serve_file',
+]
+
+STREAM_BLOCK_SIZE = 64 * 1024
+RANGE_REGEX = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a requested byte range lies outside the requested file"""
+
+
+def file_etag(field_file: FieldFile) -> str:
+    """Return a strong entity tag for a stored file
+
+    Args:
+        field_file: The stored file
+
+    Returns:
+        A quoted entity tag string
+    """
+
+    try:
+        modified = field_file.storage.get_modified_time(field_file.name).timestamp()
+
+    except NotImplementedError:
+        modified = 0
+
+    digest = hashlib.md5(f'{field_file.name}:{field_file.size}:{modified}'.encode(), usedforsecurity=False)
+    return f'"{digest.hexdigest()}"'
+
+
+def parse_range_header(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse the value of an HTTP `Range` header
+
+    Only single byte ranges are supported. Headers requesting multiple ranges,
+    or using units other than bytes, are ignored.
+
+    Args:
+        header: The header value
+        size: The total size of the requested file in bytes
+
+    Returns:
+        The first and last byte positions (inclusive), or `None` if the header is ignored
+    """
+
+    match = RANGE_REGEX.match(header or '')
+    if not match or not (match['start'] or match['end']):
+        return None
+
+    if not match['start']:  # Suffix range, e.g., the last 500 bytes
+        start, end = max(size - int(match['end']), 0), size - 1
+
+    else:
+        start = int(match['start'])
+        end = min(int(match['end']), size - 1) if match['end'] else size - 1
+
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(f'Range {header} is not satisfiable for a file of {size} bytes.')
+
+    return start, end
+
+
+def _iter_file(file: BinaryIO, start: int, length: int) -> Iterator[bytes]:
+    """Iterate over a section of an open file
+
+    Args:
+        file: The open file to read from
+        start: The byte offset to start reading at
+        length: The number of bytes to read
+    """
+
+    try:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(STREAM_BLOCK_SIZE, length))
+            if not block:
+                break
+
+            length -= len(block)
+            yield block
+
+    finally:
+        file.close()
+
+
+async def _aiter_file(file: BinaryIO, start: int, length: int) -> AsyncIterator[bytes]:
+    """Asynchronously iterate over a section of an open file
+
+    Blocking file reads are executed in a worker thread to avoid blocking the event loop.
+
+    Args:
+        file: The open file to read from
+        start: The byte offset to start reading at
+        length: The number of bytes to read
+    """
+
+    read = sync_to_async(file.read, thread_sensitive=False)
+    try:
+        await sync_to_async(file.seek, thread_sensitive=False)(start)
+        while length > 0:
+            block = await read(min(STREAM_BLOCK_SIZE, length))
+            if not block:
+                break
+
+            length -= len(block)
+            yield block
+
+    finally:
+        await sync_to_async(file.close, thread_sensitive=False)()
+
+
+def _sendfile_headers(field_file: FieldFile) -> dict[str, str]:
+    """Return response headers delegating a file transfer to the front-end web server
+
+    Args:
+        field_file: The stored file to serve
+
+    Returns:
+        A dictionary of response headers, empty if offloading is disabled
+    """
+
+    backend = getattr(settings, 'MEDIA_SENDFILE', '')
+    if backend == 'nginx':
+        prefix = getattr(settings, 'MEDIA_SENDFILE_PREFIX', '/protected-media/')
+        return {'X-Accel-Redirect': prefix.rstrip('/') + '/' + field_file.name}
+
+    if backend == 'apache':
+        return {'X-Sendfile': field_file.path}
+
+    return dict()
+
+
+def serve_file(request: HttpRequest, field_file: FieldFile) -> HttpResponseBase:
+    """Return an HTTP response serving the content of a stored file
+
+    Args:
+        request: The incoming HTTP request
+        field_file: The stored file to serve
+
+    Returns:
+        An HTTP response containing (or referencing) the requested file content
+    """
+
+    etag = file_etag(field_file)
+    if etag in request.headers.get('If-None-Match', ''):
+        return HttpResponse(status=304, headers={'ETag': etag})
+
+    content_type = mimetypes.guess_type(field_file.name)[0] or 'application/octet-stream'
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private',
+        'Content-Disposition': content_disposition_header(False, field_file.name.rsplit('/', 1)[-1]),
+        'ETag': etag,
+    }
+
+    sendfile_headers = _sendfile_headers(field_file)
+    if sendfile_headers:
+        return HttpResponse(content_type=content_type, headers={**headers, **sendfile_headers})
+
+    # Only honor range requests if the client's cached copy matches the current file
+    size = field_file.size
+    byte_range = None
+    if request.headers.get('If-Range', etag) == etag:
+        try:
+            byte_range = parse_range_header(request.headers.get('Range'), size)
+
+        except RangeNotSatisfiable:
+            return HttpResponse(status=416, headers={'Content-Range': f'bytes */{size}'})
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+    headers['Content-Length'] = str(length)
+    if byte_range:
+        headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    # Django buffers asynchronous iterators in full when serving over WSGI
+    is_asgi = isinstance(getattr(request, '_request', request), ASGIRequest)
+    iterator = _aiter_file if is_asgi else _iter_file
+    return StreamingHttpResponse(
+        iterator(field_file.storage.open(field_file.name, 'rb'), start, length),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+        headers=headers)
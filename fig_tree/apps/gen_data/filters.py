@@ -0,0 +1,196 @@
+"""
+The `filters` module defines filter backends for restricting API querysets
+using URL query parameters. Filters are translated directly into database
+lookups so that filtering is performed in SQL rather than by API clients.
+
+## Geographic Query Parameters
+
+Endpoints using the `GeoFilter` backend support the following parameters.
+
+| Parameter | Example                     | Description                                            |
+|-----------|-----------------------------|--------------------------------------------------------|
+| `bbox`    | `bbox=-10.5,51.4,-5.4,55.4` | Records within a `west,south,east,north` bounding box. |
+| `near`    | `near=53.35,-6.26`          | Center point (`lat,long`) for radius queries.          |
+| `radius`  | `radius=25`                 | Search radius in kilometers (used with `near`).        |
+| `geohash` | `geohash=gc7x`              | Records located within the given geohash cell.         |
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+
+from apps.family_trees.permissions import readable_records_filter
+from .geo import EARTH_RADIUS_KM, bounding_box
+from .models import Place
+
+__all__ = ['GeoFilter', 'PlacePathField', 'QueryParameterFilter']
+
+
+class PlacePathField(serializers.IntegerField):
+    """Query parameter field converting a `Place` primary key into the place's materialized path
+
+    Combined with a `__startswith` lookup, the parsed value selects records
+    located anywhere within the given place using a single indexed prefix match.
+    The path is resolved by primary key from places readable by the requesting
+    user. Places that do not exist and places the user cannot access both
+    resolve to `None`, matching no records.
+    """
+
+    def to_internal_value(self, data) -> str | None:
+        """Return the materialized path of the place with the given primary key"""
+
+        pk = super().to_internal_value(data)
+        places = Place.objects.filter(readable_records_filter(self.context['request']), pk=pk)
+        return places.values_list('path', flat=True).first()
+
+
+class QueryParameterFilter(BaseFilterBackend):
+    """Filter querysets using query parameters declared by the view
+
+    Views declare supported query parameters using the `filter_parameters`
+    attribute. Each parameter name is mapped to a model field lookup and a
+    serializer field instance used to validate and parse the parameter value:
+
+        filter_parameters = {
+            'min_width': ('width__gte', serializers.IntegerField()),
+        }
+
+    Query parameters not declared by the view are ignored. Invalid parameter
+    values result in a `400 Bad Request` response. Fields can access the
+    incoming request and view using their `context` attribute. Fields
+    returning `None` match no records.
+    """
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        """Return a filtered queryset
+
+        Args:
+            request: The incoming HTTP request
+            queryset: The queryset to filter
+            view: The view handling the request
+
+        Returns:
+            The filtered queryset
+        """
+
+        filters, errors = dict(), dict()
+        for parameter, (lookup, field) in getattr(view, 'filter_parameters', dict()).items():
+            if parameter not in request.query_params:
+                continue
+
+            # Fields are shared between requests, so request specific context is set on a copy
+            field = copy.deepcopy(field)
+            field._context = {'request': request, 'view': view}
+            try:
+                filters[lookup] = field.run_validation(request.query_params[parameter])
+
+            except ValidationError as error:
+                errors[parameter] = error.detail
+
+        if errors:
+            raise ValidationError(errors)
+
+        if None in filters.values():
+            return queryset.none()
+
+        return queryset.filter(**filters)
+
+
+class GeoFilter(BaseFilterBackend):
+    """Filter querysets by geographic location
+
+    Views declare the model fields storing latitude, longitude, and geohash
+    values using the `geo_fields` attribute. Fields may span relationships,
+    and the geohash field may be `None` if the model does not store one:
+
+        geo_fields = ('place__lat', 'place__long', 'place__geohash')
+
+    Views without a `geo_fields` attribute are not filtered. Radius queries
+    are first limited to the bounding box enclosing the search circle (an
+    indexed range scan) before evaluating exact great-circle distances.
+    """
+
+    @staticmethod
+    def _parse_floats(request: Request, parameter: str, count: int) -> list[float] | None:
+        """Parse a comma separated list of floats from a query parameter"""
+
+        value = request.query_params.get(parameter)
+        if value is None:
+            return None
+
+        try:
+            values = [float(v) for v in value.split(',')]
+
+        except ValueError:
+            values = []
+
+        if len(values) != count:
+            raise ValidationError({parameter: f'Expected {count} comma separated numbers.'})
+
+        return values
+
+    @staticmethod
+    def _filter_bbox(queryset: QuerySet, lat_field: str, long_field: str, bbox: list[float]) -> QuerySet:
+        """Limit a queryset to records within a bounding box"""
+
+        west, south, east, north = bbox
+        queryset = queryset.filter(**{f'{lat_field}__gte': south, f'{lat_field}__lte': north})
+
+        # Bounding boxes crossing the antimeridian are split in two
+        if west > east:
+            return queryset.filter(Q(**{f'{long_field}__gte': west}) | Q(**{f'{long_field}__lte': east}))
+
+        return queryset.filter(**{f'{long_field}__gte': west, f'{long_field}__lte': east})
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        """Return a filtered queryset
+
+        Args:
+            request: The incoming HTTP request
+            queryset: The queryset to filter
+            view: The view handling the request
+
+        Returns:
+            The filtered queryset
+        """
+
+        geo_fields = getattr(view, 'geo_fields', None)
+        if not geo_fields:
+            return queryset
+
+        lat_field, long_field, geohash_field = geo_fields
+        if bbox := self._parse_floats(request, 'bbox', 4):
+            queryset = self._filter_bbox(queryset, lat_field, long_field, bbox)
+
+        geohash = request.query_params.get('geohash')
+        if geohash and geohash_field:
+            queryset = queryset.filter(**{f'{geohash_field}__startswith': geohash.lower()})
+
+        near = self._parse_floats(request, 'near', 2)
+        if near is None:
+            return queryset
+
+        radius = self._parse_floats(request, 'radius', 1)
+        if radius is None or radius[0] <= 0:
+            raise ValidationError({'radius': 'A positive search radius is required when using `near`.'})
+
+        lat, long = near
+        queryset = self._filter_bbox(queryset, lat_field, long_field, list(bounding_box(lat, long, radius[0])))
+
+        # Great-circle distance using the haversine formula
+        half_delta_lat = Radians(F(lat_field) - lat) / 2
+        half_delta_long = Radians(F(long_field) - long) / 2
+        haversine = Power(Sin(half_delta_lat), 2) \
+            + math.cos(math.radians(lat)) * Cos(Radians(F(lat_field))) * Power(Sin(half_delta_long), 2)
+
+        return queryset \
+            .annotate(distance=2 * EARTH_RADIUS_KM * ASin(Sqrt(haversine))) \
+            .filter(distance__lte=radius[0])
@@ -0,0 +1,83 @@
+"""
+The `geo` module provides utilities for working with geographic coordinates,
+including the geohash encoding of latitude/longitude pairs and the
+calculation of bounding boxes used to prefilter radius queries.
+
+Geohashes interleave the bits of a coordinate's latitude and longitude into
+a single string. Nearby locations share a common prefix, allowing spatial
+lookups to be performed as prefix matches against an ordinary database index.
+"""
+
+from __future__ import annotations
+
+import math
+
+__all__ = [
+    'EARTH_RADIUS_KM',
+    'bounding_box',
+    'encode_geohash',
+]
+
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_PRECISION = 12
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(lat: float, long: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Return the geohash of a geographic coordinate
+
+    Args:
+        lat: Latitude in decimal degrees
+        long: Longitude in decimal degrees
+        precision: Number of characters in the returned hash
+
+    Returns:
+        The geohash string
+    """
+
+    lat_range, long_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+    while len(geohash) < precision:
+        interval, value = (long_range, long) if even else (lat_range, lat)
+        midpoint = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= midpoint:
+            bits |= 1
+            interval[0] = midpoint
+
+        else:
+            interval[1] = midpoint
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+
+    return ''.join(geohash)
+
+
+def bounding_box(lat: float, long: float, radius: float) -> tuple[float, float, float, float]:
+    """Return the bounding box enclosing a circle on the Earth's surface
+
+    Args:
+        lat: Latitude of the circle center in decimal degrees
+        long: Longitude of the circle center in decimal degrees
+        radius: Circle radius in kilometers
+
+    Returns:
+        The `(west, south, east, north)` edges of the bounding box in decimal degrees
+    """
+
+    delta_lat = math.degrees(radius / EARTH_RADIUS_KM)
+    south, north = max(lat - delta_lat, -90.0), min(lat + delta_lat, 90.0)
+
+    # Circles enclosing a pole span all longitudes
+    if south <= -90 or north >= 90:
+        return -180.0, south, 180.0, north
+
+    delta_long = math.degrees(math.asin(min(math.sin(radius / EARTH_RADIUS_KM) / math.cos(math.radians(lat)), 1)))
+    west, east = long - delta_long, long + delta_long
+    west = west + 360 if west < -180 else west
+    east = east - 360 if east > 180 else east
+    return west, south, east, north
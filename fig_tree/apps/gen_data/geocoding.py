@@ -0,0 +1,266 @@
+"""
+The `geocoding` module resolves the coordinates of `Address` records against
+a local gazetteer without making network requests. Gazetteers are loaded from
+GeoNames dump files (e.g., `allCountries.txt` or a single country extract)
+available from https://download.geonames.org/export/dump/.
+
+Dump files are converted once into an indexed SQLite database stored next to
+the dump (or at a given path) and rebuilt whenever the dump file changes.
+Worker processes query the database using read-only, memory-mapped
+connections, so the gazetteer is shared through the operating system page
+cache instead of being loaded into the memory of each process.
+
+Addresses are resolved from their most specific known component. The
+municipality is matched against populated places, preferring places within
+the address province and country and then the most populous candidate. When
+the municipality is unknown, the location of the province or country is used
+instead.
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import sqlite3
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Iterable, Iterator
+
+__all__ = ['Gazetteer', 'geocode_rows', 'init_worker', 'normalize']
+
+# Column positions in GeoNames dump files
+NAME, ASCII_NAME, ALT_NAMES, LAT, LONG, FEATURE_CLASS, FEATURE_CODE, COUNTRY, ADMIN1, POPULATION = \
+    1, 2, 3, 4, 5, 6, 7, 8, 10, 14
+
+# Number of rows inserted per statement when building a gazetteer index
+INSERT_BATCH_SIZE = 10_000
+
+# Maximum number of bytes of the index file memory-mapped by each connection
+MMAP_SIZE = 2 ** 32
+
+SCHEMA = """
+CREATE TABLE countries (name TEXT PRIMARY KEY, country TEXT, lat REAL, long REAL) WITHOUT ROWID;
+CREATE TABLE provinces (name TEXT, country TEXT, admin1 TEXT, lat REAL, long REAL);
+CREATE TABLE places (name TEXT, country TEXT, admin1 TEXT, population INTEGER, lat REAL, long REAL);
+"""
+
+INDEXES = """
+CREATE INDEX provinces_name ON provinces (name, country);
+CREATE INDEX places_name ON places (name, country, population);
+"""
+
+
+def normalize(name: str | None) -> str:
+    """Normalize a place name for comparison by removing accents, case, and extra whitespace
+
+    Args:
+        name: The place name to normalize
+
+    Returns:
+        The normalized name
+    """
+
+    if not name:
+        return ''
+
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def _index_rows(row: list[str]) -> Iterator[tuple[str, tuple]]:
+    """Yield the index table names and values for a single GeoNames record
+
+    Args:
+        row: The columns of a GeoNames dump record
+    """
+
+    country, admin1 = row[COUNTRY], row[ADMIN1]
+    lat, long = float(row[LAT]), float(row[LONG])
+    names = {normalize(row[NAME]), normalize(row[ASCII_NAME])}
+
+    if row[FEATURE_CODE].startswith('PCL'):
+        names.update(normalize(name) for name in row[ALT_NAMES].split(','))
+        names.add(normalize(country))
+        names.discard('')
+        for name in names:
+            yield 'countries', (name, country, lat, long)
+
+    elif row[FEATURE_CODE] == 'ADM1':
+        names.update(normalize(name) for name in row[ALT_NAMES].split(','))
+        names.discard('')
+        for name in names:
+            yield 'provinces', (name, country, admin1, lat, long)
+
+    elif row[FEATURE_CLASS] == 'P':
+        population = int(row[POPULATION] or 0)
+        names.discard('')
+        for name in names:
+            yield 'places', (name, country, admin1, population, lat, long)
+
+
+class Gazetteer:
+    """Read-only interface to an indexed gazetteer database"""
+
+    INSERT_STATEMENTS = {
+        'countries': 'INSERT OR IGNORE INTO countries VALUES (?, ?, ?, ?)',
+        'provinces': 'INSERT INTO provinces VALUES (?, ?, ?, ?, ?)',
+        'places': 'INSERT INTO places VALUES (?, ?, ?, ?, ?, ?)',
+    }
+
+    def __init__(self, index_path: Path | str) -> None:
+        """Open an existing gazetteer index
+
+        Args:
+            index_path: Path of an index created by `build_index`
+        """
+
+        self.connection = sqlite3.connect(f'{Path(index_path).resolve().as_uri()}?mode=ro', uri=True)
+        self.connection.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+
+    @staticmethod
+    def index_path(path: Path | str) -> Path:
+        """Return the default index path for a GeoNames dump file"""
+
+        path = Path(path)
+        return path.with_name(f'{path.name}.sqlite')
+
+    @classmethod
+    def build_index(cls, path: Path | str, index_path: Path | str | None = None) -> Path:
+        """Build an indexed gazetteer database from a GeoNames dump file
+
+        The dump is streamed into the database in batches, so the file is never
+        loaded into memory in its entirety. Existing indexes are reused unless
+        the dump file has been modified since the index was built.
+
+        Args:
+            path: Path of the tab separated GeoNames dump
+            index_path: Path of the index database (defaults to the dump path with a `.sqlite` suffix)
+
+        Returns:
+            The path of the index database
+        """
+
+        index_path = Path(index_path or cls.index_path(path))
+        if index_path.exists() and index_path.stat().st_mtime >= Path(path).stat().st_mtime:
+            return index_path
+
+        # Build the index under a temporary name so concurrent readers never see a partial database
+        temp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}.tmp')
+        temp_path.unlink(missing_ok=True)
+        csv.field_size_limit(sys.maxsize)
+
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.executescript(SCHEMA)
+            batches = {table: [] for table in cls.INSERT_STATEMENTS}
+            with open(path, encoding='utf-8', newline='') as file:
+                for row in csv.reader(file, delimiter='\t', quoting=csv.QUOTE_NONE):
+                    for table, values in _index_rows(row):
+                        batch = batches[table]
+                        batch.append(values)
+                        if len(batch) >= INSERT_BATCH_SIZE:
+                            connection.executemany(cls.INSERT_STATEMENTS[table], batch)
+                            batch.clear()
+
+            for table, batch in batches.items():
+                connection.executemany(cls.INSERT_STATEMENTS[table], batch)
+
+            connection.executescript(INDEXES)
+            connection.commit()
+
+        finally:
+            connection.close()
+
+        temp_path.replace(index_path)
+        return index_path
+
+    @classmethod
+    def from_geonames(cls, path: Path | str, index_path: Path | str | None = None) -> Gazetteer:
+        """Open a gazetteer for a GeoNames dump file, building its index if necessary
+
+        Args:
+            path: Path of the tab separated GeoNames dump
+            index_path: Path of the index database (defaults to the dump path with a `.sqlite` suffix)
+
+        Returns:
+            A gazetteer backed by the index database
+        """
+
+        return cls(cls.build_index(path, index_path))
+
+    def geocode(self, municipality: str | None, province: str | None, country: str | None) -> tuple[float, float] | None:
+        """Return the coordinates of an address
+
+        Args:
+            municipality: The address municipality
+            province: The address province, state, or region
+            country: The address country name or ISO code
+
+        Returns:
+            A `(latitude, longitude)` tuple or `None` if the address could not be resolved
+        """
+
+        country_match = self.connection.execute(
+            'SELECT country, lat, long FROM countries WHERE name = ?', (normalize(country),)).fetchone()
+
+        # Candidates are restricted to the address country when the country is known
+        country_filter, country_params = ('AND country = ?', (country_match[0],)) if country_match else ('', ())
+
+        province_match = self.connection.execute(
+            f'SELECT country, admin1, lat, long FROM provinces WHERE name = ? {country_filter} ORDER BY rowid LIMIT 1',
+            (normalize(province), *country_params)).fetchone()
+
+        province_country, admin1 = province_match[:2] if province_match else (None, None)
+        place_match = self.connection.execute(
+            f'SELECT lat, long FROM places WHERE name = ? {country_filter} '
+            'ORDER BY (country IS ? AND admin1 IS ?) DESC, population DESC, rowid LIMIT 1',
+            (normalize(municipality), *country_params, province_country, admin1)).fetchone()
+
+        if place_match:
+            return place_match
+
+        if province_match:
+            return province_match[2], province_match[3]
+
+        if country_match:
+            return country_match[1], country_match[2]
+
+        return None
+
+
+# Gazetteer used by the current worker process
+_gazetteer: Gazetteer | None = None
+
+
+def init_worker(index_path: Path | str) -> None:
+    """Open the gazetteer used by the current process
+
+    Intended for use as a process pool initializer so each worker opens a
+    single connection to the shared index rather than one per task.
+
+    Args:
+        index_path: Path of an index created by `Gazetteer.build_index`
+    """
+
+    global _gazetteer
+    _gazetteer = Gazetteer(index_path)
+
+
+def geocode_rows(rows: Iterable[tuple]) -> list[tuple[int, float, float]]:
+    """Geocode a chunk of addresses using the gazetteer opened by `init_worker`
+
+    Args:
+        rows: Tuples of (primary key, municipality, province, country) values
+
+    Returns:
+        Tuples of (primary key, latitude, longitude) for each resolved address
+    """
+
+    results = []
+    for pk, municipality, province, country in rows:
+        if coordinates := _gazetteer.geocode(municipality, province, country):
+            results.append((pk, *coordinates))
+
+    return results
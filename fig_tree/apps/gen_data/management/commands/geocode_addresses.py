@@ -0,0 +1,163 @@
+"""
+A management command for geocoding `Address` records against a local GeoNames
+gazetteer. No network requests are made. The dump file is converted into an
+indexed database shared by all worker processes (see the `geocoding` module).
+Addresses are read from the database in chunks, geocoded in parallel worker
+processes, and written back using bulk updates. Only a bounded number of
+chunks is submitted to the workers at any time.
+
+## Arguments
+
+| Argument     | Description                                                    |
+|--------------|----------------------------------------------------------------|
+| gazetteer    | Path of a GeoNames dump file (e.g., `allCountries.txt`)        |
+| --index      | Path of the gazetteer index [default: `<gazetteer>.sqlite`]    |
+| --workers    | Number of worker processes [default: 1]                        |
+| --chunk-size | Number of addresses geocoded per task [default: 5000]          |
+| --overwrite  | Geocode addresses that already have coordinates                |
+"""
+
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import QuerySet
+
+from apps.family_trees.caching import touch_trees
+from apps.gen_data.geo import encode_geohash
+from apps.gen_data.geocoding import Gazetteer, geocode_rows, init_worker
+from apps.gen_data.models import Address
+
+# Number of chunks submitted to the worker pool per worker process
+CHUNKS_PER_WORKER = 2
+
+
+def bounded_map(executor: Executor, func: Callable, iterable: Iterable, window: int) -> Iterator:
+    """Map a function over an iterable using an executor, limiting the number of pending tasks
+
+    Unlike `Executor.map`, items are only read from the iterable as earlier
+    results are consumed. Results are yielded in the order of the input items.
+
+    Args:
+      executor: The executor used to run tasks
+      func: The function to apply to each item
+      iterable: The input items
+      window: The maximum number of submitted tasks awaiting consumption
+
+    Yields:
+      The result of each function call
+    """
+
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+class Command(BaseCommand):
+    """Fill in missing `Address` coordinates from a local gazetteer"""
+
+    help = 'Geocode addresses against a local GeoNames gazetteer'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Define command-line arguments
+
+        Args:
+          parser: The parser instance to add arguments under
+        """
+
+        parser.add_argument('gazetteer', help='Path of a GeoNames dump file.')
+        parser.add_argument('--index', help='Path of the gazetteer index [default: `<gazetteer>.sqlite`].')
+        parser.add_argument('--workers', default=1, type=int, help='Number of worker processes [default: 1].')
+        parser.add_argument('--chunk-size', default=5000, type=int, help='Number of addresses geocoded per task [default: 5000].')
+        parser.add_argument('--overwrite', action='store_true', help='Geocode addresses that already have coordinates.')
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command execution.
+
+        Args:
+          *args: Additional positional arguments.
+          **options: Additional keyword arguments.
+        """
+
+        if options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('The number of workers and chunk size must be positive integers.')
+
+        addresses = Address.objects.all()
+        if not options['overwrite']:
+            addresses = addresses.filter(lat__isnull=True)
+
+        self.stdout.write('Indexing gazetteer...')
+        index_path = Gazetteer.build_index(options['gazetteer'], options['index'])
+
+        chunks = self.iter_chunks(addresses, options['chunk_size'])
+        if options['workers'] == 1:
+            init_worker(index_path)
+            updated = self.save_results(map(geocode_rows, chunks))
+
+        else:
+            with ProcessPoolExecutor(
+                max_workers=options['workers'],
+                initializer=init_worker,
+                initargs=(index_path,)
+            ) as executor:
+                window = options['workers'] * CHUNKS_PER_WORKER
+                updated = self.save_results(bounded_map(executor, geocode_rows, chunks, window))
+
+        self.stdout.write(self.style.SUCCESS(f'Geocoded {updated} addresses.'))
+
+    @staticmethod
+    def iter_chunks(addresses: QuerySet, chunk_size: int) -> Iterator[list[tuple]]:
+        """Yield address values in chunks ordered by primary key
+
+        Chunks are fetched using keyset pagination so rows updated by earlier
+        chunks do not affect the results of later queries.
+
+        Args:
+          addresses: The addresses to fetch
+          chunk_size: The maximum number of addresses per chunk
+
+        Yields:
+          Lists of (primary key, municipality, province, country) tuples
+        """
+
+        last_pk = 0
+        while chunk := list(
+            addresses.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', 'municipality', 'province', 'country')[:chunk_size]
+        ):
+            last_pk = chunk[-1][0]
+            yield chunk
+
+    def save_results(self, results: Iterable[list[tuple]]) -> int:
+        """Write geocoding results to the database
+
+        Args:
+          results: An iterable of geocoded chunks as returned by `geocode_rows`
+
+        Returns:
+          The number of updated addresses
+        """
+
+        updated, tree_ids = 0, set()
+        for chunk in results:
+            coordinates = {pk: (lat, long) for pk, lat, long in chunk}
+            addresses = list(Address.objects.filter(pk__in=coordinates).only('tree'))
+            for address in addresses:
+                address.lat, address.long = coordinates[address.pk]
+                address.geohash = encode_geohash(address.lat, address.long)
+                tree_ids.add(address.tree_id)
+
+            Address.objects.bulk_update(addresses, ['lat', 'long', 'geohash'])
+            updated += len(addresses)
+            self.stdout.write(f'Geocoded {updated} addresses...')
+
+        touch_trees(tree_ids)
+        return updated
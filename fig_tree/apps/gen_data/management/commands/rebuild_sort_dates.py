@@ -0,0 +1,47 @@
+"""
+A management command for recomputing the normalized date ranges stored on
+events. Ranges are derived automatically when an event is saved, so
+rebuilding is only necessary after changing the `DATE_ABOUT_RANGE`,
+`DATE_BEFORE_RANGE`, or `DATE_AFTER_RANGE` settings.
+
+## Arguments
+
+| Argument     | Description                                                  |
+|--------------|--------------------------------------------------------------|
+| --chunk-size | Number of events updated per database query [default: 1000] |
+"""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gen_data.dates import CHUNK_SIZE, rebuild_sort_dates
+
+
+class Command(BaseCommand):
+    """Recompute the `sort_date_min` and `sort_date_max` fields of events"""
+
+    help = 'Recompute normalized event date ranges after changing date range settings'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Define command-line arguments
+
+        Args:
+          parser: The parser instance to add arguments under
+        """
+
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'Number of events updated per database query [default: {CHUNK_SIZE}].')
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command execution.
+
+        Args:
+          *args: Additional positional arguments.
+          **options: Additional keyword arguments.
+        """
+
+        if options['chunk_size'] < 1:
+            raise CommandError('The chunk size must be a positive integer.')
+
+        updated = rebuild_sort_dates(options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated the date range of {updated} events.'))
@@ -0,0 +1,44 @@
+"""
+A management command for recomputing precomputed family tree statistics from
+the underlying genealogical records. Statistics are maintained automatically
+as records change, so rebuilding is only necessary after bulk database
+operations that bypass model signals (e.g., raw SQL imports).
+
+## Arguments
+
+| Argument | Description                                                  |
+|----------|--------------------------------------------------------------|
+| --tree   | Primary key of a family tree to rebuild [default: all trees] |
+"""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from apps.gen_data.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    """Recompute the `TreeStatistic` summary table"""
+
+    help = 'Recompute precomputed family tree statistics'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Define command-line arguments
+
+        Args:
+          parser: The parser instance to add arguments under
+        """
+
+        parser.add_argument('--tree', type=int, action='append', help='Primary key of a family tree to rebuild [default: all trees].')
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command execution.
+
+        Args:
+          *args: Additional positional arguments.
+          **options: Additional keyword arguments.
+        """
+
+        rebuild_statistics(options['tree'])
+        self.stdout.write(self.style.SUCCESS('Rebuilt family tree statistics.'))
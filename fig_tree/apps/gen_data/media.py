@@ -0,0 +1,298 @@
+"""
+The `media` module handles the processing of uploaded media files. This
+includes extracting embedded image metadata (EXIF, IPTC, and XMP) into
+indexed database columns, and generating reduced size derivatives
+(thumbnails, previews, etc.) of uploaded images so clients are not required
+to download full resolution files. Derivative sizes are configured using the `MEDIA_DERIVATIVE_SIZES`
+application setting, and each derivative is stored in both WebP and JPEG
+format.
+
+Uploaded files are stored using content addressed names and may be shared
+by multiple `Media` records. Derivatives are named after the file they were
+generated from and are shared in the same way. Stored files are deleted once
+the last referencing record is removed. Files reused by a new upload within
+`BLOB_GRACE_PERIOD` of being released are deleted later by a background job,
+so references that are not committed yet are not left pointing to a deleted file.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+from datetime import datetime, timedelta
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from PIL import ExifTags, Image, ImageOps, IptcImagePlugin
+
+from apps.family_trees.caching import touch_trees
+from apps.jobs.queue import enqueue
+from .models import Media
+
+__all__ = [
+    'DERIVATIVE_FORMATS',
+    'derivative_sizes',
+    'extract_metadata',
+    'process_media',
+    'release_blob',
+]
+
+DERIVATIVE_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+# Minimum time between the last use of a stored file and its deletion
+BLOB_GRACE_PERIOD = timedelta(hours=1)
+
+# `Media` fields populated by processing the uploaded file
+PROCESSED_FIELDS = ('derivatives', 'width', 'height', 'captured_at', 'latitude', 'longitude', 'metadata')
+
+
+def derivative_sizes() -> dict[str, int]:
+    """Return a mapping of derivative names to their maximum edge length in pixels"""
+
+    return getattr(settings, 'MEDIA_DERIVATIVE_SIZES', dict())
+
+
+def _encode(image: Image.Image, image_format: str) -> ContentFile:
+    """Encode an image into an in-memory file
+
+    Args:
+        image: The image to encode
+        image_format: The Pillow format name to encode with
+
+    Returns:
+        The encoded image data
+    """
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=85, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def _rational_to_degrees(value: tuple, reference: str) -> float:
+    """Convert an EXIF GPS coordinate to signed decimal degrees
+
+    Args:
+        value: The coordinate as a tuple of degrees, minutes, and seconds
+        reference: The coordinate hemisphere (`N`, `S`, `E`, or `W`)
+
+    Returns:
+        The coordinate in decimal degrees
+    """
+
+    degrees, minutes, seconds = (float(v) for v in value)
+    decimal = degrees + minutes / 60 + seconds / 3600
+    return -decimal if reference in ('S', 'W') else decimal
+
+
+def _decode(value: bytes | list | str) -> str:
+    """Decode an IPTC or EXIF text value into a string"""
+
+    if isinstance(value, list):
+        value = value[0]
+
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='replace')
+
+    return str(value).strip('\x00 ')
+
+
+def _xmp_caption(image: Image.Image) -> str | None:
+    """Return the `dc:description` value embedded in an image's XMP metadata, if any
+
+    XMP parsing requires the optional `defusedxml` package.
+    """
+
+    if importlib.util.find_spec('defusedxml') is None or not hasattr(image, 'getxmp'):
+        return None
+
+    descriptions = image.getxmp().get('xmpmeta', {}).get('RDF', {}).get('Description', [])
+    for description in descriptions if isinstance(descriptions, list) else [descriptions]:
+        caption = description.get('description', {}).get('Alt', {}).get('li')
+        if isinstance(caption, dict):
+            return caption.get('text')
+
+        if caption:
+            return str(caption)
+
+    return None
+
+
+def extract_metadata(image: Image.Image) -> dict:
+    """Extract EXIF, IPTC, and XMP metadata from an image
+
+    Returned values are keyed by the name of the corresponding `Media` field.
+    Values that are not available in the image metadata are omitted.
+
+    Args:
+        image: An open image, prior to any transformations
+
+    Returns:
+        A dictionary of extracted field values
+    """
+
+    exif = image.getexif()
+    exif_ifd = exif.get_ifd(ExifTags.IFD.Exif)
+    gps_ifd = exif.get_ifd(ExifTags.IFD.GPSInfo)
+    iptc = IptcImagePlugin.getiptcinfo(image) or dict()
+
+    # Image dimensions are reported as displayed, accounting for EXIF orientation
+    width, height = image.size
+    if exif.get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+        width, height = height, width
+
+    values = {'width': width, 'height': height}
+    captured = exif_ifd.get(ExifTags.Base.DateTimeOriginal) or exif.get(ExifTags.Base.DateTime)
+    if captured:
+        try:
+            values['captured_at'] = timezone.make_aware(datetime.strptime(_decode(captured), '%Y:%m:%d %H:%M:%S'))
+
+        except ValueError:
+            pass
+
+    try:
+        values['latitude'] = _rational_to_degrees(gps_ifd[ExifTags.GPS.GPSLatitude], gps_ifd[ExifTags.GPS.GPSLatitudeRef])
+        values['longitude'] = _rational_to_degrees(gps_ifd[ExifTags.GPS.GPSLongitude], gps_ifd[ExifTags.GPS.GPSLongitudeRef])
+
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        values.pop('latitude', None)
+
+    metadata = {
+        'camera_make': exif.get(ExifTags.Base.Make),
+        'camera_model': exif.get(ExifTags.Base.Model),
+        'artist': exif.get(ExifTags.Base.Artist) or iptc.get((2, 80)),
+        'copyright': exif.get(ExifTags.Base.Copyright) or iptc.get((2, 116)),
+        'caption': iptc.get((2, 120)) or exif.get(ExifTags.Base.ImageDescription) or _xmp_caption(image),
+    }
+
+    values['metadata'] = {key: _decode(value) for key, value in metadata.items() if value}
+    if keywords := iptc.get((2, 25)):
+        values['metadata']['keywords'] = [_decode(k) for k in (keywords if isinstance(keywords, list) else [keywords])]
+
+    return values
+
+
+def _write_derivatives(image: Image.Image, source: str) -> dict:
+    """Generate and store reduced size derivatives of an image
+
+    Args:
+        image: The image to generate derivatives from
+        source: The storage name of the original file
+
+    Returns:
+        A dictionary describing the stored derivatives
+    """
+
+    sizes = sorted(derivative_sizes().items(), key=lambda item: item[1], reverse=True)
+    source_path = PurePosixPath(source)
+
+    # Decode JPEG files at a reduced scale when possible. This avoids decoding full resolution scans.
+    if sizes:
+        image.draft('RGB', (sizes[0][1], sizes[0][1]))
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    # Each derivative is resized from the previous (larger) derivative to reduce resampling costs
+    derivatives = {'source': source}
+    for name, edge_length in sizes:
+        image = image.copy()
+        image.thumbnail((edge_length, edge_length), Image.Resampling.LANCZOS)
+
+        variant = {'width': image.width, 'height': image.height}
+        for extension, image_format in DERIVATIVE_FORMATS.items():
+            path = str(source_path.parent / 'derivatives' / f'{source_path.stem}_{name}.{extension}')
+            if default_storage.exists(path):
+                default_storage.delete(path)
+
+            variant[extension] = default_storage.save(path, _encode(image, image_format))
+
+        derivatives[name] = variant
+
+    return derivatives
+
+
+def process_media(media_id: int) -> None:
+    """Extract metadata from, and generate derivatives for, the file of a `Media` record
+
+    The uploaded file is opened and decoded once for both tasks. Processing is
+    skipped if the current file has already been processed. Derivatives are
+    written to the default storage backend alongside the original file.
+    If the record has no date, the capture date of the file is used instead.
+
+    Args:
+        media_id: Primary key of the `Media` record to process
+    """
+
+    media = Media.objects.filter(pk=media_id).first()
+    if media is None or not media.blob or media.derivatives.get('source') == media.blob.name:
+        return
+
+    # Reuse results already generated for records sharing the same file
+    values = Media.objects \
+        .filter(blob=media.blob.name, derivatives__source=media.blob.name) \
+        .values(*PROCESSED_FIELDS) \
+        .first()
+
+    if values is None:
+        with media.blob.open('rb') as file, Image.open(file) as image:
+            values = extract_metadata(image)
+            values['derivatives'] = _write_derivatives(image, media.blob.name)
+
+    Media.objects.filter(pk=media_id).update(**values)
+    if values.get('captured_at'):
+        Media.objects.filter(pk=media_id, date__isnull=True).update(date=values['captured_at'].date())
+
+    touch_trees([media.tree_id])
+
+
+def _delete_unreferenced(name: str, derivatives: dict) -> None:
+    """Delete a stored file and its derivatives if the file is not referenced by any `Media` record
+
+    Files used within `BLOB_GRACE_PERIOD` are not deleted immediately. A
+    background job is queued to repeat the check once the period has passed.
+
+    Args:
+        name: The storage name of the file
+        derivatives: The derivatives generated for the file
+    """
+
+    if Media.objects.filter(blob=name).exists():
+        return
+
+    storage = Media.blob.field.storage
+    with storage.lock():
+        try:
+            last_used = storage.get_modified_time(name)
+
+        except FileNotFoundError:
+            last_used = None
+
+        if last_used is not None and last_used > timezone.now() - BLOB_GRACE_PERIOD:
+            enqueue(_delete_unreferenced, name, derivatives, scheduled=last_used + BLOB_GRACE_PERIOD)
+            return
+
+        storage.delete(name)
+        if derivatives.get('source') == name:
+            for variant in (value for key, value in derivatives.items() if key != 'source'):
+                for extension in DERIVATIVE_FORMATS:
+                    default_storage.delete(variant[extension])
+
+
+def release_blob(name: str, derivatives: dict) -> None:
+    """Release a reference to a stored media file
+
+    The file (and its derivatives) is deleted once the current transaction
+    commits if no other `Media` record references it.
+
+    Args:
+        name: The storage name of the released file
+        derivatives: The derivatives generated for the released file
+    """
+
+    if name:
+        transaction.on_commit(lambda: _delete_unreferenced(name, derivatives))
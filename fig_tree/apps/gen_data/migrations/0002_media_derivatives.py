@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='media',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='date_type',
+            field=models.IntegerField(choices=[(0, 'regular'), (1, 'before'), (2, 'after'), (3, 'about'), (4, 'range'), (5, 'span')], default=0),
+        ),
+        migrations.AlterField(
+            model_name='media',
+            name='date_type',
+            field=models.IntegerField(choices=[(0, 'regular'), (1, 'before'), (2, 'after'), (3, 'about')], default=0),
+        ),
+    ]
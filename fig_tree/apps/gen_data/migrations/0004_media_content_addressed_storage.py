@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:33
+
+import apps.gen_data.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0003_mediaupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='media',
+            name='blob',
+            field=models.ImageField(db_index=True, storage=apps.gen_data.storage.ContentAddressedStorage(), upload_to=''),
+        ),
+    ]
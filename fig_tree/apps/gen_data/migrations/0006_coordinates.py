@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+from apps.gen_data.geo import encode_geohash
+
+
+def populate_geohashes(apps, schema_editor):
+    """Populate geohash values for existing addresses"""
+
+    Address = apps.get_model('gen_data', 'Address')
+    addresses = Address.objects.filter(lat__isnull=False, long__isnull=False)
+    for address in addresses:
+        address.geohash = encode_geohash(address.lat, address.long)
+
+    Address.objects.bulk_update(addresses, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0005_media_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='lat',
+            field=models.FloatField(blank=True, null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='long',
+            field=models.FloatField(blank=True, null=True, verbose_name='Longitude'),
+        ),
+        migrations.AlterField(
+            model_name='address',
+            name='lat',
+            field=models.FloatField(blank=True, null=True, verbose_name='Latitude'),
+        ),
+        migrations.AlterField(
+            model_name='address',
+            name='long',
+            field=models.FloatField(blank=True, null=True, verbose_name='Longitude'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['lat', 'long'], name='gen_data_address_coordinates'),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['lat', 'long'], name='gen_data_place_coordinates'),
+        ),
+        migrations.RunPython(populate_geohashes, migrations.RunPython.noop),
+    ]
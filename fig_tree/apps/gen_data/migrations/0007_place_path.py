@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:39
+
+import logging
+from collections import defaultdict, deque
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def populate_paths(apps, schema_editor):
+    """Populate materialized paths for existing places
+
+    Paths are built breadth-first from the root places. Places left unvisited
+    belong to an enclosure cycle, which is broken by detaching one of its
+    members from its enclosing place.
+    """
+
+    Place = apps.get_model('gen_data', 'Place')
+    places = {place.pk: place for place in Place.objects.only('pk', 'enclosed_by_id', 'path')}
+
+    children = defaultdict(list)
+    for place in places.values():
+        children[place.enclosed_by_id].append(place)
+
+    def walk(root):
+        root.path = f'/{root.pk}/'
+        visited.add(root.pk)
+        queue = deque([root])
+        while queue:
+            parent = queue.popleft()
+            for child in children[parent.pk]:
+                if child.pk not in visited:
+                    child.path = f'{parent.path}{child.pk}/'
+                    visited.add(child.pk)
+                    queue.append(child)
+
+    visited = set()
+    for place in places.values():
+        if place.enclosed_by_id not in places:
+            place.enclosed_by_id = None
+            walk(place)
+
+    for place in places.values():
+        if place.pk not in visited:
+            logger.warning('Detaching place %s from %s to break an enclosure cycle', place.pk, place.enclosed_by_id)
+            children[place.enclosed_by_id].remove(place)
+            place.enclosed_by_id = None
+            walk(place)
+
+    Place.objects.bulk_update(places.values(), ['enclosed_by', 'path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0006_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:42
+
+from datetime import date
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Date type values at the time of this migration
+BEFORE, AFTER, ABOUT, RANGE, SPAN = 1, 2, 3, 4, 5
+
+
+def shift_years(value, years):
+    """Shift a date by a number of years, clamping to the supported date range"""
+
+    year = min(max(value.year + years, date.min.year), date.max.year)
+    try:
+        return value.replace(year=year)
+
+    except ValueError:  # February 29th in a non-leap year
+        return value.replace(year=year, day=28)
+
+
+def sort_date_range(date_type, start, end):
+    """Return the earliest and latest calendar dates a genealogical date may refer to"""
+
+    if start is None:
+        return None, None
+
+    if date_type == BEFORE:
+        return shift_years(start, -getattr(settings, 'DATE_BEFORE_RANGE', 50)), start
+
+    if date_type == AFTER:
+        return start, shift_years(start, getattr(settings, 'DATE_AFTER_RANGE', 50))
+
+    if date_type == ABOUT:
+        about_range = getattr(settings, 'DATE_ABOUT_RANGE', 5)
+        return shift_years(start, -about_range), shift_years(start, about_range)
+
+    if date_type in (RANGE, SPAN) and end is not None:
+        return min(start, end), max(start, end)
+
+    return start, start
+
+
+def populate_sort_dates(apps, schema_editor):
+    """Populate normalized date ranges for existing events"""
+
+    Event = apps.get_model('gen_data', 'Event')
+    events = Event.objects.filter(date__isnull=False).only('date_type', 'date', 'date_end')
+    for event in events:
+        event.sort_date_min, event.sort_date_max = sort_date_range(event.date_type, event.date, event.date_end)
+
+    Event.objects.bulk_update(events, ['sort_date_min', 'sort_date_max'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0007_place_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='sort_date_max',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='sort_date_min',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_sort_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:30
+
+import apps.gen_data.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0009_record_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaupload',
+            name='expires',
+            field=models.DateTimeField(db_index=True, default=apps.gen_data.models._upload_expiry),
+        ),
+    ]
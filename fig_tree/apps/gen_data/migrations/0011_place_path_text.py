@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gen_data', '0010_mediaupload_expires'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='place',
+            name='path',
+            field=models.TextField(db_index=True, default='', editable=False),
+        ),
+    ]
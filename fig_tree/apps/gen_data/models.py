@@ -7,13 +7,24 @@ with table data.
 
 from __future__ import annotations
 
+import uuid
+from datetime import datetime
+
+from django.conf import settings
 from django.contrib.contenttypes import fields as cfields
 from django.contrib.contenttypes import models as cmodels
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Length, Substr
 from django.template import defaultfilters
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from apps.family_trees.models import FamilyTreeModelMixin
+from apps.family_trees.models import FamilyTree, FamilyTreeModelMixin
+from .dates import DateType, sort_date_range
+from .geo import GEOHASH_PRECISION, encode_geohash
+from .storage import ContentAddressedStorage
 
 __all__ = [
     'BaseRecordModel',
@@ -22,6 +33,7 @@ __all__ = [
     'Event',
     'Family',
     'Media',
+    'MediaUpload',
     'Name',
     'Person',
     'Place',
@@ -49,20 +61,53 @@ class GenericRelationshipMixin(models.Model):
     content_object = cfields.GenericForeignKey('content_type', 'object_id')
 
 
+class CoordinatesMixin(models.Model):
+    """Mixin class for adding geographic coordinates to a database model
+
+    Coordinates are stored in decimal degrees alongside their geohash, which
+    is derived automatically when a record is saved. Inheriting models should
+    declare a composite index on the `lat` and `long` fields to support
+    bounding box queries.
+    """
+
+    class Meta:
+        abstract = True
+
+    lat = models.FloatField('Latitude', null=True, blank=True)
+    long = models.FloatField('Longitude', null=True, blank=True)
+    geohash = models.CharField(max_length=GEOHASH_PRECISION, null=True, blank=True, editable=False, db_index=True)
+
+    def save(self, *args, **kwargs) -> None:
+        """Update the record geohash and save the record to the database"""
+
+        if self.lat is None or self.long is None:
+            self.geohash = None
+
+        else:
+            self.geohash = encode_geohash(self.lat, self.long)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'lat', 'long'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+
+        super().save(*args, **kwargs)
+
+
 class BaseRecordModel(FamilyTreeModelMixin, models.Model):
     """Abstract class for creating DB models with common columns"""
 
     class Meta:
         abstract = True
 
-    last_modified = models.DateTimeField(auto_now=True)
+    last_modified = models.DateTimeField(auto_now=True, db_index=True)
 
 
-class Address(GenericRelationshipMixin, BaseRecordModel):
+class Address(CoordinatesMixin, GenericRelationshipMixin, BaseRecordModel):
     """The physical location of a `Place`"""
 
     class Meta:
         verbose_name_plural = 'Addresses'
+        indexes = [models.Index(fields=['lat', 'long'], name='gen_data_address_coordinates')]
 
     # Fields
     line1 = models.CharField('Line 1', max_length=255)
@@ -73,8 +118,6 @@ class Address(GenericRelationshipMixin, BaseRecordModel):
     province = models.CharField(max_length=255, null=True, blank=True)
     country = models.CharField(max_length=255, null=True, blank=True)
     code = models.CharField(max_length=10, null=True, blank=True)
-    lat = models.IntegerField('Latitude', null=True, blank=True)
-    long = models.IntegerField('Longitude', null=True, blank=True)
     date = models.DateField(null=True, blank=True)
 
     # Relationships
@@ -116,30 +159,36 @@ class Citation(GenericRelationshipMixin, BaseRecordModel):
 class Event(BaseRecordModel):
     """A single historical event"""
 
-    class DateType(models.IntegerChoices):
-        """Date type for the event"""
-
-        REGULAR = 0, _('regular')
-        BEFORE = 1, _('before')
-        AFTER = 2, _('after')
-        ABOUT = 3, _('about')
-        RANGE = 4, _('range')
-        SPAN = 5, _('span')
+    DateType = DateType
 
     # Fields
-    event_type = models.CharField(max_length=255)
-    date_type = models.IntegerField(choices=DateType.choices, default='regular')
+    event_type = models.CharField(max_length=255, db_index=True)
+    date_type = models.IntegerField(choices=DateType.choices, default=DateType.REGULAR)
     date = models.DateField(null=True, blank=True)
     date_end = models.DateField(null=True, blank=True)
     description = models.TextField(null=True, blank=True)
 
+    # Earliest and latest calendar dates the event date may refer to
+    sort_date_min = models.DateField(null=True, blank=True, editable=False, db_index=True)
+    sort_date_max = models.DateField(null=True, blank=True, editable=False, db_index=True)
+
     # Relationships
     place = models.OneToOneField('Place', on_delete=models.CASCADE, null=True, blank=True)
-    people = cfields.GenericRelation('Person')
     tags = cfields.GenericRelation('Tag')
     media = cfields.GenericRelation('Media')
     citations = cfields.GenericRelation('Citation')
 
+    def save(self, *args, **kwargs) -> None:
+        """Update the normalized date range and save the record to the database"""
+
+        self.sort_date_min, self.sort_date_max = sort_date_range(self.date_type, self.date, self.date_end)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'date_type', 'date', 'date_end'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'sort_date_min', 'sort_date_max'}
+
+        super().save(*args, **kwargs)
+
     def __str__(self) -> None:
         """Return the event type"""
 
@@ -184,10 +233,19 @@ class Media(GenericRelationshipMixin, BaseRecordModel):
         AFTER = 2, _('after')
         ABOUT = 3, _('about')
 
-    blob = models.ImageField()
-    date_type = models.IntegerField(choices=DateType.choices, default='regular')
+    blob = models.ImageField(storage=ContentAddressedStorage(), db_index=True)
+    date_type = models.IntegerField(choices=DateType.choices, default=DateType.REGULAR)
     date = models.DateField(null=True, blank=True)
     description = models.TextField(null=True, blank=True)
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    # Values extracted from the uploaded file
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
+    captured_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    metadata = models.JSONField(default=dict, blank=True, editable=False)
 
     tags = cfields.GenericRelation('Tag')
 
@@ -196,12 +254,59 @@ class Media(GenericRelationshipMixin, BaseRecordModel):
 
         return defaultfilters.truncatechars(self.description, 50)
 
+    @classmethod
+    def pre_purge(cls, queryset: models.QuerySet) -> None:
+        """Release the stored files of media records deleted in bulk by a family tree purge
+
+        Args:
+            queryset: The media records being deleted
+        """
+
+        from .media import release_blob
+
+        for name, derivatives in queryset.values_list('blob', 'derivatives'):
+            release_blob(name, derivatives)
+
+
+def _upload_expiry() -> datetime:
+    """Return the expiration time of an upload receiving data at the current time"""
+
+    return timezone.now() + settings.MEDIA_UPLOAD_EXPIRY
+
+
+class MediaUpload(models.Model):
+    """An in-progress, resumable upload of a media file
+
+    File content is uploaded in sequential chunks and written to a partial
+    file on disk. A `Media` record is only created once all chunks have been
+    received and the upload is finalized. Uploads not receiving any data
+    before their expiration time are deleted by a recurring background job.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tree = models.ForeignKey(FamilyTree, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    length = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    metadata = models.JSONField(default=dict, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(default=_upload_expiry, db_index=True)
+
+    # Set while a request is writing a chunk to the partial file
+    claimed_until = models.DateTimeField(null=True, blank=True, editable=False)
+
+    def __str__(self) -> str:
+        """Return the uploaded file name and upload progress"""
+
+        return f'{self.filename} ({self.offset}/{self.length} bytes)'
+
 
 class Name(BaseRecordModel):
     """The name of a single individual"""
 
-    given_name = models.CharField(max_length=255, null=True, blank=True)
-    surname = models.CharField(max_length=255, null=True, blank=True)
+    given_name = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    surname = models.CharField(max_length=255, null=True, blank=True, db_index=True)
     suffix = models.CharField(max_length=255, null=True, blank=True)
     prefix = models.CharField(max_length=255, null=True, blank=True)
     citations = cfields.GenericRelation('Citation')
@@ -227,7 +332,7 @@ class Person(BaseRecordModel):
         MALE = 1, _('male')
         Other = 2, _('other')
 
-    sex = models.IntegerField(choices=Sex.choices, null=True, blank=True)
+    sex = models.IntegerField(choices=Sex.choices, null=True, blank=True, db_index=True)
 
     # Relationships with genealogical meaning
     primary_name = models.ForeignKey('Name', on_delete=models.CASCADE, related_name='persons_primary', null=True, blank=True)
@@ -249,23 +354,99 @@ class Person(BaseRecordModel):
         return str(self.primary_name) if self.primary_name else 'Unknown'
 
 
-class Place(BaseRecordModel):
+class Place(CoordinatesMixin, BaseRecordModel):
     """A place in the world separate from any physical location"""
 
-    name = models.CharField(max_length=255)
+    class Meta:
+        indexes = [models.Index(fields=['lat', 'long'], name='gen_data_place_coordinates')]
+
+    name = models.CharField(max_length=255, db_index=True)
     place_type = models.CharField(max_length=255, null=True, blank=True)
     enclosed_by = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE)
 
+    # Materialized path of primary keys from the root place (e.g., `/1/5/12/`)
+    path = models.TextField(db_index=True, editable=False, default='')
+
     addresses = cfields.GenericRelation('Address')
     citations = cfields.GenericRelation('Citation')
     media = cfields.GenericRelation('Media')
     tags = cfields.GenericRelation('Tag')
 
     @property
-    def encloses(self) -> list[Place]:
-        """Return a list of places enclosed by the current place"""
+    def encloses(self) -> models.QuerySet:
+        """Return all places enclosed by the current place at any depth"""
+
+        return Place.objects.filter(path__startswith=self.path).exclude(pk=self.pk)
+
+    @property
+    def hierarchy(self) -> models.QuerySet:
+        """Return all places enclosing the current place, ordered from the outermost place"""
+
+        ancestor_ids = [int(pk) for pk in self.path.strip('/').split('/')[:-1]]
+        return Place.objects.filter(pk__in=ancestor_ids).order_by(Length('path'))
+
+    def remap_clone(self, id_maps: dict) -> list[str]:
+        """Rewrite the materialized path of a cloned place using the primary keys of the cloned places
+
+        Enclosing places outside the cloned tree have no copy, so the path is
+        truncated below the innermost such place. Places directly enclosed by
+        a place outside the cloned tree become top level places.
+
+        Args:
+            id_maps: Mapping of models to their old-to-new primary key mappings
+
+        Returns:
+            The names of the modified fields
+        """
+
+        place_ids, path = id_maps[Place], []
+        for pk in reversed(self.path.strip('/').split('/')):
+            if not pk or int(pk) not in place_ids:
+                break
+
+            path.insert(0, f'/{place_ids[int(pk)]}')
+
+        self.path = ''.join(path or [f'/{self.pk}']) + '/'
+        if len(path) > 1:
+            return ['path']
+
+        self.enclosed_by_id = None
+        return ['enclosed_by', 'path']
+
+    def clean(self) -> None:
+        """Validate the place is enclosed by a place from the same family tree"""
+
+        super().clean()
+        if self.enclosed_by_id and self.tree_id and self.enclosed_by.tree_id != self.tree_id:
+            raise ValidationError({'enclosed_by': 'A place can only be enclosed by a place in the same family tree.'})
+
+    def save(self, *args, **kwargs) -> None:
+        """Save the record and update the materialized path of the place and any enclosed places"""
+
+        parent_path, parent_tree_id = Place.objects \
+            .filter(pk=self.enclosed_by_id) \
+            .values_list('path', 'tree_id') \
+            .first() or ('/', self.tree_id)
+
+        if parent_tree_id != self.tree_id:
+            raise ValueError('A place can only be enclosed by a place in the same family tree.')
+
+        if self.path and parent_path.startswith(self.path):
+            raise ValueError('A place cannot be enclosed by itself or by a place it encloses.')
+
+        super().save(*args, **kwargs)
+        path = f'{parent_path}{self.pk}/'
+        if path == self.path:
+            return
 
-        return self.objects.filter(enclodes_by=self.id).all()
+        # Enclosed places are moved using a single prefix replacement
+        old_path, self.path = self.path, path
+        Place.objects.filter(pk=self.pk).update(path=path)
+        if old_path:
+            Place.objects \
+                .filter(path__startswith=old_path) \
+                .exclude(pk=self.pk) \
+                .update(path=Concat(Value(path), Substr('path', len(old_path) + 1)))
 
     def __str__(self) -> None:
         """Return the name of the place"""
@@ -280,7 +461,7 @@ class Repository(BaseRecordModel):
         verbose_name_plural = 'Repositories'
 
     type = models.CharField(max_length=255)
-    name = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, db_index=True)
 
     addresses = cfields.GenericRelation('Address')
     tags = cfields.GenericRelation('Tag')
@@ -294,7 +475,7 @@ class Repository(BaseRecordModel):
 class Source(BaseRecordModel):
     """A historical source or piece of reference material"""
 
-    title = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, db_index=True)
     author = models.CharField(max_length=255, null=True, blank=True)
     pubinfo = models.CharField(max_length=500, null=True, blank=True)
 
@@ -310,7 +491,7 @@ class Source(BaseRecordModel):
 class Tag(GenericRelationshipMixin, BaseRecordModel):
     """Data label used to organize data into customizable categories"""
 
-    name = models.CharField(max_length=25)
+    name = models.CharField(max_length=25, db_index=True)
     description = models.TextField(null=True, blank=True)
 
     def __str__(self) -> str:
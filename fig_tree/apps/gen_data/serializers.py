@@ -6,8 +6,12 @@ serialized representations. Serializers also ensure data integrate by handling
 data validation tasks as required by the relevant business domain.
 """
 
-from rest_framework.serializers import ModelSerializer
+from urllib.parse import urlencode
 
+from django.urls import reverse
+from rest_framework.serializers import ModelSerializer, SerializerMethodField, ValidationError
+
+from .media import DERIVATIVE_FORMATS
 from .models import *
 
 __all__ = [
@@ -16,6 +20,7 @@ __all__ = [
     'EventSerializer',
     'FamilySerializer',
     'MediaSerializer',
+    'MediaUploadSerializer',
     'NameSerializer',
     'PersonSerializer',
     'PlaceSerializer',
@@ -74,11 +79,59 @@ class FamilySerializer(BaseRecordSerializer):
 
 
 class MediaSerializer(BaseRecordSerializer):
-    """Data serializer for the `Media` database model"""
+    """Data serializer for the `Media` database model
+
+    In addition to the model fields, serialized records include the URLs of
+    the uploaded media file and any reduced size derivatives generated for it.
+    Files are only available through the permission checked `download`
+    endpoint, so storage paths are never included in serialized records.
+    """
+
+    download = SerializerMethodField()
+    variants = SerializerMethodField()
 
     class Meta:
         model = Media
-        fields = '__all__'
+        exclude = ['derivatives']
+        extra_kwargs = {'blob': {'write_only': True}}
+
+    def _download_url(self, obj: Media, **params) -> str:
+        """Return the URL of the download endpoint for a media record"""
+
+        url = reverse('gen_data:media-download', args=[obj.pk])
+        if params:
+            url = f'{url}?{urlencode(params)}'
+
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_download(self, obj: Media) -> str | None:
+        """Return the download URL of the media file"""
+
+        return self._download_url(obj) if obj.blob else None
+
+    def get_variants(self, obj: Media) -> dict[str, dict]:
+        """Return the dimensions and download URLs of each derivative generated for the media file"""
+
+        variants = dict()
+        for name, variant in obj.derivatives.items():
+            if name == 'source':
+                continue
+
+            variants[name] = {key: value for key, value in variant.items() if key in ('width', 'height')}
+            for extension in DERIVATIVE_FORMATS:
+                variants[name][extension] = self._download_url(obj, variant=name, type=extension)
+
+        return variants
+
+
+class MediaUploadSerializer(ModelSerializer):
+    """Data serializer for the `MediaUpload` database model"""
+
+    class Meta:
+        model = MediaUpload
+        fields = ['id', 'tree', 'filename', 'length', 'offset', 'metadata', 'created', 'expires']
+        read_only_fields = ['offset', 'created', 'expires']
 
 
 class NameSerializer(BaseRecordSerializer):
@@ -104,6 +157,23 @@ class PlaceSerializer(BaseRecordSerializer):
         model = Place
         fields = '__all__'
 
+    def validate(self, attrs: dict) -> dict:
+        """Validate the enclosing place belongs to the same tree and does not create a cycle"""
+
+        attrs = super().validate(attrs)
+        enclosed_by = attrs.get('enclosed_by')
+        if enclosed_by is None:
+            return attrs
+
+        tree = attrs.get('tree', getattr(self.instance, 'tree', None))
+        if enclosed_by.tree_id != getattr(tree, 'pk', None):
+            raise ValidationError({'enclosed_by': 'The enclosing place must belong to the same family tree.'})
+
+        if self.instance is not None and enclosed_by.path.startswith(self.instance.path):
+            raise ValidationError({'enclosed_by': 'A place cannot be enclosed by itself or by a place it encloses.'})
+
+        return attrs
+
 
 class RepositorySerializer(BaseRecordSerializer):
     """Data serializer for the `Repository` database model"""
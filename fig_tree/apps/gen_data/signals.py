@@ -0,0 +1,136 @@
+"""
+The `signals` module defines handlers for database signals emitted by
+application models. Handlers are registered when the module is imported
+by the application config (see the `apps` module).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.jobs.queue import enqueue
+from .media import process_media, release_blob
+from .models import Media, MediaUpload
+from .statistics import STATISTIC_MODELS, adjust_statistics, record_statistics
+from .uploads import partial_file_path
+
+__all__ = [
+    'delete_upload_partial_file',
+    'record_previous_statistics',
+    'record_replaced_media_file',
+    'release_deleted_media_file',
+    'remove_statistics',
+    'schedule_media_processing',
+    'update_statistics',
+]
+
+
+@receiver(pre_save, sender=Media)
+def record_replaced_media_file(sender, instance: Media, **kwargs) -> None:
+    """Record the stored file of an existing `Media` record before it is modified
+
+    Args:
+        sender: The model class sending the signal
+        instance: The `Media` record being saved
+    """
+
+    if instance.pk is not None:
+        instance._previous_file = Media.objects.filter(pk=instance.pk).values('blob', 'derivatives').first()
+
+
+@receiver(post_save, sender=Media)
+def schedule_media_processing(sender, instance: Media, **kwargs) -> None:
+    """Queue processing of new media files and release replaced files
+
+    Media files are processed by the background job workers. The job is
+    created in the same transaction as the record, so it is only visible to
+    workers once the record is committed and is never lost if the web server
+    restarts.
+
+    Args:
+        sender: The model class sending the signal
+        instance: The saved `Media` record
+    """
+
+    previous = getattr(instance, '_previous_file', None)
+    if previous and previous['blob'] != instance.blob.name:
+        release_blob(previous['blob'], previous['derivatives'])
+
+    if instance.blob and instance.derivatives.get('source') != instance.blob.name:
+        enqueue(process_media, instance.pk)
+
+
+@receiver(post_delete, sender=Media)
+def release_deleted_media_file(sender, instance: Media, **kwargs) -> None:
+    """Release the stored file of a deleted `Media` record
+
+    Args:
+        sender: The model class sending the signal
+        instance: The deleted `Media` record
+    """
+
+    release_blob(instance.blob.name, instance.derivatives)
+
+
+@receiver(post_delete, sender=MediaUpload)
+def delete_upload_partial_file(sender, instance: MediaUpload, **kwargs) -> None:
+    """Delete the partial file of a deleted upload once the current transaction commits
+
+    Args:
+        sender: The model class sending the signal
+        instance: The deleted `MediaUpload` record
+    """
+
+    # Deleted instances have their primary key cleared, so the path is resolved immediately
+    path = partial_file_path(instance)
+    transaction.on_commit(lambda: path.unlink(missing_ok=True))
+
+
+def record_previous_statistics(sender, instance, **kwargs) -> None:
+    """Record the statistics an existing record is counted toward before it is modified
+
+    Args:
+        sender: The model class sending the signal
+        instance: The record being saved
+    """
+
+    previous = sender.objects.filter(pk=instance.pk).first() if instance.pk is not None else None
+    instance._previous_statistics = (previous.tree_id, record_statistics(previous)) if previous else None
+
+
+def update_statistics(sender, instance, **kwargs) -> None:
+    """Update the statistics of the family tree owning a saved record
+
+    Args:
+        sender: The model class sending the signal
+        instance: The saved record
+    """
+
+    current = record_statistics(instance)
+    previous_tree_id, previous = getattr(instance, '_previous_statistics', None) or (instance.tree_id, set())
+    instance._previous_statistics = (instance.tree_id, current)
+
+    if previous_tree_id != instance.tree_id:
+        adjust_statistics(previous_tree_id, {key: -1 for key in previous})
+        previous = set()
+
+    deltas = {key: -1 for key in previous - current}
+    deltas.update({key: 1 for key in current - previous})
+    adjust_statistics(instance.tree_id, deltas)
+
+
+def remove_statistics(sender, instance, **kwargs) -> None:
+    """Update the statistics of the family tree owning a deleted record
+
+    Args:
+        sender: The model class sending the signal
+        instance: The deleted record
+    """
+
+    adjust_statistics(instance.tree_id, {key: -1 for key in record_statistics(instance)})
+
+
+for model in STATISTIC_MODELS:
+    pre_save.connect(record_previous_statistics, sender=model, dispatch_uid=f'statistics_pre_save_{model.__name__}')
+    post_save.connect(update_statistics, sender=model, dispatch_uid=f'statistics_save_{model.__name__}')
+    post_delete.connect(remove_statistics, sender=model, dispatch_uid=f'statistics_delete_{model.__name__}')
@@ -0,0 +1,139 @@
+"""
+The `statistics` module maintains the precomputed `TreeStatistic` summary
+table used to report the contents of family trees without scanning
+genealogical record tables on request.
+
+Statistics are updated incrementally as records are saved and deleted (see
+the `signals` module). The following statistic categories are maintained:
+
+| Category       | Key                        | Counted Records                      |
+|----------------|----------------------------|--------------------------------------|
+| `records`      | Model name (e.g. `person`) | All genealogical records             |
+| `event_type`   | Event type                 | `Event` records                      |
+| `birth_decade` | First year of the decade   | `Event` records of type `birth`      |
+| `surname`      | Surname                    | `Name` records                       |
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from apps.family_trees.models import FamilyTreeModelMixin, TreeStatistic
+from .models import *
+
+__all__ = [
+    'STATISTIC_MODELS',
+    'adjust_statistics',
+    'rebuild_statistics',
+    'record_statistics',
+]
+
+STATISTIC_MODELS = (
+    Address, Citation, Event, Family, Media, Name, Person, Place, Repository, Source, Tag, URL,
+)
+
+# Maximum length of statistic keys (see `TreeStatistic.key`)
+KEY_LENGTH = 255
+
+
+def _birth_decade(event: Event) -> str | None:
+    """Return the decade of a birth event as a string, if known
+
+    The decade is taken from the recorded event date rather than the
+    normalized date range, which is widened for approximate dates.
+    """
+
+    if event.event_type.lower() == 'birth' and event.date:
+        return str(event.date.year // 10 * 10)
+
+    return None
+
+
+def record_statistics(record: FamilyTreeModelMixin) -> set[tuple[str, str, bool]]:
+    """Return the statistics a record is counted toward
+
+    Args:
+        record: A genealogical record
+
+    Returns:
+        A set of (category, key, private) tuples
+    """
+
+    keys = {('records', record._meta.model_name)}
+    if isinstance(record, Event):
+        keys.add(('event_type', record.event_type))
+        if decade := _birth_decade(record):
+            keys.add(('birth_decade', decade))
+
+    elif isinstance(record, Name) and record.surname:
+        keys.add(('surname', record.surname))
+
+    return {(category, key[:KEY_LENGTH], record.private) for category, key in keys}
+
+
+def adjust_statistics(tree_id: int, deltas: dict[tuple[str, str, bool], int]) -> None:
+    """Atomically adjust the statistics of a family tree
+
+    Args:
+        tree_id: Primary key of the family tree
+        deltas: Mapping of (category, key, private) tuples to the change in count
+    """
+
+    for (category, key, private), delta in deltas.items():
+        if not delta:
+            continue
+
+        # Missing rows are only created for increments. This avoids recreating rows
+        # while the statistics of a tree are deleted along with the tree itself.
+        statistic = TreeStatistic.objects.filter(tree_id=tree_id, category=category, key=key, private=private)
+        if statistic.update(count=F('count') + delta) or delta < 0:
+            continue
+
+        # Fall back to incrementing the existing row if a concurrent request created it first
+        try:
+            with transaction.atomic():
+                TreeStatistic.objects.create(tree_id=tree_id, category=category, key=key, private=private, count=delta)
+
+        except IntegrityError:
+            statistic.update(count=F('count') + delta)
+
+
+def rebuild_statistics(tree_ids: Iterable[int] | None = None) -> None:
+    """Recompute the statistics of family trees from their genealogical records
+
+    Args:
+        tree_ids: Primary keys of the trees to rebuild (defaults to all trees)
+    """
+
+    tree_filter = dict() if tree_ids is None else {'tree_id__in': list(tree_ids)}
+    counts = Counter()
+
+    def add_counts(queryset, category: str, key_field: str | None = None, key_func=str) -> None:
+        fields = ['tree_id', 'private'] + ([key_field] if key_field else [])
+        for row in queryset.filter(**tree_filter).values(*fields).annotate(total=Count('pk')):
+            key = key_func(row[key_field]) if key_field else queryset.model._meta.model_name
+            counts[row['tree_id'], category, key[:KEY_LENGTH], row['private']] += row['total']
+
+    for model in STATISTIC_MODELS:
+        add_counts(model.objects.all(), 'records')
+
+    add_counts(Event.objects.all(), 'event_type', 'event_type')
+    add_counts(
+        Event.objects.filter(event_type__iexact='birth', date__isnull=False),
+        'birth_decade', 'date__year', lambda year: str(year // 10 * 10))
+
+    add_counts(Name.objects.exclude(surname__isnull=True).exclude(surname=''), 'surname', 'surname')
+
+    with transaction.atomic():
+        TreeStatistic.objects.filter(**tree_filter).delete()
+        TreeStatistic.objects.bulk_create(
+            (
+                TreeStatistic(tree_id=tree_id, category=category, key=key, private=private, count=count)
+                for (tree_id, category, key, private), count in counts.items()
+            ),
+            batch_size=1000
+        )
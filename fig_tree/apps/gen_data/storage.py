@@ -0,0 +1,110 @@
+"""
+The `storage` module defines custom file storage backends for uploaded media.
+
+The `ContentAddressedStorage` backend names each stored file using the
+SHA-256 hash of its content. Identical files uploaded multiple times (e.g.,
+the same census page attached to records in different family trees) are
+written to disk only once and shared between all referencing records.
+Since stored files may be shared, files should only be deleted once they
+are no longer referenced by any database record (see the `signals` module).
+
+Reusing an existing file refreshes its modification time while holding an
+inter-process file lock. Code deleting unreferenced files holds the same lock
+and skips recently modified files, which may be referenced by records that
+have not been committed yet.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import Iterator
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+__all__ = ['ContentAddressedStorage', 'content_hash']
+
+
+def content_hash(content: File) -> str:
+    """Return the SHA-256 hex digest of a file's content
+
+    File content is read in chunks to avoid loading large files into memory.
+
+    Args:
+        content: The file to hash
+
+    Returns:
+        The hex encoded hash value
+    """
+
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage that names and deduplicates files by their content hash
+
+    Files are stored using the path `<prefix>/<h[:2]>/<h[2:4]>/<h><ext>`
+    where `h` is the SHA-256 hash of the file content and `ext` is the
+    (lowercase) extension of the original file name. Saving a file whose
+    content already exists in storage returns the name of the existing file
+    without writing any data. Files that were deleted before being reused are
+    written again.
+    """
+
+    prefix = 'blobs'
+    lock_name = '.lock'
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared by all processes using the storage location
+
+        The lock serializes the reuse of existing files with the deletion of
+        unreferenced files.
+        """
+
+        location = Path(self.location)
+        location.mkdir(parents=True, exist_ok=True)
+        with open(location / self.lock_name, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def hashed_name(self, name: str, content: File) -> str:
+        """Return the content addressed storage path for a file
+
+        Args:
+            name: The original file name
+            content: The file content
+
+        Returns:
+            The relative storage path
+        """
+
+        file_hash = content_hash(content)
+        extension = PurePosixPath(name).suffix.lower()
+        return f'{self.prefix}/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}{extension}'
+
+    def _save(self, name: str, content: File) -> str:
+        """Save a file under its content addressed name unless an identical file is already stored"""
+
+        name = self.hashed_name(name, content)
+        with self.lock():
+            if self.exists(name):
+                # Mark the file as recently used so it is not deleted before the new reference is committed
+                os.utime(self.path(name))
+                return name
+
+        return super()._save(name, content)
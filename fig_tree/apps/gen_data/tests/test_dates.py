@@ -0,0 +1,116 @@
+"""Tests for the `dates` module and date range filtering."""
+
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.gen_data.dates import DateType, rebuild_sort_dates, shift_years, sort_date_range
+from apps.gen_data.models import Event, Person
+
+
+@override_settings(DATE_ABOUT_RANGE=5, DATE_BEFORE_RANGE=50, DATE_AFTER_RANGE=50)
+class SortDateRange(SimpleTestCase):
+    """Test the normalization of genealogical dates into calendar date ranges"""
+
+    def test_regular(self) -> None:
+        """Test regular dates refer to a single day"""
+
+        self.assertEqual((date(1850, 1, 1), date(1850, 1, 1)), sort_date_range(DateType.REGULAR, date(1850, 1, 1), None))
+
+    def test_about(self) -> None:
+        """Test about dates extend in both directions"""
+
+        self.assertEqual(
+            (date(1845, 6, 1), date(1855, 6, 1)), sort_date_range(DateType.ABOUT, date(1850, 6, 1), None))
+
+    def test_before_and_after(self) -> None:
+        """Test before and after dates extend in a single direction"""
+
+        self.assertEqual((date(1800, 1, 1), date(1850, 1, 1)), sort_date_range(DateType.BEFORE, date(1850, 1, 1), None))
+        self.assertEqual((date(1850, 1, 1), date(1900, 1, 1)), sort_date_range(DateType.AFTER, date(1850, 1, 1), None))
+
+    def test_range(self) -> None:
+        """Test range dates span the start and end dates"""
+
+        self.assertEqual(
+            (date(1840, 1, 1), date(1860, 1, 1)),
+            sort_date_range(DateType.RANGE, date(1840, 1, 1), date(1860, 1, 1)))
+
+    def test_unknown_date(self) -> None:
+        """Test records without a date have no date range"""
+
+        self.assertEqual((None, None), sort_date_range(DateType.ABOUT, None, None))
+
+    def test_leap_day(self) -> None:
+        """Test shifting a leap day into a non-leap year"""
+
+        self.assertEqual(date(1901, 2, 28), shift_years(date(1896, 2, 29), 5))
+
+
+class DateFilters(TestCase):
+    """Test date range query parameters on the `Event` and `Person` endpoints"""
+
+    def setUp(self) -> None:
+        """Create events with precise and imprecise dates"""
+
+        user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+        tree = FamilyTree.objects.create(tree_name='test')
+        TreePermission.objects.create(tree=tree, user=user, role=TreePermission.Role.READ_PRIVATE)
+
+        self.regular = Event.objects.create(tree=tree, event_type='birth', date=date(1850, 1, 1))
+        self.about = Event.objects.create(
+            tree=tree, event_type='birth', date=date(1865, 1, 1), date_type=Event.DateType.ABOUT)
+        self.late = Event.objects.create(tree=tree, event_type='birth', date=date(1900, 1, 1))
+        Person.objects.create(tree=tree, birth=self.regular)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_sort_dates_populated_on_save(self) -> None:
+        """Test normalized date ranges are derived when saving an event"""
+
+        self.about.date_type = Event.DateType.REGULAR
+        self.about.save(update_fields=['date_type'])
+        self.about.refresh_from_db()
+        self.assertEqual((date(1865, 1, 1), date(1865, 1, 1)), (self.about.sort_date_min, self.about.sort_date_max))
+
+    def test_rebuild_after_settings_change(self) -> None:
+        """Test stored date ranges are recomputed using the current settings"""
+
+        with override_settings(DATE_ABOUT_RANGE=10):
+            self.assertEqual(1, rebuild_sort_dates(chunk_size=1))
+            self.assertEqual(0, rebuild_sort_dates())
+
+        self.about.refresh_from_db()
+        self.assertEqual((date(1855, 1, 1), date(1875, 1, 1)), (self.about.sort_date_min, self.about.sort_date_max))
+
+    def test_rebuild_command(self) -> None:
+        """Test the `rebuild_sort_dates` management command updates stored date ranges"""
+
+        with override_settings(DATE_ABOUT_RANGE=1):
+            call_command('rebuild_sort_dates', stdout=StringIO())
+
+        self.about.refresh_from_db()
+        self.assertEqual(date(1864, 1, 1), self.about.sort_date_min)
+
+    @override_settings(DATE_ABOUT_RANGE=10)
+    def test_event_date_range(self) -> None:
+        """Test events are returned when their date may fall within the requested range"""
+
+        self.about.save()
+        response = self.client.get(reverse('gen_data:event-list'), {'date_after': '1840-01-01', 'date_before': '1860-12-31'})
+        self.assertCountEqual([self.regular.pk, self.about.pk], [event['id'] for event in response.data])
+
+    def test_person_birth_range(self) -> None:
+        """Test people are filtered by the date range of their birth"""
+
+        url = reverse('gen_data:person-list')
+        self.assertEqual(1, len(self.client.get(url, {'born_after': '1840-01-01', 'born_before': '1860-12-31'}).data))
+        self.assertEqual(0, len(self.client.get(url, {'born_after': '1860-01-01'}).data))
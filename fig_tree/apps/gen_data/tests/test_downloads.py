@@ -0,0 +1,201 @@
+"""Tests for the `downloads` module."""
+
+import shutil
+import tempfile
+
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.gen_data import downloads
+from apps.gen_data.downloads import RangeNotSatisfiable, parse_range_header, serve_file
+from apps.gen_data.media import process_media
+from apps.gen_data.models import Media
+from .test_media import create_image_file
+
+
+async def read_streaming_content(response) -> bytes:
+    """Return the complete content of an asynchronous streaming response"""
+
+    return b''.join([chunk async for chunk in response.streaming_content])
+
+
+class ParseRangeHeader(SimpleTestCase):
+    """Test the parsing of HTTP `Range` headers"""
+
+    def test_closed_range(self) -> None:
+        """Test ranges with explicit start and end positions"""
+
+        self.assertEqual((0, 99), parse_range_header('bytes=0-99', 1000))
+
+    def test_open_range(self) -> None:
+        """Test ranges without an end position extend to the end of the file"""
+
+        self.assertEqual((500, 999), parse_range_header('bytes=500-', 1000))
+
+    def test_suffix_range(self) -> None:
+        """Test suffix ranges return the final bytes of a file"""
+
+        self.assertEqual((900, 999), parse_range_header('bytes=-100', 1000))
+
+    def test_end_clipped_to_file_size(self) -> None:
+        """Test range end positions are clipped to the last byte in the file"""
+
+        self.assertEqual((0, 999), parse_range_header('bytes=0-5000', 1000))
+
+    def test_ignored_headers(self) -> None:
+        """Test missing, multi-range, and non-byte headers are ignored"""
+
+        self.assertIsNone(parse_range_header(None, 1000))
+        self.assertIsNone(parse_range_header('bytes=0-10,20-30', 1000))
+        self.assertIsNone(parse_range_header('items=0-10', 1000))
+
+    def test_unsatisfiable_range(self) -> None:
+        """Test an error is raised for ranges starting beyond the end of the file"""
+
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range_header('bytes=1000-', 1000)
+
+
+class ServeFile(TestCase):
+    """Test the serving of stored files"""
+
+    def setUp(self) -> None:
+        """Create a `Media` record using a temporary media directory"""
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        tree = FamilyTree.objects.create(tree_name='test')
+        self.media = Media.objects.create(tree=tree, blob=create_image_file(64, 64))
+        with self.media.blob.open('rb') as file:
+            self.content = file.read()
+
+    def tearDown(self) -> None:
+        """Remove temporary media files"""
+
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_full_content(self) -> None:
+        """Test the full file is returned when no range is requested"""
+
+        response = serve_file(RequestFactory().get('/'), self.media.blob)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.content, b''.join(response.streaming_content))
+
+    def test_partial_content(self) -> None:
+        """Test the requested byte range is returned for range requests"""
+
+        response = serve_file(RequestFactory().get('/', HTTP_RANGE='bytes=10-19'), self.media.blob)
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(f'bytes 10-19/{len(self.content)}', response['Content-Range'])
+        self.assertEqual(self.content[10:20], b''.join(response.streaming_content))
+
+    def test_wsgi_content_not_buffered(self) -> None:
+        """Test WSGI responses read file content lazily instead of materializing it in full"""
+
+        with patch.object(downloads, 'STREAM_BLOCK_SIZE', 16):
+            response = serve_file(RequestFactory().get('/'), self.media.blob)
+            self.assertFalse(response.is_async)
+
+            first_block = next(response.streaming_content)
+            self.assertEqual(self.content[:16], first_block)
+            self.assertEqual(self.content[16:], b''.join(response.streaming_content))
+
+    def test_asgi_content(self) -> None:
+        """Test ASGI responses stream file content asynchronously"""
+
+        response = serve_file(AsyncRequestFactory().get('/'), self.media.blob)
+        self.assertTrue(response.is_async)
+        self.assertEqual(self.content, async_to_sync(read_streaming_content)(response))
+
+    def test_unsatisfiable_range(self) -> None:
+        """Test a 416 error is returned for unsatisfiable ranges"""
+
+        request = RequestFactory().get('/', HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(416, serve_file(request, self.media.blob).status_code)
+
+    def test_matching_etag(self) -> None:
+        """Test a 304 response is returned when the client's cached copy is current"""
+
+        etag = serve_file(RequestFactory().get('/'), self.media.blob)['ETag']
+        response = serve_file(RequestFactory().get('/', HTTP_IF_NONE_MATCH=etag), self.media.blob)
+        self.assertEqual(304, response.status_code)
+
+    @override_settings(MEDIA_SENDFILE='nginx', MEDIA_SENDFILE_PREFIX='/protected/')
+    def test_nginx_offload(self) -> None:
+        """Test file transfers are delegated to Nginx when configured"""
+
+        response = serve_file(RequestFactory().get('/'), self.media.blob)
+        self.assertEqual(f'/protected/{self.media.blob.name}', response['X-Accel-Redirect'])
+        self.assertEqual(b'', response.content)
+
+
+class MediaDownloadEndpoint(TestCase):
+    """Test media files and their derivatives are served through the permission checked download endpoint"""
+
+    def setUp(self) -> None:
+        """Create a processed `Media` record in a tree readable by a test user"""
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_DERIVATIVE_SIZES={'thumbnail': 16})
+        self.settings_override.enable()
+
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        tree = FamilyTree.objects.create(tree_name='test')
+        TreePermission.objects.create(tree=tree, user=self.user, role=TreePermission.Role.READ_PRIVATE)
+        self.media = Media.objects.create(tree=tree, blob=create_image_file(64, 64))
+        process_media(self.media.pk)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('gen_data:media-detail', args=[self.media.pk])
+
+    def tearDown(self) -> None:
+        """Remove temporary media files"""
+
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_storage_paths_not_exposed(self) -> None:
+        """Test serialized records reference the download endpoint instead of stored files"""
+
+        data = self.client.get(self.url).data
+        self.assertNotIn('blob', data)
+        self.assertNotIn('blobs/', data['download'])
+        self.assertIn('variant=thumbnail', data['variants']['thumbnail']['webp'])
+
+    @override_settings(MEDIA_SENDFILE='nginx', MEDIA_SENDFILE_PREFIX='/protected/')
+    def test_variant_download(self) -> None:
+        """Test derivatives are served by the download endpoint"""
+
+        url = self.client.get(self.url).data['variants']['thumbnail']['jpeg']
+        response = self.client.get(url)
+
+        self.media.refresh_from_db()
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(f'/protected/{self.media.derivatives["thumbnail"]["jpeg"]}', response['X-Accel-Redirect'])
+
+    def test_unknown_variant(self) -> None:
+        """Test requests for missing derivatives return a 404 error"""
+
+        download_url = reverse('gen_data:media-download', args=[self.media.pk])
+        self.assertEqual(404, self.client.get(download_url, {'variant': 'source'}).status_code)
+        self.assertEqual(404, self.client.get(download_url, {'variant': 'thumbnail', 'type': 'gif'}).status_code)
+
+    def test_permission_required(self) -> None:
+        """Test derivatives are not served to users without access to the family tree"""
+
+        url = self.client.get(self.url).data['variants']['thumbnail']['jpeg']
+        TreePermission.objects.filter(user=self.user).delete()
+        self.assertEqual(404, self.client.get(url).status_code)
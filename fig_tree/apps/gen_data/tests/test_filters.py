@@ -0,0 +1,74 @@
+"""Tests for query parameter filtering, ordering, and searching of record endpoints."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.gen_data.models import Name, Person
+
+
+class RecordFilters(TestCase):
+    """Test query parameters supported by the `Person` and `Name` endpoints"""
+
+    def setUp(self) -> None:
+        """Create people across two family trees"""
+
+        user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.tree1 = FamilyTree.objects.create(tree_name='tree1')
+        self.tree2 = FamilyTree.objects.create(tree_name='tree2')
+        for tree in (self.tree1, self.tree2):
+            TreePermission.objects.create(tree=tree, user=user, role=TreePermission.Role.READ_PRIVATE)
+
+        for tree, given_name, surname, sex in (
+            (self.tree1, 'Mary', 'Byrne', Person.Sex.FEMALE),
+            (self.tree1, 'John', 'Walsh', Person.Sex.MALE),
+            (self.tree2, 'Anne', 'Murphy', Person.Sex.FEMALE),
+        ):
+            name = Name.objects.create(tree=tree, given_name=given_name, surname=surname)
+            Person.objects.create(tree=tree, primary_name=name, sex=sex, private=tree == self.tree2)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def get_given_names(self, **params) -> list[str]:
+        """Return the given names of people returned by the API for the given query parameters"""
+
+        response = self.client.get(reverse('gen_data:person-list'), params)
+        self.assertEqual(200, response.status_code)
+
+        names = Name.objects.in_bulk([person['primary_name'] for person in response.data])
+        return [names[person['primary_name']].given_name for person in response.data]
+
+    def test_common_filters(self) -> None:
+        """Test filtering by parent tree and privacy"""
+
+        self.assertCountEqual(['Mary', 'John'], self.get_given_names(tree=self.tree1.pk))
+        self.assertCountEqual(['Anne'], self.get_given_names(private='true'))
+
+    def test_model_filters(self) -> None:
+        """Test filtering by model specific fields and related records"""
+
+        self.assertCountEqual(['Mary', 'Anne'], self.get_given_names(sex=Person.Sex.FEMALE))
+        self.assertCountEqual(['John'], self.get_given_names(surname='Walsh'))
+
+    def test_ordering(self) -> None:
+        """Test records are sorted by whitelisted fields"""
+
+        self.assertEqual(['Mary', 'Anne', 'John'], self.get_given_names(ordering='primary_name__surname'))
+        self.assertEqual(['John', 'Anne', 'Mary'], self.get_given_names(ordering='-primary_name__surname'))
+
+    def test_search(self) -> None:
+        """Test searching records by name"""
+
+        self.assertEqual(['Anne'], self.get_given_names(search='murph'))
+
+    def test_invalid_value(self) -> None:
+        """Test invalid filter values are rejected"""
+
+        response = self.client.get(reverse('gen_data:person-list'), {'sex': 'unknown'})
+        self.assertEqual(400, response.status_code)
+        self.assertIn('sex', response.data)
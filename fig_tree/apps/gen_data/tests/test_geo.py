@@ -0,0 +1,108 @@
+"""Tests for the `geo` module and geographic API filters."""
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.gen_data.geo import bounding_box, encode_geohash
+from apps.gen_data.models import Place
+
+
+class EncodeGeohash(SimpleTestCase):
+    """Test the encoding of coordinates as geohashes"""
+
+    def test_known_value(self) -> None:
+        """Test a coordinate is encoded to its published geohash"""
+
+        self.assertEqual('u4pruydqqvj', encode_geohash(57.64911, 10.40744, precision=11))
+
+    def test_precision(self) -> None:
+        """Test the returned hash has the requested number of characters"""
+
+        self.assertEqual(5, len(encode_geohash(0, 0, precision=5)))
+
+
+class BoundingBox(SimpleTestCase):
+    """Test the calculation of bounding boxes around search circles"""
+
+    def test_box_contains_circle(self) -> None:
+        """Test the bounding box extends at least one radius in each direction"""
+
+        west, south, east, north = bounding_box(0, 0, 111.2)
+        self.assertAlmostEqual(-1, south, places=2)
+        self.assertAlmostEqual(1, north, places=2)
+        self.assertAlmostEqual(-1, west, places=2)
+        self.assertAlmostEqual(1, east, places=2)
+
+    def test_antimeridian_wraps(self) -> None:
+        """Test boxes crossing the antimeridian wrap around to negative longitudes"""
+
+        west, _, east, _ = bounding_box(0, 179.5, 111.2)
+        self.assertGreater(west, east)
+
+    def test_pole_spans_all_longitudes(self) -> None:
+        """Test boxes enclosing a pole span all longitudes"""
+
+        west, _, east, north = bounding_box(89.9, 0, 50)
+        self.assertEqual((-180, 180, 90), (west, east, north))
+
+
+class GeoFilter(TestCase):
+    """Test geographic query parameters on the `Place` API endpoint"""
+
+    def setUp(self) -> None:
+        """Create places in Dublin, Cork, and Fiji"""
+
+        user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+        tree = FamilyTree.objects.create(tree_name='test')
+        TreePermission.objects.create(tree=tree, user=user, role=TreePermission.Role.READ_PRIVATE)
+
+        self.dublin = Place.objects.create(tree=tree, name='Dublin', lat=53.3498, long=-6.2603)
+        self.cork = Place.objects.create(tree=tree, name='Cork', lat=51.8985, long=-8.4756)
+        self.fiji = Place.objects.create(tree=tree, name='Taveuni', lat=-16.8, long=179.9)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def get_names(self, **params) -> set[str]:
+        """Return the names of places returned by the API for the given query parameters"""
+
+        response = self.client.get(reverse('gen_data:place-list'), params)
+        self.assertEqual(200, response.status_code)
+        return {place['name'] for place in response.data}
+
+    def test_geohash_populated_on_save(self) -> None:
+        """Test geohash values are derived from record coordinates"""
+
+        self.assertEqual(encode_geohash(53.3498, -6.2603), self.dublin.geohash)
+
+    def test_bbox(self) -> None:
+        """Test records are limited to the requested bounding box"""
+
+        self.assertEqual({'Dublin'}, self.get_names(bbox='-7,53,-6,54'))
+
+    def test_bbox_crossing_antimeridian(self) -> None:
+        """Test bounding boxes crossing the antimeridian"""
+
+        self.assertEqual({'Taveuni'}, self.get_names(bbox='179,-20,-179,-10'))
+
+    def test_radius(self) -> None:
+        """Test records are limited to the requested search radius"""
+
+        self.assertEqual({'Dublin'}, self.get_names(near='53.35,-6.26', radius=50))
+        self.assertEqual({'Dublin', 'Cork'}, self.get_names(near='53.35,-6.26', radius=250))
+
+    def test_geohash_prefix(self) -> None:
+        """Test records are limited to the requested geohash cell"""
+
+        self.assertEqual({'Dublin'}, self.get_names(geohash=self.dublin.geohash[:4]))
+
+    def test_invalid_parameters(self) -> None:
+        """Test malformed coordinates and missing radius values are rejected"""
+
+        url = reverse('gen_data:place-list')
+        self.assertEqual(400, self.client.get(url, {'bbox': '1,2,3'}).status_code)
+        self.assertEqual(400, self.client.get(url, {'near': '53.35,-6.26'}).status_code)
@@ -0,0 +1,164 @@
+"""Tests for the `geocoding` module and `geocode_addresses` management command."""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.family_trees.models import FamilyTree
+from apps.gen_data.geo import encode_geohash
+from apps.gen_data.geocoding import Gazetteer, normalize
+from apps.gen_data.models import Address
+
+# Abbreviated records in the GeoNames dump format
+GAZETTEER_ROWS = [
+    ('2963597', 'Ireland', 'Ireland', 'Eire,Éire', '53.0', '-8.0', 'A', 'PCLI', 'IE', '', '00', '', '', '', '4622917'),
+    ('2635167', 'United Kingdom', 'United Kingdom', 'UK', '54.75', '-2.69', 'A', 'PCLI', 'GB', '', '00', '', '', '', '66488991'),
+    ('7521314', 'Leinster', 'Leinster', '', '53.0', '-7.0', 'A', 'ADM1', 'IE', '', 'L', '', '', '', '2504814'),
+    ('2964574', 'Dublin', 'Dublin', '', '53.33', '-6.24', 'P', 'PPLC', 'IE', '', 'L', '', '', '', '1024027'),
+    ('2650753', 'Dublin', 'Dublin', '', '52.00', '-1.00', 'P', 'PPL', 'GB', '', 'ENG', '', '', '', '100'),
+    ('2965140', 'Cork', 'Cork', 'Corcaigh', '51.90', '-8.47', 'P', 'PPLA', 'IE', '', 'M', '', '', '', '190384'),
+]
+
+
+def write_gazetteer(directory: str) -> Path:
+    """Write the test gazetteer to a file in the given directory and return the file path"""
+
+    path = Path(directory) / 'gazetteer.txt'
+    path.write_text('\n'.join('\t'.join(row) for row in GAZETTEER_ROWS), encoding='utf-8')
+    return path
+
+
+class GazetteerGeocode(SimpleTestCase):
+    """Test the resolution of address components against a gazetteer"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Load the test gazetteer"""
+
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.gazetteer = Gazetteer.from_geonames(write_gazetteer(cls.directory.name))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Remove the gazetteer and index files"""
+
+        cls.gazetteer.connection.close()
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def test_normalize(self) -> None:
+        """Test names are compared without accents, case, or extra whitespace"""
+
+        self.assertEqual('eire', normalize('  ÉIRE '))
+
+    def test_municipality(self) -> None:
+        """Test municipalities resolve to the most populous matching place"""
+
+        self.assertEqual((53.33, -6.24), self.gazetteer.geocode('Dublin', None, None))
+
+    def test_country_disambiguates(self) -> None:
+        """Test matching places are limited to the address country"""
+
+        self.assertEqual((52.0, -1.0), self.gazetteer.geocode('Dublin', None, 'UK'))
+
+    def test_alternate_names(self) -> None:
+        """Test country alternate names are recognized"""
+
+        self.assertEqual((51.9, -8.47), self.gazetteer.geocode('Cork', None, 'Éire'))
+
+    def test_fallback_to_province_and_country(self) -> None:
+        """Test unknown municipalities fall back to the province or country location"""
+
+        self.assertEqual((53.0, -7.0), self.gazetteer.geocode('Unknown', 'Leinster', 'Ireland'))
+        self.assertEqual((53.0, -8.0), self.gazetteer.geocode('Unknown', None, 'IE'))
+
+    def test_unresolved(self) -> None:
+        """Test unknown addresses are not resolved"""
+
+        self.assertIsNone(self.gazetteer.geocode('Unknown', None, 'Atlantis'))
+
+
+class GeocodeAddressesCommand(TestCase):
+    """Test the `geocode_addresses` management command"""
+
+    def setUp(self) -> None:
+        """Create addresses with and without coordinates"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.gazetteer_path = write_gazetteer(self.directory.name)
+
+        tree = FamilyTree.objects.create(tree_name='test')
+        self.dublin = Address.objects.create(tree=tree, line1='1 Main St', municipality='Dublin', country='Ireland')
+        self.cork = Address.objects.create(tree=tree, line1='2 Main St', municipality='Cork', lat=1, long=1)
+
+    def tearDown(self) -> None:
+        """Remove the gazetteer file"""
+
+        self.directory.cleanup()
+
+    def test_missing_coordinates_filled(self) -> None:
+        """Test addresses without coordinates are geocoded"""
+
+        call_command('geocode_addresses', self.gazetteer_path, chunk_size=1, stdout=io.StringIO())
+        self.dublin.refresh_from_db()
+
+        self.assertEqual((53.33, -6.24), (self.dublin.lat, self.dublin.long))
+        self.assertEqual(encode_geohash(53.33, -6.24), self.dublin.geohash)
+
+    def test_existing_coordinates_preserved(self) -> None:
+        """Test existing coordinates are only replaced when overwriting"""
+
+        call_command('geocode_addresses', self.gazetteer_path, stdout=io.StringIO())
+        self.cork.refresh_from_db()
+        self.assertEqual((1, 1), (self.cork.lat, self.cork.long))
+
+        call_command('geocode_addresses', self.gazetteer_path, overwrite=True, stdout=io.StringIO())
+        self.cork.refresh_from_db()
+        self.assertEqual((51.9, -8.47), (self.cork.lat, self.cork.long))
+
+    def test_multiple_workers(self) -> None:
+        """Test addresses are geocoded using a pool of worker processes"""
+
+        call_command('geocode_addresses', self.gazetteer_path, workers=2, chunk_size=1, stdout=io.StringIO())
+        self.dublin.refresh_from_db()
+        self.assertEqual((53.33, -6.24), (self.dublin.lat, self.dublin.long))
+
+
+class GazetteerIndex(SimpleTestCase):
+    """Test the creation of gazetteer index databases"""
+
+    def setUp(self) -> None:
+        """Write the test gazetteer to a temporary directory"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.gazetteer_path = write_gazetteer(self.directory.name)
+
+    def tearDown(self) -> None:
+        """Remove the gazetteer and index files"""
+
+        self.directory.cleanup()
+
+    def test_index_reused(self) -> None:
+        """Test existing indexes are reused while the dump file is unchanged"""
+
+        index_path = Gazetteer.build_index(self.gazetteer_path)
+        modified = index_path.stat().st_mtime_ns
+
+        self.assertEqual(index_path, Gazetteer.build_index(self.gazetteer_path))
+        self.assertEqual(modified, index_path.stat().st_mtime_ns)
+
+    def test_index_rebuilt(self) -> None:
+        """Test indexes are rebuilt when the dump file changes"""
+
+        index_path = Gazetteer.build_index(self.gazetteer_path)
+        os.utime(index_path, (0, 0))
+
+        self.gazetteer_path.write_text('\t'.join(GAZETTEER_ROWS[-1]), encoding='utf-8')
+        gazetteer = Gazetteer(Gazetteer.build_index(self.gazetteer_path))
+        self.assertIsNone(gazetteer.geocode('Dublin', None, None))
+        self.assertEqual((51.9, -8.47), gazetteer.geocode('Cork', None, None))
@@ -0,0 +1,159 @@
+"""Tests for the `media` module."""
+
+import io
+import shutil
+import tempfile
+from datetime import date, datetime, timezone
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import ExifTags, Image
+
+from apps.family_trees.models import FamilyTree
+from apps.gen_data.media import extract_metadata, process_media
+from apps.gen_data.models import Media
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, run_job
+
+
+def create_image_file(width: int, height: int, name: str = 'scan.jpg', exif: Image.Exif = None) -> SimpleUploadedFile:
+    """Return an uploaded JPEG file with the given dimensions and EXIF data"""
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color='red').save(buffer, format='JPEG', exif=exif or Image.Exif())
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+def create_exif() -> Image.Exif:
+    """Return EXIF data with a capture date, GPS position, and camera model"""
+
+    exif = Image.Exif()
+    exif[ExifTags.Base.Model] = 'Scanner 3000'
+    exif.get_ifd(ExifTags.IFD.Exif)[ExifTags.Base.DateTimeOriginal] = '1998:07:04 12:30:00'
+    exif.get_ifd(ExifTags.IFD.GPSInfo).update({
+        ExifTags.GPS.GPSLatitudeRef: 'N',
+        ExifTags.GPS.GPSLatitude: (53.0, 30.0, 0.0),
+        ExifTags.GPS.GPSLongitudeRef: 'W',
+        ExifTags.GPS.GPSLongitude: (6.0, 15.0, 0.0),
+    })
+
+    return exif
+
+
+class ProcessMedia(TestCase):
+    """Test the processing of uploaded media files"""
+
+    def setUp(self) -> None:
+        """Create a `Media` record using a temporary media directory"""
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            MEDIA_DERIVATIVE_SIZES={'thumbnail': 64, 'preview': 128})
+        self.settings_override.enable()
+
+        tree = FamilyTree.objects.create(tree_name='test')
+        self.media = Media.objects.create(tree=tree, blob=create_image_file(400, 200))
+
+    def tearDown(self) -> None:
+        """Remove temporary media files"""
+
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_processing_queued(self) -> None:
+        """Test new media files are processed by a background job"""
+
+        job = Job.objects.get(task='apps.gen_data.media.process_media')
+        self.assertEqual([self.media.pk], job.args)
+
+        run_job(claim_job().pk)
+        self.media.refresh_from_db()
+        self.assertEqual(self.media.blob.name, self.media.derivatives['source'])
+
+    def test_derivative_dimensions(self) -> None:
+        """Test derivatives are scaled to the configured size while preserving the aspect ratio"""
+
+        process_media(self.media.pk)
+        self.media.refresh_from_db()
+
+        self.assertEqual({'width': 64, 'height': 32}, {
+            key: self.media.derivatives['thumbnail'][key] for key in ('width', 'height')})
+        self.assertEqual({'width': 128, 'height': 64}, {
+            key: self.media.derivatives['preview'][key] for key in ('width', 'height')})
+
+    def test_derivative_files_written(self) -> None:
+        """Test derivative files are written to storage in each supported format"""
+
+        process_media(self.media.pk)
+        self.media.refresh_from_db()
+
+        storage = self.media.blob.storage
+        for format_name in ('webp', 'jpeg'):
+            path = self.media.derivatives['thumbnail'][format_name]
+            self.assertTrue(storage.exists(path))
+            with storage.open(path) as file, Image.open(file) as image:
+                self.assertEqual(format_name.upper(), image.format)
+
+    def test_source_recorded(self) -> None:
+        """Test the name of the original file is recorded alongside the derivatives"""
+
+        process_media(self.media.pk)
+        self.media.refresh_from_db()
+        self.assertEqual(self.media.blob.name, self.media.derivatives['source'])
+
+    def test_metadata_populated(self) -> None:
+        """Test image dimensions are recorded on the media record"""
+
+        process_media(self.media.pk)
+        self.media.refresh_from_db()
+        self.assertEqual((400, 200), (self.media.width, self.media.height))
+
+    def test_date_populated_from_capture_date(self) -> None:
+        """Test the media date is populated from the capture date when not already set"""
+
+        media = Media.objects.create(tree=self.media.tree, blob=create_image_file(10, 10, exif=create_exif()))
+        process_media(media.pk)
+        media.refresh_from_db()
+        self.assertEqual(date(1998, 7, 4), media.date)
+
+    def test_existing_date_not_overwritten(self) -> None:
+        """Test an existing media date is not replaced by the capture date"""
+
+        media = Media.objects.create(
+            tree=self.media.tree, date=date(1900, 1, 1), blob=create_image_file(10, 10, exif=create_exif()))
+        process_media(media.pk)
+        media.refresh_from_db()
+        self.assertEqual(date(1900, 1, 1), media.date)
+
+
+class ExtractMetadata(TestCase):
+    """Test the extraction of embedded image metadata"""
+
+    def setUp(self) -> None:
+        """Extract metadata from an image with EXIF data"""
+
+        with Image.open(create_image_file(40, 20, exif=create_exif())) as image:
+            self.metadata = extract_metadata(image)
+
+    def test_dimensions(self) -> None:
+        """Test image dimensions are extracted"""
+
+        self.assertEqual(40, self.metadata['width'])
+        self.assertEqual(20, self.metadata['height'])
+
+    def test_capture_date(self) -> None:
+        """Test the original capture date is extracted"""
+
+        self.assertEqual(datetime(1998, 7, 4, 12, 30, tzinfo=timezone.utc), self.metadata['captured_at'])
+
+    def test_gps_position(self) -> None:
+        """Test GPS coordinates are converted to signed decimal degrees"""
+
+        self.assertAlmostEqual(53.5, self.metadata['latitude'])
+        self.assertAlmostEqual(-6.25, self.metadata['longitude'])
+
+    def test_camera_model(self) -> None:
+        """Test the camera model is extracted"""
+
+        self.assertEqual('Scanner 3000', self.metadata['metadata']['camera_model'])
@@ -0,0 +1,160 @@
+"""Tests for the `Place` hierarchy and related API endpoints."""
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.cloning import clone_tree
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.gen_data.models import Event, Person, Place
+
+
+class PlaceHierarchy(TestCase):
+    """Test the maintenance of materialized place paths"""
+
+    def setUp(self) -> None:
+        """Create a three level place hierarchy"""
+
+        self.tree = FamilyTree.objects.create(tree_name='test')
+        self.ireland = Place.objects.create(tree=self.tree, name='Ireland')
+        self.leinster = Place.objects.create(tree=self.tree, name='Leinster', enclosed_by=self.ireland)
+        self.dublin = Place.objects.create(tree=self.tree, name='Dublin', enclosed_by=self.leinster)
+
+    def test_path_populated_on_create(self) -> None:
+        """Test new places are assigned a path extending the path of their enclosing place"""
+
+        self.assertEqual(f'/{self.ireland.pk}/', self.ireland.path)
+        self.assertEqual(f'/{self.ireland.pk}/{self.leinster.pk}/{self.dublin.pk}/', self.dublin.path)
+
+    def test_encloses_all_depths(self) -> None:
+        """Test enclosed places are returned at any depth"""
+
+        self.assertCountEqual([self.leinster, self.dublin], self.ireland.encloses)
+
+    def test_hierarchy_ordered_from_root(self) -> None:
+        """Test enclosing places are returned from the outermost place inward"""
+
+        self.assertEqual([self.ireland, self.leinster], list(self.dublin.hierarchy))
+
+    def test_move_updates_descendants(self) -> None:
+        """Test moving a place updates the paths of all places it encloses"""
+
+        europe = Place.objects.create(tree=self.tree, name='Europe')
+        self.ireland.enclosed_by = europe
+        self.ireland.save()
+
+        self.dublin.refresh_from_db()
+        self.assertEqual(f'/{europe.pk}/{self.ireland.pk}/{self.leinster.pk}/{self.dublin.pk}/', self.dublin.path)
+
+    def test_deep_hierarchy(self) -> None:
+        """Test paths are not truncated for deeply nested places"""
+
+        place = self.dublin
+        for depth in range(100):
+            place = Place.objects.create(tree=self.tree, name=f'Level {depth}', enclosed_by=place)
+
+        place.refresh_from_db()
+        self.assertEqual(103, len(place.path.strip('/').split('/')))
+        self.assertIn(place, self.ireland.encloses)
+
+    def test_cycle_rejected(self) -> None:
+        """Test a place cannot be enclosed by a place it encloses"""
+
+        self.ireland.enclosed_by = self.dublin
+        with self.assertRaises(ValueError):
+            self.ireland.save()
+
+    def test_other_tree_rejected(self) -> None:
+        """Test a place cannot be enclosed by a place in another family tree"""
+
+        other_tree = FamilyTree.objects.create(tree_name='other')
+        place = Place(tree=other_tree, name='Dublin', enclosed_by=self.leinster)
+        with self.assertRaises(ValidationError):
+            place.clean()
+
+        with self.assertRaises(ValueError):
+            place.save()
+
+    def test_clone_with_ancestor_in_other_tree(self) -> None:
+        """Test cloning truncates paths at enclosing places that belong to another family tree"""
+
+        other_tree = FamilyTree.objects.create(tree_name='other')
+        Place.objects.filter(pk__in=[self.leinster.pk, self.dublin.pk]).update(tree=other_tree)
+
+        clone = clone_tree(other_tree)
+        leinster = Place.objects.get(tree=clone, name='Leinster')
+        dublin = Place.objects.get(tree=clone, name='Dublin')
+        self.assertIsNone(leinster.enclosed_by)
+        self.assertEqual(f'/{leinster.pk}/', leinster.path)
+        self.assertEqual(leinster, dublin.enclosed_by)
+        self.assertEqual(f'/{leinster.pk}/{dublin.pk}/', dublin.path)
+
+
+class PlaceEndpoints(TestCase):
+    """Test place hierarchy queries via the API"""
+
+    def setUp(self) -> None:
+        """Create a place hierarchy and an authenticated API client"""
+
+        user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+        tree = FamilyTree.objects.create(tree_name='test')
+        TreePermission.objects.create(tree=tree, user=user, role=TreePermission.Role.WRITE)
+
+        self.ireland = Place.objects.create(tree=tree, name='Ireland')
+        self.dublin = Place.objects.create(tree=tree, name='Dublin', enclosed_by=self.ireland)
+        self.paris = Place.objects.create(tree=tree, name='Paris')
+        dublin_birth = Event.objects.create(tree=tree, event_type='birth', place=self.dublin)
+        paris_birth = Event.objects.create(tree=tree, event_type='birth', place=self.paris)
+        self.dubliner = Person.objects.create(tree=tree, birth=dublin_birth)
+        Person.objects.create(tree=tree, birth=paris_birth)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_within(self) -> None:
+        """Test the `within` endpoint returns enclosed places"""
+
+        response = self.client.get(reverse('gen_data:place-within', args=[self.ireland.pk]))
+        self.assertEqual(['Dublin'], [place['name'] for place in response.data])
+
+    def test_hierarchy(self) -> None:
+        """Test the `hierarchy` endpoint returns enclosing places"""
+
+        response = self.client.get(reverse('gen_data:place-hierarchy', args=[self.dublin.pk]))
+        self.assertEqual(['Ireland'], [place['name'] for place in response.data])
+
+    def test_events_within_place(self) -> None:
+        """Test events can be filtered to those occurring anywhere within a place"""
+
+        response = self.client.get(reverse('gen_data:event-list'), {'place_within': self.ireland.pk})
+        self.assertEqual([self.dublin.pk], [event['place'] for event in response.data])
+
+    def test_people_born_within_place(self) -> None:
+        """Test people can be filtered to those born anywhere within a place"""
+
+        response = self.client.get(reverse('gen_data:person-list'), {'born_within': self.ireland.pk})
+        self.assertEqual([self.dubliner.pk], [person['id'] for person in response.data])
+
+    def test_inaccessible_place_matches_nothing(self) -> None:
+        """Test places in other trees are treated the same as places that do not exist"""
+
+        other_tree = FamilyTree.objects.create(tree_name='other')
+        hidden = Place.objects.create(tree=other_tree, name='Hidden')
+        Event.objects.create(tree=other_tree, event_type='birth', place=hidden)
+
+        url = reverse('gen_data:event-list')
+        hidden_response = self.client.get(url, {'place_within': hidden.pk})
+        missing_response = self.client.get(url, {'place_within': hidden.pk + 1000})
+        self.assertEqual((200, []), (hidden_response.status_code, hidden_response.data))
+        self.assertEqual((200, []), (missing_response.status_code, missing_response.data))
+
+    def test_enclosing_cycle_rejected(self) -> None:
+        """Test updates enclosing a place within itself are rejected"""
+
+        response = self.client.patch(
+            reverse('gen_data:place-detail', args=[self.ireland.pk]), {'enclosed_by': self.dublin.pk}, format='json')
+
+        self.assertEqual(400, response.status_code)
@@ -0,0 +1,143 @@
+"""Tests for the `statistics` module and the family tree statistics endpoint."""
+
+import io
+from datetime import date
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission, TreeStatistic
+from apps.gen_data.admin import EventAdmin
+from apps.gen_data.dates import DateType
+from apps.gen_data.models import Event, Name
+
+
+class IncrementalStatistics(TestCase):
+    """Test statistics are maintained as records are saved and deleted"""
+
+    def setUp(self) -> None:
+        """Create a family tree with public events and names"""
+
+        self.tree = FamilyTree.objects.create(tree_name='test')
+        self.birth = Event.objects.create(tree=self.tree, event_type='Birth', date=date(1852, 3, 1), private=False)
+        Event.objects.create(tree=self.tree, event_type='Death', private=False)
+        Name.objects.create(tree=self.tree, surname='Byrne', private=False)
+
+    def get_statistics(self) -> dict:
+        """Return current tree statistics keyed by category and key"""
+
+        return {
+            (statistic.category, statistic.key): statistic.count
+            for statistic in TreeStatistic.objects.filter(tree=self.tree, count__gt=0)
+        }
+
+    def test_records_counted(self) -> None:
+        """Test new records are counted toward their statistics"""
+
+        statistics = self.get_statistics()
+        self.assertEqual(2, statistics['records', 'event'])
+        self.assertEqual(1, statistics['event_type', 'Birth'])
+        self.assertEqual(1, statistics['birth_decade', '1850'])
+        self.assertEqual(1, statistics['surname', 'Byrne'])
+
+    def test_modified_record_moves_between_statistics(self) -> None:
+        """Test changing a record field moves its count to the new statistic"""
+
+        self.birth.date = date(1861, 1, 1)
+        self.birth.save()
+
+        statistics = self.get_statistics()
+        self.assertNotIn(('birth_decade', '1850'), statistics)
+        self.assertEqual(1, statistics['birth_decade', '1860'])
+
+    def test_approximate_birth_decade(self) -> None:
+        """Test approximate birth dates are counted toward the decade of the recorded date"""
+
+        self.birth.date = date(1900, 6, 1)
+        self.birth.date_type = DateType.ABOUT
+        self.birth.save()
+
+        statistics = self.get_statistics()
+        self.assertEqual(1, statistics['birth_decade', '1900'])
+        self.assertNotIn(('birth_decade', '1890'), statistics)
+
+        TreeStatistic.objects.all().delete()
+        call_command('rebuild_tree_statistics', stdout=io.StringIO())
+        self.assertEqual(statistics, self.get_statistics())
+
+    def test_admin_privacy_actions(self) -> None:
+        """Test bulk privacy changes from the admin are reflected in the statistics"""
+
+        event_admin = EventAdmin(Event, admin.site)
+        public_decades = TreeStatistic.objects.filter(tree=self.tree, category='birth_decade', private=False)
+
+        event_admin.set_selected_to_private(None, Event.objects.filter(pk=self.birth.pk))
+        self.assertFalse(public_decades.filter(count__gt=0).exists())
+
+        event_admin.set_selected_to_public(None, Event.objects.filter(pk=self.birth.pk))
+        self.assertEqual(1, public_decades.get(key='1850').count)
+
+    def test_deleted_record_removed(self) -> None:
+        """Test deleted records are removed from their statistics"""
+
+        self.birth.delete()
+        statistics = self.get_statistics()
+        self.assertEqual(1, statistics['records', 'event'])
+        self.assertNotIn(('event_type', 'Birth'), statistics)
+
+    def test_rebuild_matches_incremental(self) -> None:
+        """Test rebuilding statistics reproduces the incrementally maintained values"""
+
+        expected = self.get_statistics()
+        TreeStatistic.objects.all().delete()
+        call_command('rebuild_tree_statistics', stdout=io.StringIO())
+        self.assertEqual(expected, self.get_statistics())
+
+    def test_tree_deletion(self) -> None:
+        """Test family trees can be deleted along with their records and statistics"""
+
+        self.tree.delete()
+        self.assertFalse(TreeStatistic.objects.exists())
+
+
+class StatisticsEndpoint(TestCase):
+    """Test the family tree `stats` endpoint"""
+
+    def setUp(self) -> None:
+        """Create a family tree with public and private names"""
+
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.tree = FamilyTree.objects.create(tree_name='test')
+        Name.objects.create(tree=self.tree, surname='Byrne', private=False)
+        Name.objects.create(tree=self.tree, surname='Byrne', private=True)
+        Name.objects.create(tree=self.tree, surname='Walsh', private=True)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_stats(self, role: TreePermission.Role) -> dict:
+        """Return tree statistics as seen by a user with the given role"""
+
+        TreePermission.objects.update_or_create(tree=self.tree, user=self.user, defaults={'role': role})
+        response = self.client.get(reverse('family_trees:familytree-stats', args=[self.tree.pk]))
+        self.assertEqual(200, response.status_code)
+        return response.data
+
+    def test_private_records_included(self) -> None:
+        """Test users with private read access see statistics for all records"""
+
+        data = self.get_stats(TreePermission.Role.READ_PRIVATE)
+        self.assertEqual({'Byrne': 2, 'Walsh': 1}, data['surname'])
+        self.assertEqual(3, data['records']['name'])
+
+    def test_private_records_excluded(self) -> None:
+        """Test users without private read access only see statistics for public records"""
+
+        data = self.get_stats(TreePermission.Role.READ)
+        self.assertEqual({'Byrne': 1}, data['surname'])
@@ -0,0 +1,120 @@
+"""Tests for the `storage` module and the handling of shared media files."""
+
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from apps.family_trees.models import FamilyTree
+from apps.gen_data.models import Media
+from apps.jobs.models import Job
+from apps.jobs.queue import run_job
+from .test_media import create_image_file
+
+
+class ContentAddressedStorage(TestCase):
+    """Test the deduplication and cleanup of stored media files"""
+
+    def setUp(self) -> None:
+        """Create a family tree using a temporary media directory"""
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.tree = FamilyTree.objects.create(tree_name='test')
+
+        # Files are deleted immediately unless a test restores the grace period
+        self.grace_period = patch('apps.gen_data.media.BLOB_GRACE_PERIOD', timedelta(0))
+        self.grace_period.start()
+
+    def tearDown(self) -> None:
+        """Remove temporary media files"""
+
+        self.grace_period.stop()
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_identical_files_deduplicated(self) -> None:
+        """Test identical files uploaded under different names are stored once"""
+
+        media1 = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32, name='a.jpg'))
+        media2 = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32, name='b.jpg'))
+        self.assertEqual(media1.blob.name, media2.blob.name)
+
+    def test_distinct_files_not_deduplicated(self) -> None:
+        """Test files with different content are stored separately"""
+
+        media1 = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        media2 = Media.objects.create(tree=self.tree, blob=create_image_file(16, 16))
+        self.assertNotEqual(media1.blob.name, media2.blob.name)
+
+    def test_shared_file_retained_until_last_reference_deleted(self) -> None:
+        """Test stored files are only deleted after the last referencing record is deleted"""
+
+        media1 = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        media2 = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        storage, name = media1.blob.storage, media1.blob.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            media1.delete()
+
+        self.assertTrue(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            media2.delete()
+
+        self.assertFalse(storage.exists(name))
+
+    def test_replaced_file_released(self) -> None:
+        """Test a stored file is deleted when its only referencing record is given a new file"""
+
+        media = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        storage, name = media.blob.storage, media.blob.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            media.blob = create_image_file(16, 16)
+            media.save()
+
+        self.assertFalse(storage.exists(name))
+        self.assertTrue(storage.exists(media.blob.name))
+
+    def test_recently_used_file_retained(self) -> None:
+        """Test deleting recently used files is postponed to a background job"""
+
+        self.grace_period.stop()
+        media = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        storage, name = media.blob.storage, media.blob.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            media.delete()
+
+        self.assertTrue(storage.exists(name))
+        self.assertTrue(Job.objects.filter(task='apps.gen_data.media._delete_unreferenced').exists())
+        self.grace_period.start()
+
+    def test_file_reused_during_grace_period(self) -> None:
+        """Test files reused before a postponed deletion runs are not deleted"""
+
+        self.grace_period.stop()
+        media = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        storage, name = media.blob.storage, media.blob.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            media.delete()
+
+        Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        self.grace_period.start()
+        run_job(Job.objects.get(task='apps.gen_data.media._delete_unreferenced').pk)
+        self.assertTrue(storage.exists(name))
+
+    def test_deleted_file_rewritten(self) -> None:
+        """Test files deleted from storage are written again when reused"""
+
+        media = Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        storage, name = media.blob.storage, media.blob.name
+        storage.delete(name)
+
+        Media.objects.create(tree=self.tree, blob=create_image_file(32, 32))
+        self.assertTrue(storage.exists(name))
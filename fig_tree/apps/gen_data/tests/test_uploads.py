@@ -0,0 +1,220 @@
+"""Tests for chunked media uploads via the `MediaUploadViewSet` class and the `uploads` module."""
+
+import shutil
+import tempfile
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.gen_data.models import Media, MediaUpload
+from apps.gen_data.uploads import delete_expired_uploads, partial_file_path
+from .test_media import create_image_file
+
+
+class ChunkedUpload(TestCase):
+    """Test the chunked upload protocol"""
+
+    def setUp(self) -> None:
+        """Create a user with write permissions and a temporary media directory"""
+
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            MEDIA_UPLOAD_DIR=Path(self.media_root) / 'uploads')
+        self.settings_override.enable()
+
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+        self.tree = FamilyTree.objects.create(tree_name='test')
+        TreePermission.objects.create(tree=self.tree, user=self.user, role=TreePermission.Role.WRITE)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.content = create_image_file(64, 64).read()
+
+    def tearDown(self) -> None:
+        """Remove temporary media files"""
+
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def create_upload(self) -> str:
+        """Create a new upload and return its id"""
+
+        response = self.client.post(reverse('gen_data:mediaupload-list'), dict(
+            tree=self.tree.pk,
+            filename='scan.jpg',
+            length=len(self.content),
+            metadata={'description': 'A scan'}
+        ), format='json')
+
+        self.assertEqual(201, response.status_code)
+        return response.data['id']
+
+    def send_chunk(self, upload_id: str, offset: int, chunk: bytes):
+        """Upload a chunk of data starting at the given offset"""
+
+        return self.client.patch(
+            reverse('gen_data:mediaupload-detail', kwargs={'pk': upload_id}),
+            data=chunk,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset))
+
+    def test_complete_upload_creates_media(self) -> None:
+        """Test a media record is created after uploading all chunks and finalizing"""
+
+        upload_id = self.create_upload()
+        midpoint = len(self.content) // 2
+        self.assertEqual(204, self.send_chunk(upload_id, 0, self.content[:midpoint]).status_code)
+        self.assertEqual(204, self.send_chunk(upload_id, midpoint, self.content[midpoint:]).status_code)
+
+        response = self.client.post(reverse('gen_data:mediaupload-finalize', kwargs={'pk': upload_id}))
+        self.assertEqual(201, response.status_code)
+
+        media = Media.objects.get(pk=response.data['id'])
+        self.assertEqual('A scan', media.description)
+        with media.blob.open('rb') as file:
+            self.assertEqual(self.content, file.read())
+
+        self.assertFalse(MediaUpload.objects.filter(pk=upload_id).exists())
+
+    def test_offset_mismatch_rejected(self) -> None:
+        """Test chunks are rejected when they do not start at the current upload offset"""
+
+        upload_id = self.create_upload()
+        response = self.send_chunk(upload_id, 10, self.content[10:])
+        self.assertEqual(409, response.status_code)
+
+    def test_claimed_upload_rejected(self) -> None:
+        """Test chunks are rejected while another chunk is being written to the same upload"""
+
+        upload_id = self.create_upload()
+        MediaUpload.objects.filter(pk=upload_id).update(claimed_until=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(409, self.send_chunk(upload_id, 0, self.content[:100]).status_code)
+
+        # Claims left behind by interrupted requests lapse
+        MediaUpload.objects.filter(pk=upload_id).update(claimed_until=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(204, self.send_chunk(upload_id, 0, self.content[:100]).status_code)
+
+        upload = MediaUpload.objects.get(pk=upload_id)
+        self.assertEqual((100, None), (upload.offset, upload.claimed_until))
+
+    def test_oversized_chunk_releases_claim(self) -> None:
+        """Test uploads can receive further chunks after a chunk is rejected"""
+
+        upload_id = self.create_upload()
+        self.assertEqual(413, self.send_chunk(upload_id, 0, self.content + b'extra').status_code)
+        self.assertEqual(204, self.send_chunk(upload_id, 0, self.content).status_code)
+
+    def test_resume_reports_offset(self) -> None:
+        """Test the current offset of an interrupted upload is reported to clients"""
+
+        upload_id = self.create_upload()
+        self.send_chunk(upload_id, 0, self.content[:100])
+
+        response = self.client.head(reverse('gen_data:mediaupload-detail', kwargs={'pk': upload_id}))
+        self.assertEqual('100', response['Upload-Offset'])
+
+    def test_incomplete_upload_not_finalized(self) -> None:
+        """Test incomplete uploads cannot be finalized"""
+
+        upload_id = self.create_upload()
+        self.send_chunk(upload_id, 0, self.content[:100])
+
+        response = self.client.post(reverse('gen_data:mediaupload-finalize', kwargs={'pk': upload_id}))
+        self.assertEqual(409, response.status_code)
+        self.assertFalse(Media.objects.exists())
+
+    def test_upload_requires_write_permission(self) -> None:
+        """Test uploads cannot be created for trees without write permissions"""
+
+        TreePermission.objects.filter(user=self.user).update(role=TreePermission.Role.READ)
+        response = self.client.post(reverse('gen_data:mediaupload-list'), dict(
+            tree=self.tree.pk, filename='scan.jpg', length=len(self.content)
+        ), format='json')
+
+        self.assertEqual(403, response.status_code)
+
+    def test_tree_deletion_removes_partial_file(self) -> None:
+        """Test partial files are deleted when their upload is deleted by a cascade"""
+
+        upload = MediaUpload.objects.get(pk=self.create_upload())
+        self.send_chunk(upload.pk, 0, self.content[:100])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tree.delete()
+
+        self.assertFalse(partial_file_path(upload).exists())
+
+
+class DeleteExpiredUploads(TestCase):
+    """Test the deletion of abandoned uploads"""
+
+    def setUp(self) -> None:
+        """Create an expired and an active upload with partial files in a temporary directory"""
+
+        self.upload_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_UPLOAD_DIR=self.upload_dir)
+        self.settings_override.enable()
+
+        user = get_user_model().objects.create_user(username='test_user', email='test@user.com', password='foo')
+        tree = FamilyTree.objects.create(tree_name='test')
+        self.expired = MediaUpload.objects.create(
+            tree=tree, user=user, filename='a.jpg', length=10, expires=timezone.now() - timedelta(minutes=1))
+        self.active = MediaUpload.objects.create(tree=tree, user=user, filename='b.jpg', length=10)
+
+        for upload in (self.expired, self.active):
+            partial_file_path(upload).write_bytes(b'data')
+
+    def tearDown(self) -> None:
+        """Remove temporary upload files"""
+
+        self.settings_override.disable()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_expired_uploads_deleted(self) -> None:
+        """Test expired uploads and their partial files are deleted"""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(1, delete_expired_uploads())
+
+        self.assertFalse(MediaUpload.objects.filter(pk=self.expired.pk).exists())
+        self.assertFalse(partial_file_path(self.expired).exists())
+
+    def test_active_uploads_kept(self) -> None:
+        """Test uploads that have not expired are not deleted"""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            delete_expired_uploads()
+
+        self.assertTrue(MediaUpload.objects.filter(pk=self.active.pk).exists())
+        self.assertTrue(partial_file_path(self.active).exists())
+
+    def test_orphaned_files_deleted(self) -> None:
+        """Test partial files without an upload record are deleted"""
+
+        orphan = Path(self.upload_dir) / f'{uuid.uuid4()}.part'
+        orphan.write_bytes(b'data')
+        modified = (timezone.now() - settings.MEDIA_UPLOAD_EXPIRY - timedelta(minutes=1)).timestamp()
+        os.utime(orphan, (modified, modified))
+
+        delete_expired_uploads()
+        self.assertFalse(orphan.exists())
+
+    def test_recent_orphaned_files_kept(self) -> None:
+        """Test recently modified partial files are not deleted in case their upload was just created"""
+
+        recent = Path(self.upload_dir) / f'{uuid.uuid4()}.part'
+        recent.write_bytes(b'data')
+
+        delete_expired_uploads()
+        self.assertTrue(recent.exists())
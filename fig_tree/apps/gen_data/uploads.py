@@ -0,0 +1,199 @@
+"""
+The `uploads` module implements storage handling for chunked, resumable
+media uploads. Uploaded chunks are streamed directly from the incoming
+request into a partial file on disk, so file content is never held in
+memory in its entirety. Partial files are stored in the directory specified
+by the `MEDIA_UPLOAD_DIR` application setting, which should not be served
+to clients.
+
+Each chunk is written without holding a database transaction open. Instead,
+the upload is claimed for the duration of the write, and chunks sent while
+another chunk is being written are rejected. Claims left by interrupted
+requests lapse after the period given by the `MEDIA_UPLOAD_CHUNK_TIMEOUT`
+setting.
+
+Partial files are deleted along with their upload records. Uploads that do
+not receive any data for the period given by the `MEDIA_UPLOAD_EXPIRY`
+setting are deleted by a recurring background job.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.jobs.queue import report_progress
+from .models import MediaUpload
+
+__all__ = [
+    'ChunkedUploadedFile',
+    'UploadOffsetError',
+    'append_chunk',
+    'delete_expired_uploads',
+    'partial_file_path',
+    'receive_chunk',
+]
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class UploadOffsetError(Exception):
+    """Raised when an uploaded chunk does not start at the expected file offset"""
+
+
+class ChunkedUploadedFile(UploadedFile):
+    """A completed chunked upload, presented as a Django uploaded file
+
+    Exposing the path of the partial file allows storage backends and image
+    validators to operate on the file in place instead of reading it into memory.
+    """
+
+    def __init__(self, upload: MediaUpload) -> None:
+        """Open the partial file of a completed upload
+
+        Args:
+            upload: The completed upload
+        """
+
+        self._path = partial_file_path(upload)
+        super().__init__(open(self._path, 'rb'), name=upload.filename, size=upload.length)
+
+    def temporary_file_path(self) -> str:
+        """Return the path of the uploaded file on disk"""
+
+        return str(self._path)
+
+
+def partial_file_path(upload: MediaUpload) -> Path:
+    """Return the path of the partial file used to store uploaded chunks
+
+    Args:
+        upload: The upload to return a path for
+
+    Returns:
+        The file path on disk
+    """
+
+    return Path(settings.MEDIA_UPLOAD_DIR) / f'{upload.id}.part'
+
+
+def append_chunk(upload: MediaUpload, offset: int, stream: BinaryIO) -> int:
+    """Write a chunk of uploaded data to the partial file of an upload
+
+    The chunk is streamed to disk in fixed size blocks. Data beyond the
+    declared upload length is rejected. The caller is responsible for saving
+    the updated upload offset.
+
+    Args:
+        upload: The upload to append data to
+        offset: The file offset the chunk is expected to start at
+        stream: A readable stream containing the chunk data
+
+    Returns:
+        The file offset after writing the chunk
+    """
+
+    if offset != upload.offset:
+        raise UploadOffsetError(f'Expected upload offset {upload.offset} but received {offset}.')
+
+    path = partial_file_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch(exist_ok=True)
+
+    with path.open('r+b') as file:
+        # Discard any data left over from a previously interrupted chunk
+        file.seek(offset)
+        file.truncate()
+
+        while block := stream.read(STREAM_BLOCK_SIZE):
+            if file.tell() + len(block) > upload.length:
+                file.truncate(offset)
+                raise ValueError('Uploaded data exceeds the declared upload length.')
+
+            file.write(block)
+
+        return file.tell()
+
+
+def receive_chunk(upload: MediaUpload, offset: int, stream: BinaryIO) -> int:
+    """Claim an upload, append a chunk of uploaded data, and save the new upload offset
+
+    Database rows are only locked while claiming the upload and while saving
+    the new offset. The chunk itself is written outside any transaction.
+
+    Args:
+        upload: The upload to append data to
+        offset: The file offset the chunk is expected to start at
+        stream: A readable stream containing the chunk data
+
+    Returns:
+        The file offset after writing the chunk
+
+    Raises:
+        UploadOffsetError: If the offset does not match or another chunk is being written
+        ValueError: If the uploaded data exceeds the declared upload length
+    """
+
+    if offset != upload.offset:
+        raise UploadOffsetError(f'Expected upload offset {upload.offset} but received {offset}.')
+
+    now = timezone.now()
+    claimed_until = now + settings.MEDIA_UPLOAD_CHUNK_TIMEOUT
+    uploads = MediaUpload.objects.filter(pk=upload.pk)
+    claimed = uploads \
+        .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now), offset=offset) \
+        .update(claimed_until=claimed_until)
+
+    if not claimed:
+        raise UploadOffsetError('Another chunk is being written to this upload.')
+
+    try:
+        new_offset = append_chunk(upload, offset, stream)
+
+    except Exception:
+        uploads.filter(claimed_until=claimed_until).update(claimed_until=None)
+        raise
+
+    # Uploads expire once they stop receiving data
+    expires = timezone.now() + settings.MEDIA_UPLOAD_EXPIRY
+    if not uploads.filter(claimed_until=claimed_until).update(offset=new_offset, expires=expires, claimed_until=None):
+        raise UploadOffsetError('The upload was modified while the chunk was being written.')
+
+    upload.offset, upload.expires, upload.claimed_until = new_offset, expires, None
+    return new_offset
+
+
+def delete_expired_uploads() -> int:
+    """Delete expired uploads and any partial files without an upload record
+
+    When run as a background job, progress is reported as uploads are deleted.
+
+    Returns:
+        The number of deleted uploads
+    """
+
+    expired = list(MediaUpload.objects.filter(expires__lte=timezone.now()))
+    for progress, upload in enumerate(expired, start=1):
+        upload.delete()
+        report_progress(progress, len(expired))
+
+    # Remove files left behind by uploads deleted without sending model signals.
+    # Recently modified files are skipped in case their upload was created after `active` was loaded.
+    upload_dir = Path(settings.MEDIA_UPLOAD_DIR)
+    if upload_dir.is_dir():
+        cutoff = (timezone.now() - settings.MEDIA_UPLOAD_EXPIRY).timestamp()
+        active = {str(pk) for pk in MediaUpload.objects.values_list('pk', flat=True)}
+        for path in upload_dir.glob('*.part'):
+            try:
+                if path.stem not in active and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+
+            except FileNotFoundError:
+                continue
+
+    return len(expired)
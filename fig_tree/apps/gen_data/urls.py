@@ -5,32 +5,38 @@ View objects can be found in the `views` module.
 
 # URL Routing Configuration
 
-| URL                   | View / View Set         | Name               |
-|-----------------------|------------------------|---------------------|
-| `address/`            | `AddressViewSet`       | `address-list`      |
-| `address/<str:pk>`    | `AddressViewSet`       | `address-detail`    |
-| `citation/`           | `CitationViewSet`      | `citation-list`     |
-| `citation/<str:pk>`   | `CitationViewSet`      | `citation-detail`   |
-| `event/`              | `EventViewSet`         | `event-list`        |
-| `event/<str:pk>`      | `EventViewSet`         | `event-detail`      |
-| `family/`             | `FamilyViewSet`        | `family-list`       |
-| `family/<str:pk>`     | `FamilyViewSet`        | `family-detail`     |
-| `media/`              | `MediaViewSet`         | `media-list`        |
-| `media/<str:pk>`      | `MediaViewSet`         | `media-detail`      |
-| `name/`               | `NameViewSet`          | `name-list`         |
-| `name/<str:pk>`       | `NameViewSet`          | `name-detail`       |
-| `person/`             | `PersonViewSet`        | `person-list`       |
-| `person/<str:pk>`     | `PersonViewSet`        | `person-detail`     |
-| `place/`              | `PlaceViewSet`         | `place-list`        |
-| `place/<str:pk>`      | `PlaceViewSet`         | `place-detail`      |
-| `repository/`         | `RepositoryViewSet`    | `repository-list`   |
-| `repository/<str:pk>` | `RepositoryViewSet`    | `repository-detail` |
-| `source/`             | `SourceViewSet`        | `source-list`       |
-| `source/<str:pk>`     | `SourceViewSet`        | `source-detail`     |
-| `tag/`                | `TagViewSet`           | `tag-list`          |
-| `tag/<str:pk>`        | `TagViewSet`           | `tag-detail`        |
-| `url/`                | `URLViewSet`           | `url-list`          |
-| `url/<str:pk>`        | `URLViewSet`           | `url-detail`        |
+| URL                               | View / View Set      | Name                   |
+|-----------------------------------|----------------------|------------------------|
+| `address/`                        | `AddressViewSet`     | `address-list`         |
+| `address/<str:pk>`                | `AddressViewSet`     | `address-detail`       |
+| `citation/`                       | `CitationViewSet`    | `citation-list`        |
+| `citation/<str:pk>`               | `CitationViewSet`    | `citation-detail`      |
+| `event/`                          | `EventViewSet`       | `event-list`           |
+| `event/<str:pk>`                  | `EventViewSet`       | `event-detail`         |
+| `family/`                         | `FamilyViewSet`      | `family-list`          |
+| `family/<str:pk>`                 | `FamilyViewSet`      | `family-detail`        |
+| `media/`                          | `MediaViewSet`       | `media-list`           |
+| `media/<str:pk>`                  | `MediaViewSet`       | `media-detail`         |
+| `media/<str:pk>/download/`        | `MediaViewSet`       | `media-download`       |
+| `media_upload/`                   | `MediaUploadViewSet` | `mediaupload-list`     |
+| `media_upload/<str:pk>`           | `MediaUploadViewSet` | `mediaupload-detail`   |
+| `media_upload/<str:pk>/finalize/` | `MediaUploadViewSet` | `mediaupload-finalize` |
+| `name/`                           | `NameViewSet`        | `name-list`            |
+| `name/<str:pk>`                   | `NameViewSet`        | `name-detail`          |
+| `person/`                         | `PersonViewSet`      | `person-list`          |
+| `person/<str:pk>`                 | `PersonViewSet`      | `person-detail`        |
+| `place/`                          | `PlaceViewSet`       | `place-list`           |
+| `place/<str:pk>`                  | `PlaceViewSet`       | `place-detail`         |
+| `place/<str:pk>/within/`          | `PlaceViewSet`       | `place-within`         |
+| `place/<str:pk>/hierarchy/`       | `PlaceViewSet`       | `place-hierarchy`      |
+| `repository/`                     | `RepositoryViewSet`  | `repository-list`      |
+| `repository/<str:pk>`             | `RepositoryViewSet`  | `repository-detail`    |
+| `source/`                         | `SourceViewSet`      | `source-list`          |
+| `source/<str:pk>`                 | `SourceViewSet`      | `source-detail`        |
+| `tag/`                            | `TagViewSet`         | `tag-list`             |
+| `tag/<str:pk>`                    | `TagViewSet`         | `tag-detail`           |
+| `url/`                            | `URLViewSet`         | `url-list`             |
+| `url/<str:pk>`                    | `URLViewSet`         | `url-detail`           |
 """
 
 from rest_framework import routers
@@ -45,6 +51,7 @@ router.register(r'citation', CitationViewSet)
 router.register(r'event', EventViewSet)
 router.register(r'family', FamilyViewSet)
 router.register(r'media', MediaViewSet)
+router.register(r'media_upload', MediaUploadViewSet)
 router.register(r'name', NameViewSet)
 router.register(r'person', PersonViewSet)
 router.register(r'place', PlaceViewSet)
@@ -8,13 +8,29 @@ Whenever possible, generic base classes are used to implement common behavior
 for HTTP request handling.
 """
 
-from django.db.models import Manager, Q
-from rest_framework import mixins, viewsets
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Manager
+from django.db.models.fields.files import FieldFile
+from django.db.models.functions import Length
+from django.http import HttpResponseBase
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 import apps.family_trees.permissions as tree_permissions
+from apps.authentication.ratelimit import SlidingWindowThrottle
+from apps.family_trees.caching import CachedListMixin
+from .downloads import serve_file
+from .filters import GeoFilter, PlacePathField, QueryParameterFilter
+from .media import DERIVATIVE_FORMATS
 from .models import *
 from .serializers import *
+from .uploads import *
 
 __all__ = [
     'AddressViewSet',
@@ -22,6 +38,7 @@ __all__ = [
     'EventViewSet',
     'FamilyViewSet',
     'MediaViewSet',
+    'MediaUploadViewSet',
     'NameViewSet',
     'PersonViewSet',
     'PlaceViewSet',
@@ -47,30 +64,44 @@ class BaseViewSet(
     """
 
 
-class BaseRecordViewSet(BaseViewSet):
+class BaseRecordViewSet(CachedListMixin, BaseViewSet):
     """Base ViewSet used to build REST endpoints for genealogical record types
 
     This class modifies the class level queryset by limiting the records
     returned during list operations. Records are only returned where the user
-    has appropriate permissions on the parent family tree.
+    has appropriate permissions on the parent family tree. List responses are
+    cached per user and invalidated whenever a visible family tree changes.
+
+    Records can be filtered using the query parameters declared in
+    `filter_parameters`, sorted using the `ordering` parameter (restricted to
+    `ordering_fields`), and searched using the `search` parameter (applied to
+    `search_fields`). Subclasses extend the parameters declared here.
     """
 
     permission_classes = (IsAuthenticated, tree_permissions.IsTreeMember)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = 'gen_data'
+    filter_backends = [QueryParameterFilter, GeoFilter, SearchFilter, OrderingFilter]
+    filter_parameters = {
+        'tree': ('tree', serializers.IntegerField()),
+        'private': ('private', serializers.BooleanField()),
+        'modified_after': ('last_modified__gte', serializers.DateTimeField()),
+        'modified_before': ('last_modified__lte', serializers.DateTimeField()),
+    }
+    ordering_fields = ['id', 'last_modified']
 
     def get_queryset(self) -> Manager:
         """Filter the class level `queryset` attribute based on user tree permissions"""
 
-        user = self.request.user  # Assume the request is made from an authenticated session
-        return self.queryset.filter(
-            Q(
-                tree__treepermission__user=user,
-                tree__treepermission__role__gte=tree_permissions.TreePermission.Role.READ_PRIVATE,
-            ) | Q(
-                tree__treepermission__user=user,
-                tree__treepermission__role__gte=tree_permissions.TreePermission.Role.READ,
-                private=False
-            )
-        )
+        # Assume the request is made from an authenticated session
+        return self.queryset.filter(tree_permissions.readable_records_filter(self.request))
+
+
+# Filters for records using generic relationships (see `GenericRelationshipMixin`)
+_generic_relation_filters = {
+    'content_type': ('content_type', serializers.IntegerField()),
+    'object_id': ('object_id', serializers.IntegerField()),
+}
 
 
 class AddressViewSet(BaseRecordViewSet):
@@ -78,6 +109,16 @@ class AddressViewSet(BaseRecordViewSet):
 
     serializer_class = AddressSerializer
     queryset = Address.objects
+    geo_fields = ('lat', 'long', 'geohash')
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        **_generic_relation_filters,
+        'municipality': ('municipality', serializers.CharField()),
+        'province': ('province', serializers.CharField()),
+        'country': ('country', serializers.CharField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'municipality', 'province', 'country']
+    search_fields = ['line1', 'municipality', 'province', 'country']
 
 
 class CitationViewSet(BaseRecordViewSet):
@@ -85,13 +126,37 @@ class CitationViewSet(BaseRecordViewSet):
 
     serializer_class = CitationSerializer
     queryset = Citation.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        **_generic_relation_filters,
+        'source': ('source', serializers.IntegerField()),
+        'confidence': ('confidence', serializers.ChoiceField(Citation.Confidence.choices)),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'confidence']
+    search_fields = ['page_or_reference']
 
 
 class EventViewSet(BaseRecordViewSet):
-    """ViewSet for CRUD operations on `Event` records"""
+    """ViewSet for CRUD operations on `Event` records
+
+    Date filters match events whose date may fall on or after `date_after`
+    and on or before `date_before`, accounting for imprecise date types.
+    """
 
     serializer_class = EventSerializer
     queryset = Event.objects
+    geo_fields = ('place__lat', 'place__long', 'place__geohash')
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'event_type': ('event_type', serializers.CharField()),
+        'date_type': ('date_type', serializers.ChoiceField(Event.DateType.choices)),
+        'date_after': ('sort_date_max__gte', serializers.DateField()),
+        'date_before': ('sort_date_min__lte', serializers.DateField()),
+        'place': ('place', serializers.IntegerField()),
+        'place_within': ('place__path__startswith', PlacePathField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'event_type', 'sort_date_min', 'sort_date_max']
+    search_fields = ['event_type', 'description']
 
 
 class FamilyViewSet(BaseRecordViewSet):
@@ -99,6 +164,12 @@ class FamilyViewSet(BaseRecordViewSet):
 
     serializer_class = FamilySerializer
     queryset = Family.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'parent1': ('parent1', serializers.IntegerField()),
+        'parent2': ('parent2', serializers.IntegerField()),
+        'children': ('children', serializers.IntegerField()),
+    }
 
 
 class MediaViewSet(BaseRecordViewSet):
@@ -106,6 +177,151 @@ class MediaViewSet(BaseRecordViewSet):
 
     serializer_class = MediaSerializer
     queryset = Media.objects
+    geo_fields = ('latitude', 'longitude', None)
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        **_generic_relation_filters,
+        'date_after': ('date__gte', serializers.DateField()),
+        'date_before': ('date__lte', serializers.DateField()),
+        'captured_after': ('captured_at__gte', serializers.DateTimeField()),
+        'captured_before': ('captured_at__lte', serializers.DateTimeField()),
+        'min_width': ('width__gte', serializers.IntegerField(min_value=0)),
+        'max_width': ('width__lte', serializers.IntegerField(min_value=0)),
+        'min_height': ('height__gte', serializers.IntegerField(min_value=0)),
+        'max_height': ('height__lte', serializers.IntegerField(min_value=0)),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'date', 'captured_at', 'width', 'height']
+    search_fields = ['description']
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk: str = None) -> HttpResponseBase:
+        """Return the media file content
+
+        Byte-range requests are supported, allowing clients to fetch
+        individual sections of a file. Reduced size derivatives are returned
+        using the `variant` (e.g., `thumbnail`) and `type` (e.g., `webp`)
+        query parameters.
+        """
+
+        media = self.get_object()
+        if not media.blob:
+            raise NotFound('No file is associated with the requested record.')
+
+        variant_name = request.query_params.get('variant')
+        if variant_name is None:
+            return serve_file(request, media.blob)
+
+        extension = request.query_params.get('type', next(iter(DERIVATIVE_FORMATS)))
+        variant = media.derivatives.get(variant_name) if variant_name != 'source' else None
+        if not variant or extension not in DERIVATIVE_FORMATS:
+            raise NotFound('The requested variant does not exist.')
+
+        # Derivatives are written to the default storage backend (see the `media` module)
+        variant_file = FieldFile(media, Media.blob.field, variant[extension])
+        variant_file.storage = default_storage
+        return serve_file(request, variant_file)
+
+
+class MediaUploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet
+):
+    """ViewSet for chunked, resumable uploads of `Media` files
+
+    Uploads are performed using the following protocol:
+
+    1. `POST` the file name, total file length, tree, and any additional
+       `Media` field values (`metadata`) to create a new upload.
+    2. `PATCH` sequential chunks of raw file data to the upload, setting the
+       `Upload-Offset` header to the byte offset of each chunk. The current
+       offset of an interrupted upload is returned by `GET` or `HEAD` requests.
+    3. `POST` to the upload's `finalize` endpoint to create the `Media` record.
+
+    Uploads that stop receiving data are deleted once their `expires` time passes.
+    """
+
+    serializer_class = MediaUploadSerializer
+    queryset = MediaUpload.objects
+    permission_classes = (IsAuthenticated,)
+    throttle_classes = (SlidingWindowThrottle,)
+    throttle_scope = 'media_uploads'
+
+    def get_queryset(self) -> Manager:
+        """Limit the returned uploads to those created by the requesting user"""
+
+        return self.queryset.filter(user=self.request.user.pk)
+
+    def check_tree_write_permission(self, tree_id: int) -> None:
+        """Raise an error if the requesting user does not have write permissions on a family tree
+
+        Args:
+            tree_id: Primary key of the family tree to check
+        """
+
+        role = tree_permissions.get_role(self.request, tree_id)
+        if role is None or role < tree_permissions.TreePermission.Role.WRITE:
+            raise PermissionDenied('You do not have write permissions on the requested family tree.')
+
+    def perform_create(self, serializer: MediaUploadSerializer) -> None:
+        """Validate the requested `Media` field values and create a new upload"""
+
+        tree = serializer.validated_data['tree']
+        self.check_tree_write_permission(tree.pk)
+
+        metadata = serializer.validated_data.get('metadata', dict())
+        MediaSerializer(data={**metadata, 'tree': tree.pk}, partial=True).is_valid(raise_exception=True)
+        serializer.save(user=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        """Return the upload status, including the current offset in the `Upload-Offset` header"""
+
+        response = super().retrieve(request, *args, **kwargs)
+        response['Upload-Offset'] = response.data['offset']
+        return response
+
+    def partial_update(self, request, pk: str = None) -> Response:
+        """Append a chunk of raw file data to the upload"""
+
+        try:
+            offset = int(request.headers['Upload-Offset'])
+
+        except (KeyError, ValueError):
+            return Response({'detail': 'A valid `Upload-Offset` header is required.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        upload = get_object_or_404(self.get_queryset(), pk=pk)
+        if request.stream is not None:
+            try:
+                receive_chunk(upload, offset, request.stream)
+
+            except UploadOffsetError as error:
+                return Response({'detail': str(error)}, status=status.HTTP_409_CONFLICT)
+
+            except ValueError as error:
+                return Response({'detail': str(error)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        return Response(status=status.HTTP_204_NO_CONTENT, headers={'Upload-Offset': str(upload.offset)})
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk: str = None) -> Response:
+        """Create a `Media` record from a completed upload"""
+
+        upload = self.get_object()
+        if upload.offset != upload.length:
+            return Response(
+                {'detail': f'Upload is incomplete ({upload.offset} of {upload.length} bytes received).'},
+                status=status.HTTP_409_CONFLICT)
+
+        self.check_tree_write_permission(upload.tree_id)
+        with transaction.atomic(), ChunkedUploadedFile(upload) as file:
+            data = {**upload.metadata, 'tree': upload.tree_id, 'blob': file}
+            serializer = MediaSerializer(data=data, context=self.get_serializer_context())
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            upload.delete()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 class NameViewSet(BaseRecordViewSet):
@@ -113,6 +329,13 @@ class NameViewSet(BaseRecordViewSet):
 
     serializer_class = NameSerializer
     queryset = Name.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'given_name': ('given_name', serializers.CharField()),
+        'surname': ('surname', serializers.CharField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'given_name', 'surname']
+    search_fields = ['given_name', 'surname']
 
 
 class PersonViewSet(BaseRecordViewSet):
@@ -120,6 +343,28 @@ class PersonViewSet(BaseRecordViewSet):
 
     serializer_class = PersonSerializer
     queryset = Person.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'sex': ('sex', serializers.ChoiceField(Person.Sex.choices)),
+        'given_name': ('primary_name__given_name', serializers.CharField()),
+        'surname': ('primary_name__surname', serializers.CharField()),
+        'family': ('families', serializers.IntegerField()),
+        'parent_family': ('parent_families', serializers.IntegerField()),
+        'born_after': ('birth__sort_date_max__gte', serializers.DateField()),
+        'born_before': ('birth__sort_date_min__lte', serializers.DateField()),
+        'born_within': ('birth__place__path__startswith', PlacePathField()),
+        'died_after': ('death__sort_date_max__gte', serializers.DateField()),
+        'died_before': ('death__sort_date_min__lte', serializers.DateField()),
+        'died_within': ('death__place__path__startswith', PlacePathField()),
+    }
+    ordering_fields = [
+        *BaseRecordViewSet.ordering_fields,
+        'primary_name__surname',
+        'primary_name__given_name',
+        'birth__sort_date_min',
+        'death__sort_date_min',
+    ]
+    search_fields = ['primary_name__given_name', 'primary_name__surname']
 
 
 class PlaceViewSet(BaseRecordViewSet):
@@ -127,6 +372,37 @@ class PlaceViewSet(BaseRecordViewSet):
 
     serializer_class = PlaceSerializer
     queryset = Place.objects
+    geo_fields = ('lat', 'long', 'geohash')
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'name': ('name', serializers.CharField()),
+        'place_type': ('place_type', serializers.CharField()),
+        'enclosed_by': ('enclosed_by', serializers.IntegerField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'name', 'place_type']
+    search_fields = ['name']
+
+    @action(detail=True, methods=['get'])
+    def within(self, request, pk: str = None) -> Response:
+        """Return all places enclosed by the place at any depth"""
+
+        place = self.get_object()
+        queryset = self.filter_queryset(self.get_queryset()) \
+            .filter(path__startswith=place.path) \
+            .exclude(pk=place.pk)
+
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    @action(detail=True, methods=['get'])
+    def hierarchy(self, request, pk: str = None) -> Response:
+        """Return all places enclosing the place, ordered from the outermost place"""
+
+        place = self.get_object()
+        queryset = self.get_queryset() \
+            .filter(pk__in=place.hierarchy.values('pk')) \
+            .order_by(Length('path'))
+
+        return Response(self.get_serializer(queryset, many=True).data)
 
 
 class RepositoryViewSet(BaseRecordViewSet):
@@ -134,6 +410,13 @@ class RepositoryViewSet(BaseRecordViewSet):
 
     serializer_class = RepositorySerializer
     queryset = Repository.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'type': ('type', serializers.CharField()),
+        'name': ('name', serializers.CharField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'name', 'type']
+    search_fields = ['name']
 
 
 class SourceViewSet(BaseRecordViewSet):
@@ -141,6 +424,13 @@ class SourceViewSet(BaseRecordViewSet):
 
     serializer_class = SourceSerializer
     queryset = Source.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        'title': ('title', serializers.CharField()),
+        'author': ('author', serializers.CharField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'title', 'author']
+    search_fields = ['title', 'author']
 
 
 class TagViewSet(BaseRecordViewSet):
@@ -148,6 +438,13 @@ class TagViewSet(BaseRecordViewSet):
 
     serializer_class = TagSerializer
     queryset = Tag.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        **_generic_relation_filters,
+        'name': ('name', serializers.CharField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'name']
+    search_fields = ['name']
 
 
 class URLViewSet(BaseRecordViewSet):
@@ -155,3 +452,11 @@ class URLViewSet(BaseRecordViewSet):
 
     serializer_class = URLSerializer
     queryset = URL.objects
+    filter_parameters = {
+        **BaseRecordViewSet.filter_parameters,
+        **_generic_relation_filters,
+        'repository': ('repository', serializers.IntegerField()),
+        'name': ('name', serializers.CharField()),
+    }
+    ordering_fields = [*BaseRecordViewSet.ordering_fields, 'name', 'last_accessed']
+    search_fields = ['name', 'href']
@@ -0,0 +1,62 @@
+"""
+The `jobs` application provides a lightweight, database backed queue for
+running long operations outside the request/response cycle. Jobs are stored
+in the application database and executed by a pool of worker processes
+started with the `run_jobs` management command. No external message broker
+is required.
+
+## Installation
+
+Add the application to the `installed_apps` list in the package settings:
+
+```python
+INSTALLED_APPS = [
+    'apps.jobs',
+]
+```
+
+Register application URLs in the package's primary URL configuration file:
+
+```python
+from django.urls import include, path
+
+urlpatterns = [
+    path('jobs/', include('apps.jobs.urls', namespace='jobs')),
+]
+```
+
+## Usage
+
+Any importable function accepting JSON serializable arguments can be run as
+a job. Functions may report their progress using `report_progress`, and
+their (JSON serializable) return value is stored as the job result.
+
+```python
+from apps.jobs.queue import enqueue, report_progress
+
+
+def count_to(limit: int) -> int:
+    for i in range(limit):
+        report_progress(i + 1, limit)
+
+    return limit
+
+
+job = enqueue(count_to, 100, user=request.user)
+```
+
+Recurring tasks are defined by the `JOB_SCHEDULE` setting, which maps the
+import path of a function to the time between runs. Each task is queued by
+the `run_jobs` command one interval after its previous run.
+
+```python
+JOB_SCHEDULE = {
+    'apps.authentication.sessions.clear_expired_sessions': timedelta(hours=24),
+}
+```
+
+The application also provides an outbox for delivering email in the
+background. Messages sent through the `apps.jobs.mail.QueuedEmailBackend`
+email backend are stored in the database and delivered by a background job
+using the backend defined by the `EMAIL_DELIVERY_BACKEND` setting.
+"""
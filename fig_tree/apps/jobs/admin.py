@@ -0,0 +1,48 @@
+"""
+The `admin` module defines custom administrative interfaces used by the
+website admin portal. Admin classes are used to extend and enhance the
+management of application settings by customizing the appearance, functionality,
+and permissions of admin portal interfaces.
+"""
+
+from django.conf import settings
+from django.contrib import admin
+from django.utils import timezone
+
+from .mail import deliver_outbox
+from .models import *
+from .queue import enqueue
+
+settings.JAZZMIN_SETTINGS['icons'].update({
+    'jobs.Job': 'fa fa-tasks',
+    'jobs.OutboundEmail': 'fa fa-envelope',
+})
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin interface for `Job` objects"""
+
+    list_display = ['task', 'user', 'status', 'progress', 'total', 'created', 'finished']
+    list_filter = ['status']
+    readonly_fields = ['started', 'finished']
+    search_fields = ['task', 'user__username']
+    ordering = ['-created']
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Admin interface for `OutboundEmail` objects"""
+
+    list_display = ['subject', 'to', 'status', 'attempts', 'next_attempt']
+    list_filter = ['status']
+    search_fields = ['subject', 'to']
+    ordering = ['next_attempt']
+    actions = ['retry_selected_emails']
+
+    @admin.action
+    def retry_selected_emails(self, request, queryset) -> None:
+        """Reset the delivery state of selected emails and schedule their delivery"""
+
+        queryset.update(status=OutboundEmail.Status.PENDING, attempts=0, next_attempt=timezone.now())
+        enqueue(deliver_outbox)
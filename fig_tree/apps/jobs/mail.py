@@ -0,0 +1,242 @@
+"""
+The `mail` module implements an outbox for sending email outside the
+request/response cycle.
+
+Messages sent through the `QueuedEmailBackend` are stored in the
+`OutboundEmail` table and delivered by a background job using the backend
+configured by the `EMAIL_DELIVERY_BACKEND` setting. Messages are delivered in
+batches over a single connection to the mail server. Failed deliveries are
+retried with an exponential backoff until `EMAIL_MAX_ATTEMPTS` is reached.
+Messages claimed by a worker that stops before finishing its batch are
+released for another attempt after `EMAIL_SEND_TIMEOUT`.
+"""
+
+from __future__ import annotations
+
+import base64
+import uuid
+from datetime import timedelta
+from email.mime.base import MIMEBase
+from typing import Sequence
+
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .models import *
+from .queue import enqueue
+
+__all__ = [
+    'QueuedEmailBackend',
+    'deliver_outbox',
+]
+
+# Delay before the first retry of a failed delivery, doubled after each attempt
+RETRY_DELAY = timedelta(minutes=1)
+
+
+def _serialize(message: EmailMessage) -> OutboundEmail:
+    """Convert an email message into an unsaved outbox record
+
+    Args:
+        message: The message to convert
+
+    Returns:
+        An `OutboundEmail` instance
+    """
+
+    attachments = []
+    for attachment in message.attachments:
+        if isinstance(attachment, MIMEBase):
+            raise ValueError('MIME attachments are not supported by the email queue.')
+
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+
+        attachments.append([filename, base64.b64encode(content).decode(), mimetype])
+
+    return OutboundEmail(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+        headers=message.extra_headers,
+        content_subtype=message.content_subtype,
+        alternatives=[list(alternative) for alternative in getattr(message, 'alternatives', [])],
+        attachments=attachments,
+    )
+
+
+def _deserialize(email: OutboundEmail, connection) -> EmailMultiAlternatives:
+    """Convert an outbox record back into an email message
+
+    Args:
+        email: The outbox record to convert
+        connection: The email backend used to send the message
+
+    Returns:
+        An email message
+    """
+
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        headers=email.headers,
+        alternatives=[tuple(alternative) for alternative in email.alternatives],
+        connection=connection,
+    )
+
+    message.content_subtype = email.content_subtype
+    for filename, content, mimetype in email.attachments:
+        message.attach(filename, base64.b64decode(content), mimetype)
+
+    return message
+
+
+def _schedule_delivery(when=None) -> None:
+    """Queue a delivery job unless one is already queued to run by the given time
+
+    Args:
+        when: The earliest time messages are due for delivery (defaults to immediately)
+    """
+
+    task = f'{deliver_outbox.__module__}.{deliver_outbox.__qualname__}'
+    queued = Job.objects.filter(task=task, status=Job.Status.PENDING)
+    if when is None:
+        queued = queued.filter(scheduled__isnull=True)
+
+    else:
+        queued = queued.filter(scheduled__lte=when)
+
+    if not queued.exists():
+        enqueue(deliver_outbox, scheduled=when)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Email backend that stores messages in the outbox for delivery in the background"""
+
+    def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        """Add messages to the outbox and schedule their delivery
+
+        Args:
+            email_messages: The messages to send
+
+        Returns:
+            The number of queued messages
+        """
+
+        records = [_serialize(message) for message in email_messages if message.recipients()]
+        if not records:
+            return 0
+
+        with transaction.atomic():
+            OutboundEmail.objects.bulk_create(records)
+            _schedule_delivery()
+
+        return len(records)
+
+
+def _claim_batch(batch_size: int) -> list[OutboundEmail]:
+    """Claim a batch of messages that are due for delivery
+
+    Claimed messages are held until `EMAIL_SEND_TIMEOUT` has passed, after
+    which they are assumed lost and released for another delivery attempt.
+
+    Args:
+        batch_size: The maximum number of messages to claim
+
+    Returns:
+        The claimed messages
+    """
+
+    now = timezone.now()
+    _release_expired_claims(now)
+
+    due = OutboundEmail.objects.filter(status=OutboundEmail.Status.PENDING, next_attempt__lte=now)
+    primary_keys = list(due.order_by('next_attempt').values_list('pk', flat=True)[:batch_size])
+
+    batch = uuid.uuid4()
+    due.filter(pk__in=primary_keys).update(
+        status=OutboundEmail.Status.SENDING, batch=batch, next_attempt=now + settings.EMAIL_SEND_TIMEOUT)
+
+    return list(OutboundEmail.objects.filter(batch=batch))
+
+
+def _release_expired_claims(now) -> None:
+    """Return messages abandoned mid-delivery to the outbox
+
+    Each abandoned claim counts as a failed delivery attempt.
+
+    Args:
+        now: The current time
+    """
+
+    expired = OutboundEmail.objects.filter(status=OutboundEmail.Status.SENDING, next_attempt__lte=now)
+    expired.filter(attempts__gte=settings.EMAIL_MAX_ATTEMPTS - 1).update(
+        status=OutboundEmail.Status.FAILED, attempts=F('attempts') + 1, error='Delivery timed out.')
+
+    expired.update(
+        status=OutboundEmail.Status.PENDING, attempts=F('attempts') + 1, error='Delivery timed out.', batch=None)
+
+
+def deliver_outbox() -> int:
+    """Deliver all messages in the outbox that are due for delivery
+
+    Messages are delivered over a single connection opened by the
+    `EMAIL_DELIVERY_BACKEND` backend. Delivered messages are removed from the
+    outbox. Failed messages are rescheduled for a later delivery attempt.
+
+    Returns:
+        The number of delivered messages
+    """
+
+    delivered = 0
+    connection = get_connection(settings.EMAIL_DELIVERY_BACKEND)
+    with connection:
+        while batch := _claim_batch(settings.EMAIL_BATCH_SIZE):
+            sent, failed = [], []
+            for email in batch:
+                try:
+                    connection.send_messages([_deserialize(email, connection)])
+
+                except Exception as exc:
+                    email.attempts += 1
+                    email.error = str(exc)
+                    failed.append(email)
+
+                    # Reset the connection in case the failure left it unusable
+                    connection.close()
+
+                else:
+                    sent.append(email.pk)
+
+            for email in failed:
+                email.next_attempt = timezone.now() + RETRY_DELAY * 2 ** (email.attempts - 1)
+                email.status = OutboundEmail.Status.PENDING
+                if email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                    email.status = OutboundEmail.Status.FAILED
+
+            OutboundEmail.objects.filter(pk__in=sent).delete()
+            OutboundEmail.objects.bulk_update(failed, ['attempts', 'error', 'next_attempt', 'status'])
+            delivered += len(sent)
+
+    # Schedule a later delivery for any messages awaiting a retry or held by another worker
+    retry = OutboundEmail.objects \
+        .filter(status__in=[OutboundEmail.Status.PENDING, OutboundEmail.Status.SENDING]) \
+        .aggregate(Min('next_attempt'))
+    if retry['next_attempt__min']:
+        _schedule_delivery(retry['next_attempt__min'])
+
+    return delivered
@@ -0,0 +1,189 @@
+"""
+A management command for executing queued background jobs. Pending jobs are
+claimed from the database and executed by a pool of worker processes. When
+running with a single worker, jobs are executed in the current process.
+
+Recurring tasks listed in the `JOB_SCHEDULE` setting are queued automatically
+while the command is running. A background thread records a heartbeat for
+the jobs being executed, and running jobs abandoned by other workers are
+marked as failed once their heartbeat expires.
+
+## Arguments
+
+| Argument        | Description                                                 |
+|-----------------|-------------------------------------------------------------|
+| --workers       | Number of worker processes [default: `JOB_WORKERS` setting] |
+| --poll-interval | Seconds to wait between checks for new jobs [default: 1]    |
+| --once          | Exit once all pending jobs have been executed               |
+"""
+
+import multiprocessing
+import threading
+import time
+from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from apps.jobs.queue import claim_job, record_heartbeat, run_job, schedule_periodic_jobs
+
+# Seconds between checks for recurring tasks that need to be queued
+SCHEDULE_CHECK_INTERVAL = 60
+
+
+def execute_job(job_id: str) -> None:
+    """Execute a claimed job and release any unusable or expired database connections
+
+    Args:
+      job_id: Primary key of the job to execute
+    """
+
+    try:
+        run_job(job_id)
+
+    finally:
+        close_old_connections()
+
+
+def send_heartbeats(job_ids: set[str], stop: threading.Event) -> None:
+    """Record heartbeats for running jobs until stopped
+
+    Heartbeats are recorded several times per `JOB_TIMEOUT` period.
+
+    Args:
+      job_ids: Primary keys of the jobs being executed by the current command
+      stop: Event signaling the command is exiting
+    """
+
+    interval = settings.JOB_TIMEOUT.total_seconds() / 4
+    try:
+        while not stop.wait(interval):
+            if running := list(job_ids):
+                record_heartbeat(running)
+
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """Execute jobs from the background job queue"""
+
+    help = 'Execute queued background jobs'
+
+    _next_schedule_check = 0
+
+    def schedule_jobs(self) -> None:
+        """Queue recurring tasks if the schedule has not been checked recently"""
+
+        if time.monotonic() >= self._next_schedule_check:
+            schedule_periodic_jobs()
+            self._next_schedule_check = time.monotonic() + SCHEDULE_CHECK_INTERVAL
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Define command-line arguments
+
+        Args:
+          parser: The parser instance to add arguments under
+        """
+
+        parser.add_argument('--workers', type=int, default=settings.JOB_WORKERS, help='Number of worker processes [default: `JOB_WORKERS` setting].')
+        parser.add_argument('--poll-interval', type=float, default=1, help='Seconds to wait between checks for new jobs [default: 1].')
+        parser.add_argument('--once', action='store_true', help='Exit once all pending jobs have been executed.')
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command execution.
+
+        Args:
+          *args: Additional positional arguments.
+          **options: Additional keyword arguments.
+        """
+
+        if options['workers'] < 1 or options['poll_interval'] <= 0:
+            raise CommandError('The number of workers and poll interval must be positive.')
+
+        self.stdout.write(self.style.SUCCESS(f'Starting job worker with {options["workers"]} process(es)...'))
+        self.running_jobs = set()
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=send_heartbeats, args=(self.running_jobs, stop), daemon=True)
+        heartbeat.start()
+
+        try:
+            if options['workers'] == 1:
+                executed = self.run_inline(options['poll_interval'], options['once'])
+
+            else:
+                executed = self.run_pool(options['workers'], options['poll_interval'], options['once'])
+
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        self.stdout.write(self.style.SUCCESS(f'Executed {executed} job(s).'))
+
+    def run_inline(self, poll_interval: float, once: bool) -> int:
+        """Execute jobs one at a time in the current process
+
+        Args:
+          poll_interval: Seconds to wait between checks for new jobs
+          once: Return once all pending jobs have been executed
+
+        Returns:
+          The number of executed jobs
+        """
+
+        executed = 0
+        while True:
+            self.schedule_jobs()
+            if job := claim_job():
+                self.stdout.write(f'Running job {job.pk} ({job.task})...')
+                self.running_jobs.add(job.pk)
+                execute_job(job.pk)
+                self.running_jobs.discard(job.pk)
+                executed += 1
+
+            elif once:
+                return executed
+
+            else:
+                time.sleep(poll_interval)
+
+    def run_pool(self, workers: int, poll_interval: float, once: bool) -> int:
+        """Execute jobs concurrently in a pool of worker processes
+
+        Worker processes are started using the `spawn` method so they do not
+        inherit database connections from the current process.
+
+        Args:
+          workers: The number of worker processes
+          poll_interval: Seconds to wait between checks for new jobs
+          once: Return once all pending jobs have been executed
+
+        Returns:
+          The number of executed jobs
+        """
+
+        executed, running = 0, dict()
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as executor:
+            while True:
+                self.schedule_jobs()
+                while len(running) < workers and (job := claim_job()):
+                    self.stdout.write(f'Running job {job.pk} ({job.task})...')
+                    self.running_jobs.add(job.pk)
+                    running[executor.submit(execute_job, job.pk)] = job.pk
+
+                if not running:
+                    if once:
+                        return executed
+
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.running_jobs.discard(running.pop(future))
+
+                executed += len(done)
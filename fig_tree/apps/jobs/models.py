@@ -0,0 +1,89 @@
+"""
+The `models` module uses data classes to define and interact with the
+application database schema. Each model class reflects the schema for a
+distinct database table and provides a high-level API to query and interact
+with table data.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+__all__ = ['Job', 'OutboundEmail']
+
+
+class Job(models.Model):
+    """A function call queued for execution by the background job workers"""
+
+    class Status(models.TextChoices):
+        """The execution state of a job"""
+
+        PENDING = 'pending', _('pending')
+        RUNNING = 'running', _('running')
+        COMPLETE = 'complete', _('complete')
+        FAILED = 'failed', _('failed')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+
+    # Values reported while the job is running
+    progress = models.PositiveBigIntegerField(default=0)
+    total = models.PositiveBigIntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+    scheduled = models.DateTimeField(null=True, blank=True, db_index=True)
+    started = models.DateTimeField(null=True, blank=True)
+    heartbeat = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """Return the job task and status"""
+
+        return f'{self.task} ({self.status})'
+
+
+class OutboundEmail(models.Model):
+    """An email message waiting in the outbox for delivery by the background job workers"""
+
+    class Status(models.TextChoices):
+        """The delivery state of a message"""
+
+        PENDING = 'pending', _('pending')
+        SENDING = 'sending', _('sending')
+        FAILED = 'failed', _('failed')
+
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list, blank=True)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    content_subtype = models.CharField(max_length=20, default='plain')
+    alternatives = models.JSONField(default=list, blank=True)
+    attachments = models.JSONField(default=list, blank=True)
+
+    # Delivery state
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+    batch = models.UUIDField(null=True, blank=True, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    error = models.TextField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        """Return the message subject and recipients"""
+
+        return f'{self.subject} ({", ".join(self.to)})'
@@ -0,0 +1,184 @@
+"""
+The `queue` module is used to submit jobs and execute them in worker
+processes.
+
+Jobs are identified by the import path of the function they execute and are
+claimed by workers using conditional `UPDATE` statements, guaranteeing each
+job is executed exactly once regardless of the database backend or the
+number of running workers.
+
+Workers periodically record a heartbeat for the jobs they are executing.
+Running jobs whose heartbeat expires, for example because the worker process
+was killed, are marked as failed so they no longer block their task from
+being scheduled.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from datetime import datetime
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import *
+
+__all__ = [
+    'claim_job',
+    'current_job_id',
+    'enqueue',
+    'reclaim_stale_jobs',
+    'record_heartbeat',
+    'report_progress',
+    'run_job',
+    'schedule_periodic_jobs',
+]
+
+logger = logging.getLogger(__name__)
+
+# Primary key of the job being executed by the current worker
+_current_job = contextvars.ContextVar('current_job', default=None)
+
+
+def enqueue(func: Callable, *args, user=None, scheduled: datetime | None = None, **kwargs) -> Job:
+    """Queue a function call for execution by the background job workers
+
+    The job is created as part of the current database transaction and is
+    only visible to workers once that transaction is committed.
+
+    Args:
+        func: An importable, module level function
+        *args: JSON serializable positional arguments for the function
+        user: The user the job is run on behalf of
+        scheduled: Do not execute the job before this time
+        **kwargs: JSON serializable keyword arguments for the function
+
+    Returns:
+        The queued job
+    """
+
+    task = f'{func.__module__}.{func.__qualname__}'
+    return Job.objects.create(task=task, args=list(args), kwargs=kwargs, user=user, scheduled=scheduled)
+
+
+def current_job_id() -> str | None:
+    """Return the primary key of the job being executed by the current worker, if any"""
+
+    return _current_job.get()
+
+
+def report_progress(progress: int, total: int | None = None) -> None:
+    """Record the progress of the job being executed by the current worker
+
+    Calls made outside a running job are ignored.
+
+    Args:
+        progress: The number of completed work items
+        total: The total number of work items, if known
+    """
+
+    if job_id := _current_job.get():
+        Job.objects.filter(pk=job_id).update(progress=progress, total=total, heartbeat=timezone.now())
+
+
+def record_heartbeat(job_ids: Iterable[str]) -> None:
+    """Record that the given jobs are still being executed by a live worker
+
+    Args:
+        job_ids: Primary keys of the running jobs
+    """
+
+    Job.objects.filter(pk__in=list(job_ids), status=Job.Status.RUNNING).update(heartbeat=timezone.now())
+
+
+def reclaim_stale_jobs() -> int:
+    """Mark running jobs without a recent heartbeat as failed
+
+    Jobs are considered stale once the `JOB_TIMEOUT` setting has elapsed
+    since their last heartbeat, or since they started if no heartbeat was
+    ever recorded.
+
+    Returns:
+        The number of failed jobs
+    """
+
+    now = timezone.now()
+    cutoff = now - settings.JOB_TIMEOUT
+    stale = Job.objects.filter(status=Job.Status.RUNNING) \
+        .filter(Q(heartbeat__lt=cutoff) | Q(heartbeat__isnull=True, started__lt=cutoff))
+    reclaimed = stale.update(
+        status=Job.Status.FAILED, error='The job worker stopped responding.', finished=now)
+
+    if reclaimed:
+        logger.warning('Marked %s stale job(s) as failed', reclaimed)
+
+    return reclaimed
+
+
+def schedule_periodic_jobs() -> list[Job]:
+    """Queue the next run of each task in the `JOB_SCHEDULE` setting
+
+    Tasks are scheduled to run one interval after their most recent run, or
+    one interval from now if they have never run. Tasks with a pending or
+    running job are skipped after any stale jobs have been reclaimed.
+
+    Returns:
+        The queued jobs
+    """
+
+    reclaim_stale_jobs()
+
+    queued = []
+    for task, interval in settings.JOB_SCHEDULE.items():
+        jobs = Job.objects.filter(task=task)
+        if jobs.filter(status__in=[Job.Status.PENDING, Job.Status.RUNNING]).exists():
+            continue
+
+        last_run = jobs.aggregate(Max('started'))['started__max'] or timezone.now()
+        queued.append(Job.objects.create(task=task, scheduled=last_run + interval))
+
+    return queued
+
+
+def claim_job() -> Job | None:
+    """Claim the oldest pending job for execution by the current worker
+
+    Jobs scheduled for a future time are not claimed.
+
+    Returns:
+        The claimed job or `None` if no jobs are pending
+    """
+
+    pending = Job.objects.filter(status=Job.Status.PENDING) \
+        .filter(Q(scheduled__isnull=True) | Q(scheduled__lte=timezone.now()))
+    while job_id := pending.order_by('created').values_list('pk', flat=True).first():
+        now = timezone.now()
+        if pending.filter(pk=job_id).update(status=Job.Status.RUNNING, started=now, heartbeat=now):
+            return Job.objects.get(pk=job_id)
+
+    return None
+
+
+def run_job(job_id: str) -> None:
+    """Execute a claimed job and store its result
+
+    Args:
+        job_id: Primary key of the job to execute
+    """
+
+    job = Job.objects.get(pk=job_id)
+    token = _current_job.set(job.pk)
+    try:
+        result = import_string(job.task)(*job.args, **job.kwargs)
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.COMPLETE, result=result, finished=timezone.now())
+
+    except Exception as exc:
+        logger.exception('Job %s (%s) failed', job.pk, job.task)
+        Job.objects.filter(pk=job.pk).update(status=Job.Status.FAILED, error=str(exc), finished=timezone.now())
+
+    finally:
+        _current_job.reset(token)
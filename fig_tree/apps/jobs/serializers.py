@@ -0,0 +1,22 @@
+"""
+The `serializers` module handles serializing/deserializing database models
+and query sets. Each serializer class defines which fields are included in the
+serialized output and handles the conversion of data types to and from their
+serialized representations. Serializers also ensure data integrate by handling
+data validation tasks as required by the relevant business domain.
+"""
+
+from rest_framework.serializers import ModelSerializer
+
+from .models import *
+
+__all__ = ['JobSerializer']
+
+
+class JobSerializer(ModelSerializer):
+    """Data serializer for the `Job` database model"""
+
+    class Meta:
+        model = Job
+        fields = ['id', 'status', 'progress', 'total', 'error', 'created', 'started', 'finished']
+        read_only_fields = fields
@@ -0,0 +1,102 @@
+"""Tests for the `mail` module."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, send_mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.jobs.mail import deliver_outbox
+from apps.jobs.models import Job, OutboundEmail
+from apps.jobs.queue import claim_job, run_job
+
+
+@override_settings(
+    EMAIL_BACKEND='apps.jobs.mail.QueuedEmailBackend',
+    EMAIL_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_MAX_ATTEMPTS=2)
+class QueuedEmailBackend(TestCase):
+    """Test emails are queued in the outbox and delivered by background jobs"""
+
+    def test_message_queued(self) -> None:
+        """Test sent messages are stored in the outbox instead of being delivered"""
+
+        send_mail('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        self.assertEqual(0, len(mail.outbox))
+        self.assertEqual(1, OutboundEmail.objects.count())
+        self.assertEqual(1, Job.objects.filter(status=Job.Status.PENDING).count())
+
+    def test_single_delivery_job(self) -> None:
+        """Test a single delivery job is queued for multiple messages"""
+
+        send_mail('First', 'Body', 'from@example.com', ['to@example.com'])
+        send_mail('Second', 'Body', 'from@example.com', ['to@example.com'])
+        self.assertEqual(1, Job.objects.count())
+
+    def test_message_delivered(self) -> None:
+        """Test queued messages are delivered intact and removed from the outbox"""
+
+        message = EmailMultiAlternatives('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        message.attach_alternative('<p>Body</p>', 'text/html')
+        message.attach('notes.txt', 'Attached', 'text/plain')
+        message.send()
+
+        run_job(claim_job().pk)
+        self.assertFalse(OutboundEmail.objects.exists())
+        self.assertEqual(1, len(mail.outbox))
+
+        delivered = mail.outbox[0]
+        self.assertEqual('Subject', delivered.subject)
+        self.assertEqual(['to@example.com'], delivered.to)
+        self.assertEqual([('<p>Body</p>', 'text/html')], delivered.alternatives)
+        self.assertEqual([('notes.txt', 'Attached', 'text/plain')], delivered.attachments)
+
+    def test_failed_delivery_retried(self) -> None:
+        """Test failed deliveries are rescheduled until the maximum number of attempts"""
+
+        send_mail('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('Refused')):
+            self.assertEqual(0, deliver_outbox())
+            email = OutboundEmail.objects.get()
+            self.assertEqual(OutboundEmail.Status.PENDING, email.status)
+            self.assertGreater(email.next_attempt, timezone.now())
+            self.assertTrue(Job.objects.filter(status=Job.Status.PENDING, scheduled=email.next_attempt).exists())
+
+            OutboundEmail.objects.update(next_attempt=timezone.now())
+            deliver_outbox()
+            email.refresh_from_db()
+            self.assertEqual(OutboundEmail.Status.FAILED, email.status)
+            self.assertEqual('Refused', email.error)
+
+    def test_abandoned_delivery_retried(self) -> None:
+        """Test messages claimed by a lost worker are released once their claim expires"""
+
+        send_mail('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        OutboundEmail.objects.update(status=OutboundEmail.Status.SENDING, next_attempt=timezone.now())
+
+        self.assertEqual(1, deliver_outbox())
+        self.assertEqual(1, len(mail.outbox))
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_abandoned_delivery_attempts_counted(self) -> None:
+        """Test expired claims count toward the maximum number of delivery attempts"""
+
+        send_mail('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        OutboundEmail.objects.update(status=OutboundEmail.Status.SENDING, attempts=1, next_attempt=timezone.now())
+
+        self.assertEqual(0, deliver_outbox())
+        email = OutboundEmail.objects.get()
+        self.assertEqual(OutboundEmail.Status.FAILED, email.status)
+        self.assertEqual(2, email.attempts)
+
+    def test_active_claim_not_released(self) -> None:
+        """Test messages claimed by a running worker are not delivered twice"""
+
+        send_mail('Subject', 'Body', 'from@example.com', ['to@example.com'])
+        OutboundEmail.objects.update(
+            status=OutboundEmail.Status.SENDING, next_attempt=timezone.now() + timedelta(minutes=5))
+
+        self.assertEqual(0, deliver_outbox())
+        self.assertEqual(OutboundEmail.Status.SENDING, OutboundEmail.objects.get().status)
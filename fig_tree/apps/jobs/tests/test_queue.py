@@ -0,0 +1,157 @@
+"""Tests for the `queue` module and the `run_jobs` management command."""
+
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.jobs.models import Job
+from apps.jobs.queue import (
+    claim_job, enqueue, reclaim_stale_jobs, record_heartbeat, report_progress, run_job, schedule_periodic_jobs
+)
+
+
+def count_to(limit: int) -> int:
+    """Report progress toward the given limit and return it"""
+
+    for i in range(limit):
+        report_progress(i + 1, limit)
+
+    return limit
+
+
+def fail() -> None:
+    """Raise an error"""
+
+    raise ValueError('Something went wrong')
+
+
+class JobExecution(TestCase):
+    """Test the claiming and execution of queued jobs"""
+
+    def test_result_stored(self) -> None:
+        """Test the return value and progress of a completed job are stored"""
+
+        job = enqueue(count_to, 3)
+        run_job(claim_job().pk)
+        job.refresh_from_db()
+
+        self.assertEqual(Job.Status.COMPLETE, job.status)
+        self.assertEqual(3, job.result)
+        self.assertEqual((3, 3), (job.progress, job.total))
+        self.assertIsNotNone(job.finished)
+
+    def test_failure_recorded(self) -> None:
+        """Test errors raised by a job are recorded"""
+
+        job = enqueue(fail)
+        with self.assertLogs('apps.jobs.queue', 'ERROR'):
+            run_job(claim_job().pk)
+
+        job.refresh_from_db()
+
+        self.assertEqual(Job.Status.FAILED, job.status)
+        self.assertEqual('Something went wrong', job.error)
+
+    def test_jobs_claimed_once(self) -> None:
+        """Test jobs are claimed in submission order and only once"""
+
+        first = enqueue(count_to, 1)
+        second = enqueue(count_to, 2)
+
+        self.assertEqual(first.pk, claim_job().pk)
+        self.assertEqual(second.pk, claim_job().pk)
+        self.assertIsNone(claim_job())
+
+    def test_progress_outside_job(self) -> None:
+        """Test progress reports outside a running job are ignored"""
+
+        self.assertEqual(2, count_to(2))
+
+
+@override_settings(JOB_SCHEDULE={'apps.jobs.tests.test_queue.fail': timedelta(hours=1)})
+class PeriodicJobs(TestCase):
+    """Test the scheduling of recurring tasks"""
+
+    def test_first_run_scheduled(self) -> None:
+        """Test tasks that have never run are scheduled one interval from now"""
+
+        job, = schedule_periodic_jobs()
+        self.assertEqual('apps.jobs.tests.test_queue.fail', job.task)
+        self.assertAlmostEqual(
+            (timezone.now() + timedelta(hours=1)).timestamp(), job.scheduled.timestamp(), delta=5)
+
+        self.assertIsNone(claim_job())
+
+    def test_queued_task_skipped(self) -> None:
+        """Test tasks are not queued again while a run is pending"""
+
+        schedule_periodic_jobs()
+        self.assertEqual([], schedule_periodic_jobs())
+        self.assertEqual(1, Job.objects.count())
+
+    def test_next_run_follows_last_run(self) -> None:
+        """Test the next run is scheduled one interval after the most recent run"""
+
+        started = timezone.now() - timedelta(hours=3)
+        Job.objects.create(task='apps.jobs.tests.test_queue.fail', status=Job.Status.FAILED, started=started)
+
+        job, = schedule_periodic_jobs()
+        self.assertEqual(started + timedelta(hours=1), job.scheduled)
+        self.assertEqual(job.pk, claim_job().pk)
+
+
+@override_settings(JOB_TIMEOUT=timedelta(minutes=10))
+class StaleJobs(TestCase):
+    """Test running jobs abandoned by their worker are reclaimed"""
+
+    def setUp(self) -> None:
+        """Create a running job with a heartbeat older than the timeout"""
+
+        last_seen = timezone.now() - timedelta(minutes=11)
+        self.job = Job.objects.create(
+            task='apps.jobs.tests.test_queue.count_to', status=Job.Status.RUNNING, started=last_seen, heartbeat=last_seen)
+
+    def test_stale_job_failed(self) -> None:
+        """Test running jobs without a recent heartbeat are marked as failed"""
+
+        self.assertEqual(1, reclaim_stale_jobs())
+        self.job.refresh_from_db()
+        self.assertEqual(Job.Status.FAILED, self.job.status)
+        self.assertIsNotNone(self.job.finished)
+
+    def test_heartbeat_keeps_job_running(self) -> None:
+        """Test jobs with a recent heartbeat are not reclaimed"""
+
+        record_heartbeat([self.job.pk])
+        self.assertEqual(0, reclaim_stale_jobs())
+        self.job.refresh_from_db()
+        self.assertEqual(Job.Status.RUNNING, self.job.status)
+
+    def test_missing_heartbeat_uses_start_time(self) -> None:
+        """Test jobs without any heartbeat are reclaimed based on their start time"""
+
+        Job.objects.filter(pk=self.job.pk).update(heartbeat=None)
+        self.assertEqual(1, reclaim_stale_jobs())
+
+    @override_settings(JOB_SCHEDULE={'apps.jobs.tests.test_queue.count_to': timedelta(hours=1)})
+    def test_stale_job_rescheduled(self) -> None:
+        """Test recurring tasks are scheduled again once their stale job is reclaimed"""
+
+        job, = schedule_periodic_jobs()
+        self.assertEqual(self.job.task, job.task)
+        self.assertEqual(Job.Status.PENDING, job.status)
+
+
+class RunJobsCommand(TestCase):
+    """Test the `run_jobs` management command"""
+
+    def test_pending_jobs_executed(self) -> None:
+        """Test all pending jobs are executed when running with the `--once` option"""
+
+        enqueue(count_to, 1)
+        enqueue(count_to, 2)
+        call_command('run_jobs', '--workers', '1', '--once', stdout=io.StringIO())
+        self.assertEqual(2, Job.objects.filter(status=Job.Status.COMPLETE).count())
@@ -0,0 +1,51 @@
+"""Tests for the job monitoring endpoints."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.jobs.queue import claim_job, enqueue, run_job
+from .test_queue import count_to
+
+
+class JobViewSet(TestCase):
+    """Test the `JobViewSet` endpoints"""
+
+    def setUp(self) -> None:
+        """Create a job submitted by a test user"""
+
+        self.user = get_user_model().objects.create_user(
+            username='test_user', email='test@user.com', password='foo', is_active=True)
+
+        self.job = enqueue(count_to, 5, user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_progress(self) -> None:
+        """Test the job status and progress are returned"""
+
+        response = self.client.get(reverse('jobs:job-detail', args=[self.job.pk]))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('pending', response.data['status'])
+
+    def test_result(self) -> None:
+        """Test results are only returned for completed jobs"""
+
+        url = reverse('jobs:job-result', args=[self.job.pk])
+        self.assertEqual(409, self.client.get(url).status_code)
+
+        run_job(claim_job().pk)
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(5, response.data)
+
+    def test_other_users(self) -> None:
+        """Test users cannot view jobs submitted by other users"""
+
+        other_user = get_user_model().objects.create_user(
+            username='other_user', email='other@user.com', password='foo', is_active=True)
+
+        self.client.force_authenticate(other_user)
+        response = self.client.get(reverse('jobs:job-detail', args=[self.job.pk]))
+        self.assertEqual(404, response.status_code)
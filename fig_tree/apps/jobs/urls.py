@@ -0,0 +1,23 @@
+"""
+The `urls` module maps URL endpoints to django views defined in the parent
+application. For root level URL routing, see the project level `urls` module.
+View objects can be found in the `views` module.
+
+# URL Routing Configuration
+
+| URL                | View / View Set | Name         |
+|--------------------|-----------------|--------------|
+| ``                 | `JobViewSet`    | `job-list`   |
+| `<str:pk>/`        | `JobViewSet`    | `job-detail` |
+| `<str:pk>/result/` | `JobViewSet`    | `job-result` |
+"""
+
+from rest_framework import routers
+
+from .views import *
+
+app_name = 'jobs'
+
+router = routers.SimpleRouter()
+router.register(r'', JobViewSet)
+urlpatterns = router.urls
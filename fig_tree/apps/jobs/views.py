@@ -0,0 +1,46 @@
+"""
+The `views` module defines classes for rendering templates based on incoming
+HTTP requests. View classes are responsible for processing form/request data,
+interacting with database models/serializers, managing application business
+logic, and returning rendered HTTP responses.
+
+Whenever possible, generic base classes are used to implement common behavior
+for HTTP request handling.
+"""
+
+from django.db.models import QuerySet
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .models import *
+from .serializers import *
+
+__all__ = ['JobViewSet']
+
+
+class JobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """ViewSet for monitoring the progress of `Job` records"""
+
+    serializer_class = JobSerializer
+    queryset = Job.objects
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self) -> QuerySet:
+        """Return the filtered queryset used by the API endpoint to execute DB queries
+
+        Records are only returned for jobs submitted on behalf of the requesting user.
+        """
+
+        return self.queryset.filter(user=self.request.user.pk).order_by('-created')
+
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk: str = None) -> Response:
+        """Return the value returned by a completed job"""
+
+        job = self.get_object()
+        if job.status != Job.Status.COMPLETE:
+            return Response({'detail': f'Job is {job.status}.'}, status=status.HTTP_409_CONFLICT)
+
+        return Response(job.result)
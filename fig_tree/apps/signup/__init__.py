@@ -8,6 +8,7 @@ Application features include:
 - An extended user database model with additional fields and functionality.
 - User account management via customized administrative interfaces in the website admin portal.
 - Account verification email confirmation requests.
+- Periodic removal of accounts that are never activated (see the `cleanup` module).
 
 ## Installation
 
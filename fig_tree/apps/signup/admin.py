@@ -32,7 +32,7 @@ class AuthUserAdmin(UserAdmin):
     def activate_selected_users(self, request, queryset) -> None:
         """Mark selected users as active"""
 
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, pending_activation=False)
 
     @admin.action
     def deactivate_selected_users(self, request, queryset) -> None:
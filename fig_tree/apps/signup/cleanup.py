@@ -0,0 +1,62 @@
+"""
+The `cleanup` module removes user accounts that were never activated.
+
+Accounts created through the signup form are inactive until the user follows
+the link in their activation email. Accounts that are still awaiting
+activation, and have never been logged into, `SIGNUP_ACTIVATION_DAYS` after
+they were created are deleted. Accounts created by staff (e.g., through the
+admin or bulk provisioning) are never deleted. Accounts are
+deleted in batches of primary keys, with each batch committed separately, so
+rows are never locked for longer than a single batch. The cleanup is run
+periodically by the background job workers (see the `JOB_SCHEDULE` setting).
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.jobs.queue import report_progress
+from .models import AuthUser
+
+__all__ = ['delete_unactivated_users', 'unactivated_users']
+
+CHUNK_SIZE = 1000
+
+
+def unactivated_users() -> QuerySet:
+    """Return accounts that were not activated within the activation period
+
+    Returns:
+        A queryset of `AuthUser` records
+    """
+
+    cutoff = timezone.now() - settings.SIGNUP_ACTIVATION_PERIOD
+    return AuthUser.objects.filter(
+        pending_activation=True, is_active=False, last_login__isnull=True, is_staff=False, date_joined__lt=cutoff)
+
+
+def delete_unactivated_users(chunk_size: int = CHUNK_SIZE) -> int:
+    """Delete accounts that were not activated within the activation period
+
+    When run as a background job, progress is reported after each batch.
+
+    Args:
+        chunk_size: The number of accounts deleted per transaction
+
+    Returns:
+        The number of deleted accounts
+    """
+
+    expired = unactivated_users()
+    total = expired.count()
+    deleted = 0
+    while primary_keys := list(expired.order_by('pk').values_list('pk', flat=True)[:chunk_size]):
+        # Accounts activated since the batch was selected are skipped
+        with transaction.atomic():
+            _, counts = expired.filter(pk__in=primary_keys).delete()
+
+        deleted += counts.get(AuthUser._meta.label, 0)
+        report_progress(deleted, max(deleted, total))
+
+    return deleted
@@ -0,0 +1,71 @@
+"""
+A management command for creating user accounts and family tree permissions
+in bulk from a CSV or JSON file. See the `provisioning` module for the
+supported file layout.
+
+## Arguments
+
+| Argument     | Description                                                   |
+|--------------|---------------------------------------------------------------|
+| path         | Path of a CSV or JSON file defining the users to create       |
+| --format     | The file format [default: inferred from the file extension]   |
+| --workers    | Number of password hashing processes [default: CPU count]     |
+| --batch-size | Number of records inserted per database query [default: 1000] |
+"""
+
+import os
+from argparse import ArgumentParser
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.signup.provisioning import parse_users, provision_users
+
+
+class Command(BaseCommand):
+    """Create user accounts in bulk"""
+
+    help = 'Create user accounts and family tree permissions from a CSV or JSON file'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Define command-line arguments
+
+        Args:
+          parser: The parser instance to add arguments under
+        """
+
+        parser.add_argument('path', type=Path, help='Path of a CSV or JSON file defining the users to create.')
+        parser.add_argument('--format', choices=['csv', 'json'], help='The file format [default: inferred from the file extension].')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of password hashing processes [default: CPU count].')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of records inserted per database query [default: 1000].')
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command execution.
+
+        Args:
+          *args: Additional positional arguments.
+          **options: Additional keyword arguments.
+        """
+
+        path = options['path']
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('The number of workers and batch size must be positive integers.')
+
+        try:
+            with path.open(newline='', encoding='utf-8-sig') as file:
+                users = parse_users(file, file_format)
+
+            created = provision_users(users, workers=options['workers'], batch_size=options['batch_size'])
+
+        except OSError as exc:
+            raise CommandError(f'Could not read {path}: {exc}')
+
+        except UnicodeDecodeError:
+            raise CommandError(f'Could not read {path}: The file is not UTF-8 encoded.')
+
+        except ValidationError as exc:
+            raise CommandError('\n'.join(exc.messages))
+
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} users.'))
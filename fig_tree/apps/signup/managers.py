@@ -6,16 +6,48 @@ default querying capabilities and to facilitate common data retrieval tasks.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Iterable
 
+import django
 from django.contrib import auth
 from django.contrib.auth import base_user
+from django.contrib.auth.hashers import make_password
 from django.core import validators
 
 if TYPE_CHECKING:  # Protect against circular import
     from .models import AuthUser
 
-__all__ = ['AuthUserManager']
+__all__ = ['AuthUserManager', 'hash_passwords']
+
+# Minimum number of passwords worth distributing across worker processes
+PARALLEL_HASH_THRESHOLD = 100
+
+
+def hash_passwords(passwords: Iterable[str | None], workers: int = 1) -> list[str]:
+    """Hash a collection of raw passwords, optionally in parallel worker processes
+
+    Worker processes are started using the `spawn` method so they do not
+    inherit database connections from the current process. Passwords of
+    `None` are converted into unusable passwords.
+
+    Args:
+        passwords: The raw passwords to hash
+        workers: The number of worker processes to use
+
+    Returns:
+        The hashed passwords in the same order as the input
+    """
+
+    passwords = list(passwords)
+    if workers <= 1 or len(passwords) < PARALLEL_HASH_THRESHOLD:
+        return list(map(make_password, passwords))
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as executor:
+        chunk_size = max(1, len(passwords) // (workers * 4))
+        return list(executor.map(make_password, passwords, chunksize=chunk_size))
 
 
 class AuthUserManager(auth.base_user.BaseUserManager):
@@ -37,6 +69,38 @@ class AuthUserManager(auth.base_user.BaseUserManager):
         user.save()
         return user
 
+    @staticmethod
+    def bulk_create_users(
+        users: Iterable[dict], workers: int = 1, batch_size: int = 1000, hashed: bool = False
+    ) -> list[AuthUser]:
+        """Create multiple users using bulk database inserts
+
+        Each user is defined by a dictionary of model field values including a
+        raw `password` value. Users without a password are assigned an
+        unusable password. Model signals are not sent for the created users.
+
+        Args:
+            users: Field values for each user to create
+            workers: Number of worker processes used to hash passwords
+            batch_size: Number of users inserted per database query
+            hashed: Whether the given `password` values are already hashed
+
+        Returns:
+            The created users
+        """
+
+        users = [dict(user) for user in users]
+        for user in users:
+            validators.validate_email(user.get('email', ''))
+
+        passwords = [user.pop('password', None) for user in users]
+        if not hashed:
+            passwords = hash_passwords(passwords, workers)
+
+        user_model = auth.get_user_model()
+        records = [user_model(password=password, **user) for user, password in zip(users, passwords)]
+        return user_model.objects.bulk_create(records, batch_size=batch_size)
+
     @classmethod
     def create_staff_user(cls, username: str, password: str, email: str, **extra_fields) -> AuthUser:
         """Create a new staff user with the given email and password"""
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signup', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='authuser',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['date_joined'], name='signup_inactive_joined_idx'),
+        ),
+    ]
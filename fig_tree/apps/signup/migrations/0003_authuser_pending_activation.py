@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signup', '0002_inactive_user_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authuser',
+            name='pending_activation',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
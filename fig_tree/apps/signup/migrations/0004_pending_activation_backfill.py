@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:31
+
+from django.db import migrations, models
+
+
+def mark_pending_activation(apps, schema_editor):
+    """Flag existing accounts that were created through sign up and never activated"""
+
+    AuthUser = apps.get_model('signup', 'AuthUser')
+    AuthUser.objects \
+        .filter(is_active=False, last_login__isnull=True, is_staff=False) \
+        .update(pending_activation=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signup', '0003_authuser_pending_activation'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_pending_activation, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='authuser',
+            name='signup_inactive_joined_idx',
+        ),
+        migrations.AddIndex(
+            model_name='authuser',
+            index=models.Index(condition=models.Q(('pending_activation', True)), fields=['date_joined'], name='signup_pending_joined_idx'),
+        ),
+    ]
@@ -21,6 +21,10 @@ class AuthUser(auth.models.AbstractBaseUser, auth.models.PermissionsMixin):
 
     class Meta:
         verbose_name = 'User'
+        indexes = [
+            # Supports the periodic deletion of accounts that are never activated
+            models.Index(fields=['date_joined'], condition=models.Q(pending_activation=True), name='signup_pending_joined_idx'),
+        ]
 
     USERNAME_FIELD = 'username'
     EMAIL_FIELD = 'email'
@@ -33,4 +37,7 @@ class AuthUser(auth.models.AbstractBaseUser, auth.models.PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_super_user = models.BooleanField(default=False)
 
+    # Set for self-registered accounts until they are activated from the activation email
+    pending_activation = models.BooleanField(default=False, editable=False)
+
     objects = AuthUserManager()
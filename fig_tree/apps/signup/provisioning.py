@@ -0,0 +1,275 @@
+"""
+The `provisioning` module creates user accounts and family tree permissions
+in bulk (e.g., when onboarding an entire class or society at once).
+
+User definitions can be loaded from CSV or JSON. CSV files use the columns
+listed below, where tree roles are given as a semicolon delimited list of
+`<tree id>:<role>` pairs (e.g., `12:write;15:read`). JSON files contain a list
+of objects with the same keys, where `trees` maps tree ids to role names.
+
+| Column      | Required | Description                                                |
+|-------------|----------|------------------------------------------------------------|
+| `username`  | Yes      | Unique account username                                    |
+| `email`     | Yes      | Unique account email address                               |
+| `password`  | No       | Raw account password [default: unusable password]          |
+| `is_active` | No       | Whether the account is active [default: `true`]            |
+| `trees`     | No       | Family tree roles (`read`, `private`, `write`, or `admin`) |
+
+User definitions submitted through the API are validated and their passwords
+hashed immediately (see `hash_user_passwords`). Accounts are then created by a
+background job (see `provision_users_job`), so raw passwords are never written
+to the job queue.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections import Counter
+from typing import IO, Iterable
+
+from django.core import validators
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.jobs.models import Job
+from apps.jobs.queue import current_job_id
+from .managers import hash_passwords
+from .models import AuthUser
+
+__all__ = [
+    'hash_user_passwords',
+    'normalize_users',
+    'parse_users',
+    'provision_users',
+    'provision_users_job',
+    'validate_users',
+]
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+ROLES = {str(label): value for value, label in TreePermission.Role.choices}
+
+
+def _parse_role(tree_id, role) -> tuple[int, int]:
+    """Convert a tree id and role name into integer values"""
+
+    if str(role).lower() not in ROLES:
+        raise ValidationError(f'Invalid tree role "{role}". Choose from {", ".join(ROLES)}.')
+
+    try:
+        return int(tree_id), ROLES[str(role).lower()]
+
+    except ValueError:
+        raise ValidationError(f'Invalid tree id "{tree_id}".')
+
+
+def _parse_row(row: dict) -> dict:
+    """Normalize a single user definition"""
+
+    trees = row.get('trees') or dict()
+    if isinstance(trees, str):
+        trees = dict(pair.split(':', 1) for pair in trees.split(';') if pair.strip())
+
+    is_active = row.get('is_active')
+    if is_active is None or not str(is_active).strip():
+        is_active = True
+
+    elif isinstance(is_active, str):
+        is_active = is_active.strip().lower() in TRUE_VALUES
+
+    return {
+        'username': (row.get('username') or '').strip(),
+        'email': (row.get('email') or '').strip(),
+        'password': row.get('password') or None,
+        'is_active': bool(is_active),
+        'trees': dict(_parse_role(tree_id, role) for tree_id, role in trees.items()),
+    }
+
+
+def parse_users(data: IO | str, file_format: str) -> list[dict]:
+    """Load user definitions from CSV or JSON data
+
+    Args:
+        data: A file object or string containing user definitions
+        file_format: The data format (`csv` or `json`)
+
+    Returns:
+        A list of normalized user definitions
+
+    Raises:
+        ValidationError: If the data cannot be parsed
+    """
+
+    if isinstance(data, str):
+        data = io.StringIO(data)
+
+    if file_format == 'csv':
+        rows = list(csv.DictReader(data))
+
+    elif file_format == 'json':
+        try:
+            rows = json.load(data)
+
+        except json.JSONDecodeError as exc:
+            raise ValidationError(f'Invalid JSON: {exc}')
+
+    else:
+        raise ValidationError(f'Unsupported file format "{file_format}".')
+
+    return normalize_users(rows)
+
+
+def normalize_users(rows) -> list[dict]:
+    """Normalize user definitions loaded from CSV or JSON data
+
+    Args:
+        rows: A list of dictionaries defining each user
+
+    Returns:
+        A list of normalized user definitions
+
+    Raises:
+        ValidationError: If any user definition cannot be parsed
+    """
+
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValidationError('User data must be a list of objects.')
+
+    errors, users = [], []
+    for line, row in enumerate(rows, start=1):
+        try:
+            users.append(_parse_row(row))
+
+        except (ValidationError, ValueError, AttributeError) as exc:
+            errors.append(f'User {line}: {"; ".join(getattr(exc, "messages", [str(exc)]))}')
+
+    if errors:
+        raise ValidationError(errors)
+
+    return users
+
+
+def validate_users(users: list[dict]) -> None:
+    """Check normalized user definitions for conflicts with each other or with existing records
+
+    Usernames and email addresses are compared case-insensitively.
+
+    Args:
+        users: Normalized user definitions as returned by `parse_users`
+
+    Raises:
+        ValidationError: If any user definition is invalid
+    """
+
+    errors = []
+    for line, user in enumerate(users, start=1):
+        try:
+            validators.validate_email(user['email'])
+
+        except ValidationError:
+            errors.append(f'User {line}: Invalid email address "{user["email"]}".')
+
+    for field in ('username', 'email'):
+        values = [user[field] for user in users]
+        if missing := values.count(''):
+            errors.append(f'{missing} user(s) are missing a {field}.')
+
+        counts = Counter(value.lower() for value in values if value)
+        if duplicates := sorted(value for value, count in counts.items() if count > 1):
+            errors.append(f'Duplicate {field} values: {", ".join(duplicates)}.')
+
+        existing = AuthUser.objects.alias(lowered=Lower(field)).filter(lowered__in=list(counts))
+        if existing := list(existing.values_list(field, flat=True)):
+            errors.append(f'Existing {field} values: {", ".join(sorted(existing))}.')
+
+    tree_ids = {tree_id for user in users for tree_id in user['trees']}
+    if missing_trees := tree_ids - set(FamilyTree.objects.filter(pk__in=tree_ids).values_list('pk', flat=True)):
+        errors.append(f'Unknown family trees: {", ".join(map(str, sorted(missing_trees)))}.')
+
+    if errors:
+        raise ValidationError(errors)
+
+
+def hash_user_passwords(users: list[dict], workers: int = 1) -> list[dict]:
+    """Replace raw passwords in normalized user definitions with password hashes
+
+    Args:
+        users: Normalized user definitions as returned by `parse_users`
+        workers: Number of worker processes used to hash passwords
+
+    Returns:
+        Copies of the user definitions with hashed passwords
+    """
+
+    passwords = hash_passwords((user['password'] for user in users), workers)
+    return [{**user, 'password': password} for user, password in zip(users, passwords)]
+
+
+def provision_users(
+    users: Iterable[dict], workers: int = 1, batch_size: int = 1000, hashed: bool = False
+) -> list[AuthUser]:
+    """Create user accounts and their family tree permissions in bulk
+
+    All users are created in a single transaction. No records are created if
+    any user definition is invalid.
+
+    Args:
+        users: Normalized user definitions as returned by `parse_users`
+        workers: Number of worker processes used to hash passwords
+        batch_size: Number of records inserted per database query
+        hashed: Whether user passwords are already hashed (see `hash_user_passwords`)
+
+    Returns:
+        The created users
+
+    Raises:
+        ValidationError: If any user definition is invalid
+    """
+
+    users = list(users)
+    validate_users(users)
+
+    with transaction.atomic():
+        created = AuthUser.objects.bulk_create_users(
+            (
+                {key: value for key, value in user.items() if key != 'trees'}
+                for user in users
+            ),
+            workers=workers,
+            batch_size=batch_size,
+            hashed=hashed)
+
+        TreePermission.objects.bulk_create(
+            (
+                TreePermission(user_id=record.pk, tree_id=tree_id, role=role)
+                for record, user in zip(created, users)
+                for tree_id, role in user['trees'].items()
+            ),
+            batch_size=batch_size)
+
+    return created
+
+
+def provision_users_job(users: list[dict]) -> dict:
+    """Create user accounts from a background job
+
+    Passwords must be hashed before the job is queued. The password hashes are
+    removed from the job arguments once the job has finished.
+
+    Args:
+        users: User definitions with hashed passwords (see `hash_user_passwords`)
+
+    Returns:
+        The number of created users
+    """
+
+    try:
+        created = provision_users(normalize_users(users), hashed=True)
+
+    finally:
+        Job.objects.filter(pk=current_job_id()).update(args=[])
+
+    return {'created': len(created)}
@@ -0,0 +1,68 @@
+"""Tests for the `delete_unactivated_users` function"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.signup.cleanup import delete_unactivated_users
+from apps.signup.models import AuthUser
+
+
+class DeleteUnactivatedUsers(TestCase):
+    """Test the deletion of accounts that were never activated"""
+
+    def create_user(self, username: str, age: timedelta, **kwargs) -> AuthUser:
+        """Create a user account that was created the given amount of time ago"""
+
+        return AuthUser.objects.create_user(
+            username=username,
+            email=f'{username}@user.com',
+            password='foo',
+            date_joined=timezone.now() - age,
+            **{'pending_activation': True, **kwargs})
+
+    def setUp(self) -> None:
+        """Create accounts on either side of the activation period"""
+
+        expired = settings.SIGNUP_ACTIVATION_PERIOD + timedelta(days=1)
+        self.expired = [self.create_user(f'expired{i}', expired) for i in range(3)]
+        self.pending = self.create_user('pending', timedelta(days=1))
+        self.active = self.create_user('active', expired, is_active=True)
+        self.deactivated = self.create_user('deactivated', expired, last_login=timezone.now())
+        self.provisioned = self.create_user('provisioned', expired, pending_activation=False)
+
+    def test_expired_accounts_deleted(self) -> None:
+        """Test only inactive accounts older than the activation period are deleted"""
+
+        self.assertEqual(3, delete_unactivated_users(chunk_size=2))
+        self.assertQuerySetEqual(
+            AuthUser.objects.order_by('username').values_list('username', flat=True),
+            ['active', 'deactivated', 'pending', 'provisioned'])
+
+    def test_activated_accounts_skipped(self) -> None:
+        """Test accounts activated after being selected for deletion are not deleted"""
+
+        original_delete = QuerySet.delete
+
+        def activate_then_delete(queryset):
+            AuthUser.objects.filter(username='expired0').update(is_active=True)
+            return original_delete(queryset)
+
+        with patch.object(QuerySet, 'delete', activate_then_delete):
+            self.assertEqual(2, delete_unactivated_users())
+
+        self.assertTrue(AuthUser.objects.filter(username='expired0').exists())
+
+    def test_related_records_deleted(self) -> None:
+        """Test records referencing deleted accounts are removed"""
+
+        tree = FamilyTree.objects.create(tree_name='tree')
+        TreePermission.objects.create(tree=tree, user=self.expired[0], role=TreePermission.Role.READ)
+
+        delete_unactivated_users()
+        self.assertFalse(TreePermission.objects.exists())
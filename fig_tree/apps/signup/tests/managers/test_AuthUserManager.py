@@ -1,9 +1,13 @@
 """Tests for the `AuthUserManager` class."""
 
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import check_password
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
-from apps.signup.managers import AuthUserManager
+from apps.signup.managers import AuthUserManager, hash_passwords
+from apps.signup.models import AuthUser
 
 
 class CreateUser(TestCase):
@@ -88,3 +92,36 @@ class CreateSuperUser(TestCase):
         new_user = AuthUserManager.create_superuser(**user_data)
         self.assertEqual(new_user.username, user_data['username'])
         self.assertEqual(new_user.email, user_data['email'])
+
+
+class BulkCreateUsers(TestCase):
+    """Tests for the bulk creation of new users"""
+
+    def test_passwords_hashed(self) -> None:
+        """Test user passwords are hashed and users without a password cannot log in"""
+
+        users = AuthUserManager.bulk_create_users([
+            dict(username='user1', email='user1@user.com', password='foo'),
+            dict(username='user2', email='user2@user.com'),
+        ])
+
+        self.assertTrue(users[0].check_password('foo'))
+        self.assertFalse(users[1].has_usable_password())
+        self.assertEqual(2, AuthUser.objects.count())
+
+    def test_parallel_hashing(self) -> None:
+        """Test passwords hashed in worker processes are valid"""
+
+        with patch('apps.signup.managers.PARALLEL_HASH_THRESHOLD', 2):
+            hashed = hash_passwords(['foo', 'bar'], workers=2)
+
+        self.assertTrue(check_password('foo', hashed[0]))
+        self.assertTrue(check_password('bar', hashed[1]))
+
+    def test_error_on_invalid_email(self) -> None:
+        """Test a `ValidationError` is raised when any user has an invalid email"""
+
+        with self.assertRaises(ValidationError):
+            AuthUserManager.bulk_create_users([dict(username='user1', email='asdf')])
+
+        self.assertFalse(AuthUser.objects.exists())
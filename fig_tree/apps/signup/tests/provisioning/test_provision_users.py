@@ -0,0 +1,118 @@
+"""Tests for the `provision_users` function and the `provision_users` management command."""
+
+import io
+import tempfile
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.family_trees.models import FamilyTree, TreePermission
+from apps.signup.models import AuthUser
+from apps.signup.provisioning import parse_users, provision_users
+
+
+class ProvisionUsers(TestCase):
+    """Test the bulk creation of users and tree permissions"""
+
+    def setUp(self) -> None:
+        """Create a family tree for assigning user roles"""
+
+        self.tree = FamilyTree.objects.create(tree_name='society')
+
+    def test_csv_users_created(self) -> None:
+        """Test users and tree permissions are created from CSV data"""
+
+        users = parse_users(
+            'username,email,password,is_active,trees\n'
+            f'user1,user1@user.com,foo,true,{self.tree.pk}:write\n'
+            'user2,user2@user.com,,false,\n',
+            'csv')
+
+        provision_users(users)
+        user1 = AuthUser.objects.get(username='user1')
+        self.assertTrue(user1.is_active)
+        self.assertTrue(user1.check_password('foo'))
+        self.assertEqual(TreePermission.Role.WRITE, TreePermission.objects.get(user=user1, tree=self.tree).role)
+        self.assertFalse(AuthUser.objects.get(username='user2').is_active)
+
+    def test_json_users_created(self) -> None:
+        """Test users and tree permissions are created from JSON data"""
+
+        users = parse_users(
+            f'[{{"username": "user1", "email": "user1@user.com", "trees": {{"{self.tree.pk}": "admin"}}}}]', 'json')
+
+        provision_users(users)
+        permission = TreePermission.objects.get(user__username='user1')
+        self.assertEqual(TreePermission.Role.ADMIN, permission.role)
+        self.assertTrue(permission.user.is_active)
+
+    def test_invalid_role(self) -> None:
+        """Test unknown role names are rejected"""
+
+        with self.assertRaises(ValidationError):
+            parse_users(f'username,email,trees\nuser1,user1@user.com,{self.tree.pk}:owner\n', 'csv')
+
+    def test_conflicts_rejected(self) -> None:
+        """Test no users are created when usernames are duplicated or trees do not exist"""
+
+        AuthUser.objects.create_user(username='existing', email='existing@user.com', password='foo')
+        users = parse_users(
+            'username,email,trees\n'
+            'existing,new@user.com,\n'
+            'user1,user1@user.com,9999:read\n'
+            'user1,user2@user.com,\n',
+            'csv')
+
+        with self.assertRaises(ValidationError) as error:
+            provision_users(users)
+
+        self.assertEqual(3, len(error.exception.messages))
+        self.assertEqual(1, AuthUser.objects.count())
+
+    def test_existing_accounts_case_insensitive(self) -> None:
+        """Test usernames and emails that differ from existing accounts only by case are rejected"""
+
+        AuthUser.objects.create_user(username='Existing', email='Existing@User.com', password='foo')
+        users = parse_users('username,email\nexisting,existing@user.com\n', 'csv')
+
+        with self.assertRaises(ValidationError) as error:
+            provision_users(users)
+
+        self.assertEqual(2, len(error.exception.messages))
+        self.assertEqual(1, AuthUser.objects.count())
+
+
+class ProvisionUsersCommand(TestCase):
+    """Test the `provision_users` management command"""
+
+    def test_users_created(self) -> None:
+        """Test users are created from a file with the format inferred from its extension"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'users.csv'
+            path.write_text('username,email\nuser1,user1@user.com\n')
+            call_command('provision_users', str(path), '--workers', '1', stdout=io.StringIO())
+
+        self.assertTrue(AuthUser.objects.filter(username='user1').exists())
+
+    def test_utf8_with_bom(self) -> None:
+        """Test UTF-8 files are read regardless of the platform default encoding"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'users.csv'
+            path.write_text('username,email\nJosé,jose@user.com\n', encoding='utf-8-sig')
+            call_command('provision_users', str(path), '--workers', '1', stdout=io.StringIO())
+
+        self.assertTrue(AuthUser.objects.filter(username='José').exists())
+
+    def test_invalid_file(self) -> None:
+        """Test validation errors are reported as command errors"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'users.json'
+            path.write_text('{"username": "user1"}')
+            with self.assertRaises(CommandError):
+                call_command('provision_users', str(path), stdout=io.StringIO())
@@ -60,3 +60,4 @@ class TokenHandling(TestCase):
         good_signup_token = {'uidb64': self.uidb64, 'token': self.test_token}
         self.client.get(reverse(self.url_name, kwargs=good_signup_token))
         self.assertTrue(models.AuthUser.objects.get(pk=1).is_active)
+        self.assertFalse(models.AuthUser.objects.get(pk=1).pending_activation)
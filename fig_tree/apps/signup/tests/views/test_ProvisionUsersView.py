@@ -0,0 +1,102 @@
+"""Tests for the `ProvisionUsersView` class"""
+
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.jobs.models import Job
+from apps.jobs.queue import claim_job, run_job
+from apps.signup.models import AuthUser
+
+
+class ProvisionUsers(TestCase):
+    """Test the bulk creation of users through the API"""
+
+    def setUp(self) -> None:
+        """Create a staff user and an authenticated API client"""
+
+        self.staff_user = AuthUser.objects.create_staff_user(
+            username='staff', email='staff@user.com', password='foo')
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff_user)
+        self.url = reverse('signup:provision')
+
+    def run_provisioning_job(self, response) -> Job:
+        """Execute the background job referenced by a `202 Accepted` response and return the finished job"""
+
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(reverse('jobs:job-detail', args=[response.data['id']]), response['Location'])
+
+        job = claim_job()
+        self.assertEqual(str(job.pk), str(response.data['id']))
+        run_job(job.pk)
+        job.refresh_from_db()
+        return job
+
+    def test_json_body(self) -> None:
+        """Test users are created by a background job from a JSON request body"""
+
+        response = self.client.post(
+            self.url, [{'username': 'user1', 'email': 'user1@user.com', 'password': 'secret'}], format='json')
+
+        self.assertFalse(AuthUser.objects.filter(username='user1').exists())
+        job = self.run_provisioning_job(response)
+        self.assertEqual({'created': 1}, job.result)
+
+        user = AuthUser.objects.get(username='user1')
+        self.assertTrue(user.check_password('secret'))
+        self.assertTrue(user.is_active)
+
+    def test_passwords_hashed_before_queueing(self) -> None:
+        """Test raw passwords are never written to the job queue"""
+
+        response = self.client.post(
+            self.url, [{'username': 'user1', 'email': 'user1@user.com', 'password': 'secret'}], format='json')
+
+        queued_password = Job.objects.get(pk=response.data['id']).args[0][0]['password']
+        self.assertNotEqual('secret', queued_password)
+        self.assertTrue(check_password('secret', queued_password))
+
+    def test_passwords_removed_from_job(self) -> None:
+        """Test raw passwords are not retained in the job arguments"""
+
+        response = self.client.post(
+            self.url, [{'username': 'user1', 'email': 'user1@user.com', 'password': 'secret'}], format='json')
+
+        job = self.run_provisioning_job(response)
+        self.assertEqual([], job.args)
+
+    def test_csv_upload(self) -> None:
+        """Test users are created by a background job from an uploaded CSV file"""
+
+        upload = SimpleUploadedFile('users.csv', b'username,email\nuser1,user1@user.com\nuser2,user2@user.com\n')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        job = self.run_provisioning_job(response)
+        self.assertEqual({'created': 2}, job.result)
+
+    def test_invalid_encoding(self) -> None:
+        """Test uploaded files that are not UTF-8 encoded are rejected"""
+
+        upload = SimpleUploadedFile('users.csv', 'username,email\nJosé,jose@user.com\n'.encode('latin-1'))
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(Job.objects.exists())
+
+    def test_invalid_data(self) -> None:
+        """Test invalid user definitions are rejected"""
+
+        response = self.client.post(self.url, [{'username': 'user1', 'email': 'invalid'}], format='json')
+        self.assertEqual(400, response.status_code)
+        self.assertFalse(AuthUser.objects.filter(username='user1').exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_staff_required(self) -> None:
+        """Test non-staff users cannot provision accounts"""
+
+        user = AuthUser.objects.create_user(username='user', email='user@user.com', password='foo')
+        self.client.force_authenticate(user)
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(403, response.status_code)
@@ -1,15 +1,32 @@
 """Tests for the `SignUpView` class"""
 
 from django.core import mail
+from django.db import connection
+from django.template import engines
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from apps.signup.forms import UserCreationForm
+from apps.signup.models import AuthUser
 from apps.signup.views import SignUpView
 
 
 class FormValid(TestCase):
     """Test the handling of valid form submissions"""
 
+    @staticmethod
+    def submit_form(username: str, email: str) -> None:
+        """Submit a valid signup form for the given username and email"""
+
+        form = UserCreationForm(data=dict(
+            username=username,
+            email=email,
+            password1='dummy_pass12',
+            password2='dummy_pass12'
+        ))
+        form.is_valid()
+        SignUpView().form_valid(form)
+
     def test_email_sent_on_valid_form(self) -> None:
         """Test a user activation email is sent when a valid form is submitted"""
 
@@ -25,3 +42,21 @@ class FormValid(TestCase):
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].to, [user_email])
         self.assertEqual(mail.outbox[0].subject, 'New account activation')
+
+    def test_account_pending_activation(self) -> None:
+        """Test new accounts are marked as awaiting activation"""
+
+        self.submit_form('username', 'test@domain.com')
+        self.assertTrue(AuthUser.objects.get(username='username').pending_activation)
+
+    def test_site_and_template_cached(self) -> None:
+        """Test repeated signups reuse the cached site and compiled email template"""
+
+        self.submit_form('username1', 'test1@domain.com')
+        cached_templates = engines['django'].engine.template_loaders[0].get_template_cache
+        self.assertIn('signup/activate_account_email.html', cached_templates)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.submit_form('username2', 'test2@domain.com')
+
+        self.assertFalse(any('django_site' in query['sql'] for query in queries.captured_queries))
@@ -9,6 +9,7 @@ View objects can be found in the `views` module.
 |--------------------------|------------------------|-------------------|
 | `/`                      | `SignUpView`           | `new-user`        |
 | `sent/`                  | `ActivationSentView`   | `activation-sent` |
+| `provision/`             | `ProvisionUsersView`   | `provision`       |
 | `[AUTHENTICATION-TOKEN]` | `ActivateAccountView`  | `activate`        |
 """
 
@@ -23,5 +24,6 @@ token_regex = r'(?P<uidb64>[0-9A-Za-z_\-]+)/(?P<token>[0-9A-Za-z]{1,13}-[0-9A-Za
 urlpatterns = [
     path('', SignUpView.as_view(), name='new-user'),
     path('sent', ActivationSentView.as_view(), name='activation-sent'),
+    path('provision/', ProvisionUsersView.as_view(), name='provision'),
     re_path(token_regex, ActivateAccountView.as_view(), name='activate'),
 ]
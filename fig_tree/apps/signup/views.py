@@ -8,28 +8,42 @@ Whenever possible, generic base classes are used to implement common behavior
 for HTTP request handling.
 """
 
+import os
+
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.contrib.sites.models import Site
+from django.core.exceptions import ValidationError
 from django.core.mail import EmailMessage
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from django.template.loader import render_to_string
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.views.generic import CreateView, TemplateView, View
-
+from rest_framework import status
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.authentication.ratelimit import RateLimitMixin
+from apps.jobs.queue import enqueue
+from apps.jobs.serializers import JobSerializer
 from .forms import UserCreationForm
 from .models import AuthUser
+from .provisioning import hash_user_passwords, normalize_users, parse_users, provision_users_job, validate_users
 
-__all__ = ['SignUpView', 'ActivationSentView', 'ActivateAccountView']
+__all__ = ['SignUpView', 'ActivationSentView', 'ActivateAccountView', 'ProvisionUsersView']
 
 activation_token_generator = PasswordResetTokenGenerator()
 
 
-class SignUpView(CreateView):
+class SignUpView(RateLimitMixin, CreateView):
     """View for handling new user creation requests"""
 
+    ratelimit_scope = 'signup'
+    ratelimit_field = 'email'
     form_class = UserCreationForm
     template_name = 'signup/create_new_user.html'
     success_url = reverse_lazy('signup:activation-sent')
@@ -48,8 +62,10 @@ class SignUpView(CreateView):
         """
 
         user = form.save(commit=False)
+        user.pending_activation = True
         user.save()
 
+        # The current site is cached per process and cleared whenever a `Site` record is modified
         current_site = Site.objects.get_current()
 
         email_subject = 'New account activation'
@@ -99,7 +115,55 @@ class ActivateAccountView(View):
 
         if user is not None and activation_token_generator.check_token(user, token):
             user.is_active = True
+            user.pending_activation = False
             user.save()
             return render(request, 'signup/activation_success.html')
 
         return render(request, 'signup/invalid_activation_link.html')
+
+
+class ProvisionUsersView(APIView):
+    """API endpoint for creating user accounts and family tree permissions in bulk
+
+    Users are defined by a JSON list in the request body or by an uploaded CSV
+    or JSON `file` (see the `provisioning` module for the supported layout).
+    Submitted users are validated and their passwords hashed immediately.
+    Accounts are then created by a background job. Access is restricted to
+    staff users.
+    """
+
+    parser_classes = (JSONParser, MultiPartParser)
+    permission_classes = (IsAdminUser,)
+
+    def post(self, request) -> Response:
+        """Handle an incoming HTTP request
+
+        Args:
+            request: Incoming HTTP request
+
+        Return:
+            The outgoing HTTP response
+        """
+
+        try:
+            if upload := request.FILES.get('file'):
+                file_format = os.path.splitext(upload.name)[1].lstrip('.').lower()
+                try:
+                    content = upload.read().decode('utf-8-sig')
+
+                except UnicodeDecodeError:
+                    raise ValidationError('Uploaded files must be UTF-8 encoded.')
+
+                users = parse_users(content, file_format)
+
+            else:
+                users = normalize_users(request.data)
+
+            validate_users(users)
+
+        except ValidationError as exc:
+            return Response({'errors': exc.messages}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = enqueue(provision_users_job, hash_user_passwords(users), user=request.user)
+        headers = {'Location': reverse('jobs:job-detail', args=[job.pk])}
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers=headers)
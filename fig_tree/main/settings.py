@@ -5,6 +5,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -17,14 +18,11 @@ sys.path.insert(0, str(BASE_DIR))
 # Debug
 
 DEBUG = env.bool('DEBUG', default=False)
-if DEBUG:
-    # If running in debug mode, save emails to disk instead of sending them
-    EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
-    EMAIL_FILE_PATH = env.path('EMAIL_FILE_PATH', default=BASE_DIR.parent / 'email')
 
 # Security and TLS
 
-SECRET_KEY = env.str('SECRET_KEY', default=get_random_secret_key())
+# Random keys are not passed through `env` since a leading `$` is interpreted as a variable reference
+SECRET_KEY = env.str('SECRET_KEY', default='') or get_random_secret_key()
 ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", default=["localhost", "127.0.0.1"])
 
 SESSION_COOKIE_SECURE = env.bool("SESSION_COOKIE_SECURE", default=False)
@@ -45,6 +43,9 @@ LOGIN_REDIRECT_URL = '/'
 LOGIN_URL = 'auth:login'
 REMEMBER_ME_DURATION = timedelta(days=7)
 
+# New accounts that are not activated within this period are deleted
+SIGNUP_ACTIVATION_PERIOD = timedelta(days=env.int('SIGNUP_ACTIVATION_DAYS', default=30))
+
 INSTALLED_APPS = [
     'jazzmin',
     'django.contrib.admin',
@@ -62,6 +63,7 @@ INSTALLED_APPS = [
     'apps.authentication',
     'apps.error_pages',
     'apps.gen_data',
+    'apps.jobs',
     'apps.signup',
 ]
 
@@ -75,11 +77,19 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Templates are compiled once per process and cached in production
+_TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+if not DEBUG:
+    _TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', _TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates', ],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -87,6 +97,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': _TEMPLATE_LOADERS,
         },
     },
 ]
@@ -100,8 +111,10 @@ JAZZMIN_SETTINGS = {
     'related_modal_active': True,
     'order_with_respect_to': [
         'signup',
+        'authentication',
         'family_trees',
         'gen_data',
+        'jobs',
     ],
     'icons': {
         'sites.Site': 'fa fa-globe'
@@ -114,9 +127,31 @@ JAZZMIN_SETTINGS = {
 # Global REST API Settings
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'apps.authentication.tokens.TokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Maximum request rates for each API `throttle_scope`. An empty rate disables throttling.
+    'DEFAULT_THROTTLE_RATES': {
+        'family_trees': env.str('THROTTLE_RATE_FAMILY_TREES', default='120/m'),
+        'gen_data': env.str('THROTTLE_RATE_GEN_DATA', default='600/m'),
+        'media_uploads': env.str('THROTTLE_RATE_MEDIA_UPLOADS', default='600/m'),
+    },
+    # Number of reverse proxies in front of the application, used to identify client IP addresses
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=None),
+}
+
+# Maximum lifetime of signed API tokens
+API_TOKEN_LIFETIME = timedelta(days=env.int('API_TOKEN_LIFETIME_DAYS', default=90))
+
+# Maximum submission rates for form views, counted per client IP address and per submitted username/email
+RATE_LIMITS = {
+    'login': env.str('RATE_LIMIT_LOGIN', default='10/m'),
+    'password_reset': env.str('RATE_LIMIT_PASSWORD_RESET', default='5/m'),
+    'signup': env.str('RATE_LIMIT_SIGNUP', default='10/m'),
 }
 
 # Database
@@ -139,6 +174,62 @@ DATABASES = {
     }
 }
 
+# Caching
+
+CACHES = {
+    'default': env.cache_url('CACHE_URL', default='locmemcache://'),
+}
+
+# Lifetime (in seconds) of cached page and API responses. A value of zero disables response caching.
+CACHE_TIMEOUT = env.int('CACHE_TIMEOUT', default=300)
+
+# Sessions
+
+# Session storage (`db`, `cached_db`, `cache`, or `signed_cookies`)
+_SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+_SESSION_ENGINE = env.str('SESSION_ENGINE', default='db')
+if _SESSION_ENGINE not in _SESSION_ENGINES:
+    raise ImproperlyConfigured(f'SESSION_ENGINE must be one of: {", ".join(_SESSION_ENGINES)}.')
+
+SESSION_ENGINE = _SESSION_ENGINES[_SESSION_ENGINE]
+
+# Time between deletions of expired sessions by the background job workers
+SESSION_CLEANUP_INTERVAL = timedelta(hours=env.int('SESSION_CLEANUP_INTERVAL', default=24))
+
+# Password hashing
+
+# Algorithm used to hash new passwords (`pbkdf2`, `argon2`, or `scrypt`).
+# Existing hashes are rehashed using the current algorithm and work factors when users log in.
+PASSWORD_HASHER = env.str('PASSWORD_HASHER', default='pbkdf2')
+PASSWORD_PBKDF2_ITERATIONS = env.int('PASSWORD_PBKDF2_ITERATIONS', default=600_000)
+PASSWORD_ARGON2_TIME_COST = env.int('PASSWORD_ARGON2_TIME_COST', default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int('PASSWORD_ARGON2_MEMORY_COST', default=102_400)
+PASSWORD_ARGON2_PARALLELISM = env.int('PASSWORD_ARGON2_PARALLELISM', default=8)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14)
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'apps.authentication.hashers.PBKDF2PasswordHasher',
+    'argon2': 'apps.authentication.hashers.Argon2PasswordHasher',
+    'scrypt': 'apps.authentication.hashers.ScryptPasswordHasher',
+}
+
+if PASSWORD_HASHER not in _PASSWORD_HASHERS:
+    raise ImproperlyConfigured(f'PASSWORD_HASHER must be one of: {", ".join(_PASSWORD_HASHERS)}.')
+
+# The preferred hasher is listed first. Remaining hashers are used to verify existing passwords.
+PASSWORD_HASHERS = [
+    _PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -162,3 +253,72 @@ USE_TZ = True
 
 STATIC_URL = env.str('STATIC_URL', default='static/')
 STATIC_ROOT = env.path('STATIC_ROOT', default=BASE_DIR / 'static_root')
+
+# User uploaded media files
+
+MEDIA_URL = env.str('MEDIA_URL', default='media/')
+MEDIA_ROOT = env.path('MEDIA_ROOT', default=BASE_DIR / 'media_root')
+
+# Directory used to store partially uploaded files during chunked uploads (must not be publicly served)
+MEDIA_UPLOAD_DIR = env.path('MEDIA_UPLOAD_DIR', default=BASE_DIR / 'media_uploads')
+
+# Time after the last received chunk before an incomplete upload is deleted
+MEDIA_UPLOAD_EXPIRY = timedelta(hours=env.int('MEDIA_UPLOAD_EXPIRY_HOURS', default=24))
+
+# Time before an upload claimed by an interrupted chunk request accepts new chunks
+MEDIA_UPLOAD_CHUNK_TIMEOUT = timedelta(minutes=env.int('MEDIA_UPLOAD_CHUNK_TIMEOUT_MINUTES', default=10))
+
+# Maximum edge length (in pixels) of each derivative image generated for uploaded media
+MEDIA_DERIVATIVE_SIZES = {
+    'thumbnail': 256,
+    'preview': 1024,
+    'display': 2048,
+}
+
+# Offload media downloads to the front-end web server (`nginx`, `apache`, or blank to disable)
+MEDIA_SENDFILE = env.str('MEDIA_SENDFILE', default='')
+MEDIA_SENDFILE_PREFIX = env.str('MEDIA_SENDFILE_PREFIX', default='/protected-media/')
+
+# Background jobs
+
+# Number of worker processes started by the `run_jobs` command
+JOB_WORKERS = env.int('JOB_WORKERS', default=2)
+
+# Running jobs without a worker heartbeat for this long are assumed lost and marked as failed
+JOB_TIMEOUT = timedelta(minutes=env.int('JOB_TIMEOUT_MINUTES', default=10))
+
+# Recurring tasks queued by the `run_jobs` command, mapped to the time between runs
+JOB_SCHEDULE = {
+    'apps.authentication.sessions.clear_expired_sessions': SESSION_CLEANUP_INTERVAL,
+    'apps.signup.cleanup.delete_unactivated_users': timedelta(days=1),
+    'apps.family_trees.purging.resume_purges': timedelta(hours=1),
+    'apps.gen_data.uploads.delete_expired_uploads': timedelta(hours=1),
+}
+
+# Email
+
+# Outgoing emails are stored in an outbox and delivered by the background job workers
+EMAIL_BACKEND = 'apps.jobs.mail.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BATCH_SIZE = env.int('EMAIL_BATCH_SIZE', default=100)
+EMAIL_MAX_ATTEMPTS = env.int('EMAIL_MAX_ATTEMPTS', default=5)
+EMAIL_SEND_TIMEOUT = timedelta(minutes=env.int('EMAIL_SEND_TIMEOUT_MINUTES', default=10))
+
+EMAIL_HOST = env.str('EMAIL_HOST', default='localhost')
+EMAIL_PORT = env.int('EMAIL_PORT', default=25)
+EMAIL_HOST_USER = env.str('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = env.str('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=False)
+DEFAULT_FROM_EMAIL = env.str('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+
+if DEBUG:
+    # If running in debug mode, save emails to disk instead of sending them
+    EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+    EMAIL_FILE_PATH = env.path('EMAIL_FILE_PATH', default=BASE_DIR.parent / 'email')
+
+# Genealogical dates
+
+# Number of years on either side of "about" dates, and preceding/following "before"/"after" dates
+DATE_ABOUT_RANGE = env.int('DATE_ABOUT_RANGE', default=5)
+DATE_BEFORE_RANGE = env.int('DATE_BEFORE_RANGE', default=50)
+DATE_AFTER_RANGE = env.int('DATE_AFTER_RANGE', default=50)
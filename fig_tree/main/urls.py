@@ -9,7 +9,9 @@ route specific URLs to individual pages.
 | `admin/`    | `apps.admin`               | `admin`        |
 | `auth/`     | `apps.authentication`      | `auth`         |
 | `gen_data/` | `apps.gen_data`            | `gen_data`     |
+| `jobs/`     | `apps.jobs`                | `jobs`         |
 | `signup/`   | `apps.signup`              | `signup`       |
+| `trees/`    | `apps.family_trees`        | `family_trees` |
 
 The following pages are included to support testing and development.
 
@@ -21,8 +23,11 @@ The following pages are included to support testing and development.
 | `tests/500` | Renders a 500 HTTP error code. | `test-500`      |
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
+from django.views.decorators.cache import cache_page
 from django.views.generic import TemplateView
 
 from apps.error_pages import handlers
@@ -35,13 +40,15 @@ handler404 = handlers.handler404
 handler500 = handlers.handler500
 
 urlpatterns = [
-    path('', TemplateView.as_view(template_name='main/index.html'), name='home'),
+    path('', cache_page(settings.CACHE_TIMEOUT)(TemplateView.as_view(template_name='main/index.html')), name='home'),
 
     # Add urls from plugins and applications
     path('admin/', admin.site.urls),
     path('auth/', include('apps.authentication.urls', namespace='auth')),
     path('gen_data/', include('apps.gen_data.urls', namespace='gen_data')),
+    path('jobs/', include('apps.jobs.urls', namespace='jobs')),
     path('signup/', include('apps.signup.urls', namespace='signup')),
+    path('trees/', include('apps.family_trees.urls', namespace='family_trees')),
 
     # Add dedicated error pages for testing purposes
     path('err/400', handler400, name='test-400'),
@@ -49,3 +56,6 @@ urlpatterns = [
     path('err/404', handler404, name='test-404'),
     path('err/500', handler500, name='test-500'),
 ]
+
+# Serve uploaded media files when running in debug mode
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)